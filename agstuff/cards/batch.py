@@ -0,0 +1,207 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+# -*- coding: utf-8 -*-
+
+
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from agstuff.cards.core import Card, Cards, CardSet
+from agstuff.cards.io import SIGN_INDICES
+from agstuff.exceptions.cards import (
+    HandBatchWidthError, HandBatchHandSizeError, HandBatchCardError, HandBatchSelectionError
+)
+
+
+PADDING = 255
+
+
+class HandBatch:
+    """
+    Many hands of up to width cards stored as cards indices (one byte per card).
+
+    Hands are rows of 2-D uint8 numpy array (if numpy is installed)
+    or of flat array.array of bytes, shorter hands are padded by PADDING.
+    Hands could be set by Cards, CardSet, cards strings or iterables of Card instanses.
+    ```python
+    >>> batch = HandBatch(['As/Ks', 'Qh/Qd', Cards('7c/2d')], width=2)
+    >>> batch.contains(Card('s'))
+    array('B', [1, 0, 0])
+    >>> batch.max_weight()
+    array('B', [13, 11, 6])
+    >>> batch[1]
+    [Q♥, Q♦]
+    ```
+
+    Vectorised methods results are numpy arrays or array.array (one item per hand),
+    hands are converted back to Cards on access only.
+    """
+
+    def __init__(self, hands=(), width=7):
+        if not type(width) is int or not 1 <= width <= 52:
+            raise HandBatchWidthError(width)
+        self.width = width
+        data = bytearray()
+        for hand in hands:
+            indices = _hand_indices(hand)
+            if len(indices) > width:
+                raise HandBatchHandSizeError(len(indices), width)
+            data += indices
+            data += bytes((PADDING,)) * (width - len(indices))
+        self.data = self._make_data(data)
+
+    def __len__(self):
+        if numpy is not None:
+            return len(self.data)
+        return len(self.data) // self.width
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            batch = HandBatch(width=self.width)
+            if numpy is not None:
+                batch.data = self.data[item].copy()
+            else:
+                rows = self._rows()
+                batch.data = array('B', b''.join(rows[i] for i in range(len(self))[item]))
+            return batch
+        cards = Cards(max_count=self.width)
+        cards.items = [Card._BY_INDEX[i] for i in self.indices(item)]
+        return cards
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __str__(self):
+        return f'{len(self)} hands of up to {self.width} cards'
+
+    def __repr__(self):
+        return f'{len(self)} hands of up to {self.width} cards'
+
+    @property
+    def nbytes(self):
+        if numpy is not None:
+            return self.data.nbytes
+        return len(self.data) * self.data.itemsize
+
+    def indices(self, number):
+        """Card indices of hand by its number."""
+        if numpy is not None:
+            row = self.data[number].tobytes()
+        else:
+            if number < 0:
+                number += len(self)
+            if not 0 <= number < len(self):
+                raise IndexError('hand batch index out of range')
+            row = self.data[number * self.width:(number + 1) * self.width].tobytes()
+        return tuple(row.rstrip(bytes((PADDING,))))
+
+    def sizes(self):
+        """Cards count of every hand."""
+        return self._count(bytes(int(i < 52) for i in range(256)))
+
+    def contains(self, card):
+        """Whether every hand contains the (possibly abstract) card."""
+        table = _mask_table(card.mask)
+        if numpy is not None:
+            return self._lookup(table).any(axis=1)
+        cells = self._lookup(table)
+        width = self.width
+        return array('B', [cells.find(1, i, i + width) != -1 for i in range(0, len(cells), width)])
+
+    def count(self, card):
+        """Count of cards of every hand the (possibly abstract) card stands for."""
+        return self._count(_mask_table(card.mask))
+
+    def count_suit(self, symbol):
+        """Count of cards of suit (by its symbol) of every hand."""
+        return self.count(Card(symbol))
+
+    def count_weight(self, symbol):
+        """Count of cards of weight (by its symbol) of every hand."""
+        return self.count(Card(symbol))
+
+    def max_weight(self):
+        """Greatest card weight number of every hand (0 for empty one)."""
+        table = bytes((i >> 2) + 1 if i < 52 else 0 for i in range(256))
+        if numpy is not None:
+            return self._lookup(table).max(axis=1)
+        cells = self._lookup(table)
+        width = self.width
+        return array('B', [max(cells[i:i + width]) for i in range(0, len(cells), width)])
+
+    def filter(self, selection):
+        """New batch of hands selected by sequence of (one per hand) flags."""
+        if len(selection) != len(self):
+            raise HandBatchSelectionError(len(selection), len(self))
+        batch = HandBatch(width=self.width)
+        if numpy is not None:
+            batch.data = self.data[numpy.asarray(selection, dtype=bool)]
+        else:
+            rows = self._rows()
+            batch.data = array('B', b''.join(row for row, selected in zip(rows, selection) if selected))
+        return batch
+
+    def _make_data(self, data):
+        if numpy is not None:
+            return numpy.frombuffer(bytes(data), dtype=numpy.uint8).reshape(-1, self.width).copy()
+        return array('B', data)
+
+    def _rows(self):
+        data = self.data.tobytes()
+        width = self.width
+        return [data[i:i + width] for i in range(0, len(data), width)]
+
+    def _lookup(self, table):
+        # every card index is replaced by table value
+        if numpy is not None:
+            return numpy.frombuffer(table, dtype=numpy.uint8)[self.data]
+        return self.data.tobytes().translate(table)
+
+    def _count(self, table):
+        if numpy is not None:
+            return self._lookup(table).sum(axis=1, dtype=numpy.uint8)
+        cells = self._lookup(table)
+        width = self.width
+        return array('B', [cells.count(1, i, i + width) for i in range(0, len(cells), width)])
+
+
+def _mask_table(mask):
+    return bytes(mask >> i & 1 if i < 52 else 0 for i in range(256))
+
+
+def _hand_indices(hand):
+    if type(hand) is str:
+        try:
+            return bytes(SIGN_INDICES[sign] for sign in hand.split('/'))
+        except KeyError:
+            cards = Cards(hand).items
+    elif isinstance(hand, CardSet):
+        return bytes(card.index for card in hand)
+    elif isinstance(hand, Cards):
+        cards = hand.items
+    else:
+        cards = hand
+    indices = bytearray()
+    for card in cards:
+        if not type(card) is Card or card.index is None:
+            raise HandBatchCardError(card)
+        indices.append(card.index)
+    return bytes(indices)
@@ -0,0 +1,224 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+# -*- coding: utf-8 -*-
+
+
+"""
+Cards combinations in colexicographic order without Card instances creation.
+
+Combination is a cards mask (see CardSet) or a tuple of card indices.
+Combination rank is its number in colexicographic order,
+so results could be stored in flat arrays indexed by rank.
+```python
+>>> from agstuff.cards.core import Deck, Cards
+>>> from agstuff.cards.combinations import Combinations
+>>>
+>>> combinations = Combinations(Deck(), 2, exclude=Cards('As/Kd'))
+>>> len(combinations)
+1225
+>>> next(combinations.iter_indices())
+(0, 1)
+>>> combinations.rank((0, 2))
+1
+>>> combinations.unrank(1, indices=True)
+(0, 2)
+>>> combinations.chunks(4)
+[(0, 306), (306, 612), (612, 918), (918, 1225)]
+>>> sum(1 for mask in combinations.iter_masks(306, 612))
+306
+```
+"""
+
+from agstuff.cards.core import Card, Deck, Cards, CardSet
+from agstuff.exceptions.cards import (
+    CombinationsCountError, CombinationsRankError, CombinationsCardsError
+)
+
+
+# Pascal triangle up to 52 cards
+_BINOMIALS = [[1]]
+for n in range(1, 53):
+    previous = _BINOMIALS[-1]
+    _BINOMIALS.append([1] + [previous[k - 1] + previous[k] for k in range(1, n)] + [1])
+del n, previous
+
+
+def binomial(n, k):
+    """Count of k items combinations of n items (n <= 52)."""
+    if k < 0 or k > n:
+        return 0
+    return _BINOMIALS[n][k]
+
+
+def cards_mask(cards):
+    """
+    Mask of cards set by mask, CardSet, Cards, Deck or iterable of Card instanses or card indices.
+
+    Abstract card stands for all cards with the same weight or suit.
+    """
+    if type(cards) is int:
+        return cards
+    if isinstance(cards, CardSet):
+        return cards.mask
+    if isinstance(cards, Cards):
+        cards = cards.items
+    elif isinstance(cards, Deck):
+        cards = cards.cards
+    mask = 0
+    for card in cards:
+        mask |= card.mask if isinstance(card, Card) else 1 << card
+    return mask
+
+
+class Combinations:
+    """
+    Combinations of count cards of available ones in colexicographic order.
+
+    Available cards (without excluded ones) could be set by
+    mask, CardSet, Cards, Deck or iterable of Card instanses or card indices.
+
+    Combinations could be split into chunks (ranks ranges)
+    to iterate them in different processes.
+    """
+
+    def __init__(self, cards, count, exclude=None):
+        self.mask = cards_mask(cards) & ~cards_mask(exclude or 0)
+        self.indices = tuple(i for i in range(52) if self.mask >> i & 1)
+        if not type(count) is int or not 0 <= count <= len(self.indices):
+            raise CombinationsCountError(count, len(self.indices))
+        self.count = count
+        self._positions = {index: position for position, index in enumerate(self.indices)}
+        # positions masks bytes -> cards masks
+        self._tables = []
+        for chunk in range(0, len(self.indices), 8):
+            indices = self.indices[chunk:chunk + 8]
+            self._tables.append([
+                sum(1 << index for bit, index in enumerate(indices) if byte >> bit & 1)
+                for byte in range(1 << len(indices))
+            ])
+
+    def __len__(self):
+        return binomial(len(self.indices), self.count)
+
+    def __iter__(self):
+        return self.iter_masks()
+
+    def __str__(self):
+        return f'{len(self)} combinations of {self.count} cards of {len(self.indices)}'
+
+    def __repr__(self):
+        return f'{len(self)} combinations of {self.count} cards of {len(self.indices)}'
+
+    def iter_masks(self, start=0, stop=None):
+        """Combinations masks from start rank to stop one (excluded)."""
+        start, stop = self._range(start, stop)
+        if start >= stop:
+            return
+        tables = self._tables
+        contiguous = self.mask == (1 << len(self.indices)) - 1
+        # Gosper's hack over positions masks
+        x = self._unrank_positions_mask(start)
+        for i in range(stop - start):
+            if contiguous:
+                yield x
+            else:
+                mask = 0
+                rest = x
+                chunk = 0
+                while rest:
+                    mask |= tables[chunk][rest & 255]
+                    rest >>= 8
+                    chunk += 1
+                yield mask
+            if x:
+                lowest = x & -x
+                ripple = x + lowest
+                x = (((ripple ^ x) >> 2) // lowest) | ripple
+
+    def iter_indices(self, start=0, stop=None):
+        """Combinations card indices tuples from start rank to stop one (excluded)."""
+        start, stop = self._range(start, stop)
+        if start >= stop:
+            return
+        indices = self.indices
+        count = self.count
+        size = len(indices)
+        positions = self._unrank_positions(start)
+        for i in range(stop - start):
+            yield tuple([indices[p] for p in positions])
+            # colexicographic successor
+            j = 0
+            while j < count - 1 and positions[j] + 1 == positions[j + 1]:
+                j += 1
+            if j < count and positions[j] + 1 < size:
+                positions[j] += 1
+                positions[:j] = range(j)
+
+    def rank(self, combination):
+        """Rank of combination (mask, CardSet, Cards or iterable of Card instanses or card indices)."""
+        mask = cards_mask(combination)
+        if mask & ~self.mask or bin(mask).count('1') != self.count:
+            raise CombinationsCardsError()
+        rank = 0
+        i = 1
+        while mask:
+            lowest = mask & -mask
+            rank += binomial(self._positions[lowest.bit_length() - 1], i)
+            mask ^= lowest
+            i += 1
+        return rank
+
+    def unrank(self, rank, indices=False):
+        """Combination mask (or card indices tuple) by its rank."""
+        if not type(rank) is int or not 0 <= rank < len(self):
+            raise CombinationsRankError(rank, len(self))
+        positions = self._unrank_positions(rank)
+        if indices:
+            return tuple(self.indices[p] for p in positions)
+        mask = 0
+        for p in positions:
+            mask |= 1 << self.indices[p]
+        return mask
+
+    def chunks(self, parts):
+        """Ranks ranges (start, stop) splitting combinations to parts of close size."""
+        total = len(self)
+        parts = max(1, min(parts, total))
+        return [(total * i // parts, total * (i + 1) // parts) for i in range(parts)]
+
+    def _range(self, start, stop):
+        total = len(self)
+        if stop is None or stop > total:
+            stop = total
+        return max(start, 0), stop
+
+    def _unrank_positions(self, rank):
+        positions = []
+        p = len(self.indices)
+        for i in range(self.count, 0, -1):
+            p -= 1
+            while binomial(p, i) > rank:
+                p -= 1
+            positions.append(p)
+            rank -= binomial(p, i)
+        positions.reverse()
+        return positions
+
+    def _unrank_positions_mask(self, rank):
+        mask = 0
+        for p in self._unrank_positions(rank):
+            mask |= 1 << p
+        return mask
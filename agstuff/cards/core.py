@@ -17,11 +17,20 @@
 
 import random
 
+from array import array
+
+from numbers import Number
+
 from agstuff.exceptions.cards import (
-    CardWeightSymbolError, CardSuitSymbolError,
-    DeckCountTypeError, DeckCountNumberError,
-    CardsStringTypeError, CardsCardTypeError
+    CardWeightSymbolError, CardSuitSymbolError, CardCodeError,
+    DeckCountTypeError, DeckCountNumberError, DeckCheckpointError,
+    CardsStringTypeError, CardsCardTypeError, CardsCheckpointError,
+    CardSetAbstractCardError, CardSetMaskError,
+    ShoeDecksCountError, ShoePenetrationError,
 )
+from agstuff.cards.isomorphism import canonical_masks, canonical_key
+from agstuff.instrumentation import core as instrumentation
+from agstuff.rng.core import get_random
 from agstuff.validators.cards import CardSymbolValidator
 
 
@@ -44,8 +53,26 @@ class Card:
     Keyword arguments are ignored.
     Positional arguments are ignored since 2nd one.
     Symbols in 1st positional argument are ignored since 3rd one.
+
+    Cards are interned: every valid sign gives the same canonical instance,
+    so Card('As') is Card('As').
+    Real cards also have an index from 0 (Two of clubs) to 51 (Ace of spades)
+    in deck order, abstract cards have index None.
+    Card.from_index(51) gives Ace of spades.
+
+    Card mask is a 52 bits mask of all real cards the card stands for
+    (single bit for real card, all cards with the same weight or suit for abstract one).
+
+    Every card has one byte code (card index for real cards),
+    Card('As').to_bytes() is b'3' and Card.from_bytes(b'3') is Card('As').
     """
 
+    __slots__ = ('weight', 'suit', 'name', 'sign', 'index', 'mask', 'code')
+
+    _INSTANCES = {}
+    _BY_INDEX = ()
+    _BY_CODE = ()
+
 
     class Weight:
         """
@@ -61,6 +88,8 @@ class Card:
         Five looks like Weight('5').
         """
 
+        __slots__ = ('symbol', 'number', 'name')
+
         SYMBOLS = '123456789TJQKA'
         REAL_SYMBOLS = '23456789TJQKA'
         NAMES = 'Ace/Two/Three/Four/Five/Six/Seven/Eight/Nine/Ten/Jack/Queen/King/Ace'.split('/')
@@ -103,6 +132,8 @@ class Card:
         Spades looks like Suit('s').
         """
 
+        __slots__ = ('symbol', 'number', 'name')
+
         SYMBOLS = 'cdhs'
         PRETTY_SYMBOLS = {
             'c': '\u2663',
@@ -137,25 +168,62 @@ class Card:
             return self.PRETTY_SYMBOLS[self.symbol]
 
 
-    def __init__(self, sign):
+    def __new__(cls, sign):
+        if instrumentation.enabled:
+            instrumentation.count('card.constructions')
+        try:
+            return cls._INSTANCES[sign[:2]]
+        except (KeyError, TypeError):
+            return cls._create(sign)
+
+    def __reduce__(self):
+        return (self.__class__, (self.sign,))
+
+    @classmethod
+    def from_index(cls, index):
+        return cls._BY_INDEX[index]
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) != 1 or data[0] >= len(cls._BY_CODE):
+            raise CardCodeError(data)
+        return cls._BY_CODE[data[0]]
+
+    def to_bytes(self):
+        return bytes((self.code,))
+
+    @classmethod
+    def _create(cls, sign):
+        if instrumentation.enabled:
+            instrumentation.count('card.creations')
+        card = object.__new__(cls)
         # standard card with weight and suit
         if len(sign[:2]) == 2:
-            self.weight = self.Weight(sign[0])
-            self.suit = self.Suit(sign[1])
-            self.name = f"{self.weight.name} of {self.suit.name}"
+            card.weight = cls.Weight(sign[0])
+            card.suit = cls.Suit(sign[1])
+            card.name = f"{card.weight.name} of {card.suit.name}"
+            card.sign = f"{card.weight.symbol}{card.suit.symbol}"
+            # both '1' and 'A' weights stand for Ace
+            card.index = (card.weight.number - 1) % 13 * 4 + card.suit.number
+            card.mask = 1 << card.index
         # abstract card
         else:
             # with weight only
             try:
-                self.weight = self.Weight(sign)
-                self.suit = None
-                self.name = self.weight.name
+                card.weight = cls.Weight(sign)
+                card.suit = None
+                card.name = card.weight.name
+                card.sign = card.weight.symbol
+                card.mask = 0b1111 << (card.weight.number - 1) % 13 * 4
             # with suit only
             except CardWeightSymbolError:
-                self.weight = None
-                self.suit = self.Suit(sign)
-                self.name = self.suit.name
-        self.in_hand = False
+                card.weight = None
+                card.suit = cls.Suit(sign)
+                card.name = card.suit.name
+                card.sign = card.suit.symbol
+                card.mask = 0x1111111111111 << card.suit.number
+            card.index = None
+        return card
 
     def __str__(self):
         weight = str(self.weight) if self.weight else 'X'
@@ -185,6 +253,24 @@ class Card:
         return self.weight != other.weight if self.weight and other.weight else self.suit != other.suit
 
 
+Card._INSTANCES = {
+    sign: Card._create(sign)
+    for sign in (
+        [f'{w}{s}' for w in Card.Weight.SYMBOLS for s in Card.Suit.SYMBOLS] +
+        list(Card.Weight.SYMBOLS) + list(Card.Suit.SYMBOLS)
+    )
+}
+Card._BY_INDEX = tuple(
+    Card._INSTANCES[f'{w}{s}'] for w in Card.Weight.REAL_SYMBOLS for s in Card.Suit.SYMBOLS
+)
+Card._BY_CODE = Card._BY_INDEX + tuple(
+    Card._INSTANCES[sign] for sign in
+    [f'1{s}' for s in Card.Suit.SYMBOLS] + list(Card.Weight.SYMBOLS) + list(Card.Suit.SYMBOLS)
+)
+for code, card in enumerate(Card._BY_CODE):
+    card.code = code
+
+
 class Deck:
     """
     Standard 52 cards deck.
@@ -192,10 +278,35 @@ class Deck:
         13 weights (Two, Three, Four, Five, Six, Seven, Eight, Nine, Ten, Jack, Queen, King, Ace)
     and
         4 suits (clubs, diamonds, hearts, spades).
+
+    Cards are dealt from the end of cards list by partial Fisher-Yates shuffle,
+    so dealing of k cards costs O(k).
+    Cards to deal next could be seen by peek method
+    (they are dealt in the same order afterwards).
+
+    Random numbers generator could be injected by rng argument
+    (random.Random like object or RandomStream) or created by seed argument,
+    otherwise global random module is used.
+
+    Deck left cards are encoded as their indices by to_bytes,
+    pickled deck also keeps its random numbers generator (except global random module).
+
+    Deck state could be saved by checkpoint and rolled back by restore
+    at cost of operations done since checkpoint (to explore game tree for example).
+    Deck changes are logged until release of the first checkpoint.
+    ```python
+    >>> token = deck.checkpoint()
+    >>> cards = deck.deal(5)
+    >>> deck.restore(token) # deck is the same as before dealing
+    >>> deck.release(token)
+    ```
     """
 
-    def __init__(self, card=None):
+    def __init__(self, card=None, rng=None, seed=None):
+        self.rng = get_random(rng, seed)
         self.cards = []
+        self._ready = 0
+        self._journal = None
         self.refresh()
 
     def __str__(self):
@@ -204,21 +315,376 @@ class Deck:
     def __repr__(self):
         return repr(self.cards)
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['cards'] = self.to_bytes()
+        if state['rng'] is random:
+            state['rng'] = None
+        return state
+
+    def __setstate__(self, state):
+        state['cards'] = [Card._BY_INDEX[i] for i in state['cards']]
+        state['rng'] = get_random(state['rng'])
+        self.__dict__.update(state)
+
     @property
     def size(self):
         return len(self.cards)
 
+    @classmethod
+    def from_bytes(cls, data, rng=None, seed=None):
+        seen = set()
+        for i in data:
+            if i >= len(Card._BY_INDEX) or i in seen:
+                raise CardCodeError(bytes((i,)))
+            seen.add(i)
+        deck = cls(rng=rng, seed=seed)
+        deck.cards = [Card._BY_INDEX[i] for i in data]
+        return deck
+
+    def to_bytes(self):
+        return bytes(card.index for card in self.cards)
+
     def push_cards(self, count):
+        self._check_count(count)
+        for i in range(count):
+            self._prepare(1)
+            self._ready -= 1
+            card = self.cards.pop()
+            if self._journal is not None:
+                self._journal.append(card)
+            if instrumentation.enabled:
+                instrumentation.count('deck.dealt_cards')
+            yield card
+
+    def deal(self, count):
+        self._check_count(count)
+        self._prepare(count)
+        self._ready -= count
+        cards = self.cards[:-count - 1:-1]
+        del self.cards[-count:]
+        if self._journal is not None:
+            self._journal.extend(cards)
+        if instrumentation.enabled:
+            instrumentation.count('deck.dealt_cards', count)
+        return cards
+
+    def peek(self, count):
+        self._check_count(count)
+        self._prepare(count)
+        return self.cards[:-count - 1:-1]
+
+    def shuffle(self):
+        if self._journal is not None:
+            self._journal.append(list(self.cards))
+        self.rng.shuffle(self.cards)
+        self._ready = len(self.cards)
+
+    def refresh(self):
+        enabled = instrumentation.enabled
+        if enabled:
+            started = instrumentation.clock()
+        if self._journal is not None:
+            self._journal.append(self.cards)
+        self.cards = list(Card._BY_INDEX)
+        self._ready = 0
+        if enabled:
+            instrumentation.count('deck.refreshes')
+            instrumentation.observe('deck.refresh', instrumentation.clock() - started)
+
+    def reset(self):
+        """Refresh deck in place (cards list is reused) dropping checkpoints."""
+        self._journal = None
+        self.cards[:] = Card._BY_INDEX
+        self._ready = 0
+
+    def checkpoint(self):
+        if self._journal is None:
+            self._journal = []
+        return (len(self._journal), self._ready)
+
+    def restore(self, token):
+        mark, ready = self._check_token(token)
+        journal = self._journal
+        cards = self.cards
+        while len(journal) > mark:
+            entry = journal.pop()
+            entry_type = type(entry)
+            # swap
+            if entry_type is tuple:
+                index, position = entry
+                cards[index], cards[position] = cards[position], cards[index]
+            # cards before shuffle or refresh
+            elif entry_type is list:
+                cards = self.cards = entry
+            # dealt card
+            else:
+                cards.append(entry)
+        self._ready = ready
+
+    def release(self, token):
+        mark = self._check_token(token)[0]
+        if mark == 0:
+            self._journal = None
+
+    def _check_token(self, token):
+        if (
+            self._journal is None or type(token) is not tuple or len(token) != 2 or
+            not 0 <= token[0] <= len(self._journal)
+        ):
+            raise DeckCheckpointError(token)
+        return token
+
+    def _check_count(self, count):
         count_type = type(count)
         if not count_type is int:
             raise DeckCountTypeError(count_type)
-        if count < 1 or count > len(self.cards):
+        if count < 1 or count > self.size:
             raise DeckCountNumberError(count)
+
+    def _prepare(self, count):
+        self._swap_to_end(self.cards, len(self.cards), count)
+
+    def _swap_to_end(self, cards, size, count):
+        # put random cards to the last count positions of first size ones,
+        # already prepared positions are kept
+        ready = min(self._ready, size)
+        if ready >= count:
+            return
+        randrange = self.rng.randrange
+        journal = self._journal
+        for position in range(size - 1 - ready, size - 1 - count, -1):
+            index = randrange(position + 1)
+            cards[index], cards[position] = cards[position], cards[index]
+            if journal is not None:
+                journal.append((index, position))
+        self._ready = count
+
+
+class LazyDeck(Deck):
+    """
+    Standard 52 cards deck stored as cards indices permutation (array of bytes).
+
+    Behaves like Deck (the same random numbers generator gives the same cards),
+    but Card instances are got only when cards are dealt or inspected,
+    so refresh, shuffle and dealing just move indices in place.
+    Cards list got by cards property is a copy, deck is changed by its methods only.
+    """
+
+    _INDICES = array('B', range(52))
+
+    def __init__(self, card=None, rng=None, seed=None):
+        self._order = array('B', self._INDICES)
+        self._size = 0
+        super().__init__(card, rng, seed)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_order'] = self._order.tobytes()
+        if state['rng'] is random:
+            state['rng'] = None
+        return state
+
+    def __setstate__(self, state):
+        state['_order'] = array('B', state['_order'])
+        state['rng'] = get_random(state['rng'])
+        self.__dict__.update(state)
+
+    @property
+    def cards(self):
+        by_index = Card._BY_INDEX
+        return [by_index[i] for i in self._order[:self._size]]
+
+    @cards.setter
+    def cards(self, cards):
+        indices = array('B', (card.index for card in cards))
+        self._order[:len(indices)] = indices
+        self._size = len(indices)
+
+    @property
+    def size(self):
+        return self._size
+
+    def to_bytes(self):
+        return self._order[:self._size].tobytes()
+
+    def push_cards(self, count):
+        self._check_count(count)
         for i in range(count):
-            yield self.cards.pop(random.choice(range(len(self.cards))))
+            self._prepare(1)
+            self._ready -= 1
+            self._size -= 1
+            if self._journal is not None:
+                self._journal.append(1)
+            if instrumentation.enabled:
+                instrumentation.count('deck.dealt_cards')
+            yield Card._BY_INDEX[self._order[self._size]]
+
+    def deal(self, count):
+        cards = self.peek(count)
+        self._ready -= count
+        self._size -= count
+        if self._journal is not None:
+            self._journal.append(count)
+        if instrumentation.enabled:
+            instrumentation.count('deck.dealt_cards', count)
+        return cards
+
+    def peek(self, count):
+        self._check_count(count)
+        self._prepare(count)
+        by_index = Card._BY_INDEX
+        return [by_index[i] for i in self._order[self._size - count:self._size][::-1]]
+
+    def shuffle(self):
+        if self._journal is not None:
+            self._journal.append([self._order.tobytes(), self._size])
+        indices = self._order[:self._size]
+        self.rng.shuffle(indices)
+        self._order[:self._size] = indices
+        self._ready = self._size
 
     def refresh(self):
-        self.cards = [Card(f'{w}{s}') for w in Card.Weight.REAL_SYMBOLS for s in Card.Suit.SYMBOLS]
+        enabled = instrumentation.enabled
+        if enabled:
+            started = instrumentation.clock()
+        if self._journal is not None:
+            self._journal.append([self._order.tobytes(), self._size])
+        self._order[:] = self._INDICES
+        self._size = 52
+        self._ready = 0
+        if enabled:
+            instrumentation.count('deck.refreshes')
+            instrumentation.observe('deck.refresh', instrumentation.clock() - started)
+
+    def reset(self):
+        self._journal = None
+        self.refresh()
+
+    def restore(self, token):
+        mark, ready = self._check_token(token)
+        journal = self._journal
+        order = self._order
+        while len(journal) > mark:
+            entry = journal.pop()
+            entry_type = type(entry)
+            # swap
+            if entry_type is tuple:
+                index, position = entry
+                order[index], order[position] = order[position], order[index]
+            # indices before shuffle or refresh
+            elif entry_type is list:
+                order[:] = array('B', entry[0])
+                self._size = entry[1]
+            # dealt cards count
+            else:
+                self._size += entry
+        self._ready = ready
+
+    def _prepare(self, count):
+        self._swap_to_end(self._order, self._size, count)
+
+
+class Shoe:
+    """
+    Several standard 52 cards decks shuffled together.
+
+    Left cards are stored as counts of every card (by card index),
+    every card is drawn by weighted sampling over counts in O(log 52).
+    Shoe cards could be pulled to Cards like deck ones.
+
+    Cut card is placed after penetration part of shoe cards.
+    Since it is reached cut_card_reached is True
+    and on_cut_card callback (if it is set) is called with shoe as argument,
+    refresh_if_cut refreshes shoe if cut card is reached (between game rounds for example).
+
+    Random numbers generator could be injected by rng argument
+    (random.Random like object or RandomStream) or created by seed argument,
+    otherwise global random module is used.
+    """
+
+    def __init__(self, decks=6, penetration=0.75, on_cut_card=None, rng=None, seed=None):
+        if not type(decks) is int or decks < 1:
+            raise ShoeDecksCountError(decks)
+        if not isinstance(penetration, Number) or not 0 < penetration <= 1:
+            raise ShoePenetrationError(penetration)
+        self.decks = decks
+        self.penetration = penetration
+        self.on_cut_card = on_cut_card
+        self.rng = get_random(rng, seed)
+        self.refresh()
+
+    def __str__(self):
+        return f'Shoe of {self.decks} decks ({self.size} cards left)'
+
+    def __repr__(self):
+        return f'Shoe of {self.decks} decks ({self.size} cards left)'
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def counts(self):
+        return list(self._counts)
+
+    @property
+    def cut_card_reached(self):
+        return 52 * self.decks - self._size >= self._cut
+
+    def push_cards(self, count):
+        self._check_count(count)
+        for i in range(count):
+            yield self._draw()
+
+    def deal(self, count):
+        self._check_count(count)
+        return [self._draw() for i in range(count)]
+
+    def refresh(self):
+        self._counts = [self.decks] * 52
+        # Fenwick tree of counts
+        self._tree = [0] * 53
+        for i in range(1, 53):
+            self._tree[i] += self.decks
+            parent = i + (i & -i)
+            if parent <= 52:
+                self._tree[parent] += self._tree[i]
+        self._size = 52 * self.decks
+        # cut card is placed after one card at least
+        self._cut = max(1, int(self._size * self.penetration))
+
+    def refresh_if_cut(self):
+        if self.cut_card_reached:
+            self.refresh()
+            return True
+        return False
+
+    def _check_count(self, count):
+        count_type = type(count)
+        if not count_type is int:
+            raise DeckCountTypeError(count_type)
+        if count < 1 or count > self._size:
+            raise DeckCountNumberError(count)
+
+    def _draw(self):
+        tree = self._tree
+        rest = self.rng.randrange(self._size)
+        position = 0
+        for step in (32, 16, 8, 4, 2, 1):
+            following = position + step
+            if following <= 52 and tree[following] <= rest:
+                position = following
+                rest -= tree[following]
+        self._counts[position] -= 1
+        i = position + 1
+        while i <= 52:
+            tree[i] -= 1
+            i += i & -i
+        self._size -= 1
+        if self._size == 52 * self.decks - self._cut and self.on_cut_card is not None:
+            self.on_cut_card(self)
+        return Card._BY_INDEX[position]
 
 
 class Cards:
@@ -230,6 +696,15 @@ class Cards:
         Cards('3d/Tc/As') or Cards([Card('3d'), Card('Tc'), Card('As')])
 
     Also cards could be set from deck after initialization
+
+    Cards are encoded as cards codes by to_bytes (see Card.to_bytes).
+
+    Cards state could be saved by checkpoint and rolled back by restore
+    at cost of cards pulled since checkpoint (items need to be changed by pull only,
+    clean and restore to earlier checkpoint make later checkpoints stale).
+
+    Suit isomorphic cards (optionally together with board) have the same
+    canonical representative (see canonical) and cache key (see isomorphism_key).
     """
 
     def __init__(self, cards_string=None, cards=None, max_count=52):
@@ -258,15 +733,206 @@ class Cards:
     def __contains__(self, item):
         return item in self.items
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['items'] = self.to_bytes()
+        return state
+
+    def __setstate__(self, state):
+        state['items'] = [Card._BY_CODE[code] for code in state['items']]
+        self.__dict__.update(state)
+
     @property
     def size(self):
         return len(self.items)
 
+    @classmethod
+    def from_bytes(cls, data, max_count=52):
+        cards = cls(max_count=max_count)
+        for code in data[:max_count]:
+            if code >= len(Card._BY_CODE):
+                raise CardCodeError(bytes((code,)))
+            cards.items.append(Card._BY_CODE[code])
+        return cards
+
+    def to_bytes(self):
+        return bytes(card.code for card in self.items)
+
     def pull(self, deck, count):
+        enabled = instrumentation.enabled
+        if enabled:
+            started = instrumentation.clock()
         max_to_add = self.max_count - self.size
         count_to_add = max_to_add if count > max_to_add else count
         if count_to_add > 0:
             self.items.extend(deck.push_cards(count_to_add))
+        if enabled:
+            instrumentation.count('cards.pulled_cards', max(count_to_add, 0))
+            instrumentation.observe('cards.pull', instrumentation.clock() - started)
 
     def clean(self):
         self.items = []
+
+    def checkpoint(self):
+        return (self.items, len(self.items))
+
+    def restore(self, token):
+        if (
+            type(token) is not tuple or len(token) != 2 or
+            token[0] is not self.items or not 0 <= token[1] <= len(self.items)
+        ):
+            raise CardsCheckpointError(token)
+        del self.items[token[1]:]
+
+    def canonical(self, board=None):
+        """Canonical suit isomorphic cards (and board if it is set, Cards or CardSet)."""
+        hand_mask, board_mask = canonical_masks(*self._masks(board))
+        cards = CardSet(mask=hand_mask).to_cards(self.max_count)
+        if board is None:
+            return cards
+        return cards, CardSet(mask=board_mask).to_cards()
+
+    def isomorphism_key(self, board=None):
+        """Integer key, the same for suit isomorphic cards (with boards)."""
+        return canonical_key(*self._masks(board))
+
+    def _masks(self, board):
+        board_mask = 0
+        if board is not None:
+            board_mask = (board if isinstance(board, CardSet) else CardSet(cards=board)).mask
+        return CardSet(cards=self).mask, board_mask
+
+
+class CardSet:
+    """
+    Several real cards stored as 52 bits mask (card index is bit number).
+
+    Card set could be set by cards string, by some iterable of Card instanses (or Cards)
+    or by mask.
+    Card set of (Three of diamonds, Ten of clubs and Ace of spades) looks like
+        CardSet('3d/Tc/As') or CardSet(cards=[Card('3d'), Card('Tc'), Card('As')])
+
+    Abstract card inclusion means inclusion of any card with the same weight or suit.
+    Card('s') in CardSet('As/Kd') is True (any spade),
+    Card('Q') in CardSet('As/Kd') is False (no Queen).
+
+    Card sets support union (|), intersection (&), difference (-),
+    symmetric difference (^) and complement to full deck (~).
+
+    Card set is encoded as 7 bytes (little endian mask) by to_bytes.
+    """
+
+    __slots__ = ('mask',)
+
+    FULL_MASK = (1 << 52) - 1
+    SUIT_MASKS = {s: Card(s).mask for s in Card.Suit.SYMBOLS}
+    WEIGHT_MASKS = {w: Card(w).mask for w in Card.Weight.SYMBOLS}
+
+    def __init__(self, cards_string=None, cards=None, mask=0):
+        if cards_string:
+            cards_string_type = type(cards_string)
+            if not cards_string_type is str:
+                raise CardsStringTypeError(cards_string_type)
+            cards = [Card(sign) for sign in cards_string.split('/')]
+        elif isinstance(cards, Cards):
+            cards = cards.items
+        if not type(mask) is int or mask < 0 or mask > self.FULL_MASK:
+            raise CardSetMaskError(mask)
+        if cards:
+            for card in cards:
+                card_type = type(card)
+                if not card_type is Card:
+                    raise CardsCardTypeError(card_type)
+                if card.index is None:
+                    raise CardSetAbstractCardError(card)
+                mask |= card.mask
+        self.mask = mask
+
+    def __str__(self):
+        return str(self.cards)
+
+    def __repr__(self):
+        return repr(self.cards)
+
+    def __contains__(self, item):
+        return bool(self.mask & item.mask)
+
+    def __iter__(self):
+        mask = self.mask
+        while mask:
+            low = mask & -mask
+            yield Card._BY_INDEX[low.bit_length() - 1]
+            mask ^= low
+
+    def __len__(self):
+        return bin(self.mask).count('1')
+
+    def __bool__(self):
+        return bool(self.mask)
+
+    def __hash__(self):
+        return hash(self.mask)
+
+    def __reduce__(self):
+        return (self.__class__, (None, None, self.mask))
+
+    def __eq__(self, other):
+        if not isinstance(other, CardSet):
+            return NotImplemented
+        return self.mask == other.mask
+
+    def __ne__(self, other):
+        if not isinstance(other, CardSet):
+            return NotImplemented
+        return self.mask != other.mask
+
+    def __or__(self, other):
+        if not isinstance(other, CardSet):
+            return NotImplemented
+        return CardSet(mask=self.mask | other.mask)
+
+    def __and__(self, other):
+        if not isinstance(other, CardSet):
+            return NotImplemented
+        return CardSet(mask=self.mask & other.mask)
+
+    def __sub__(self, other):
+        if not isinstance(other, CardSet):
+            return NotImplemented
+        return CardSet(mask=self.mask & ~other.mask)
+
+    def __xor__(self, other):
+        if not isinstance(other, CardSet):
+            return NotImplemented
+        return CardSet(mask=self.mask ^ other.mask)
+
+    def __invert__(self):
+        return CardSet(mask=self.FULL_MASK ^ self.mask)
+
+    @property
+    def size(self):
+        return len(self)
+
+    @property
+    def cards(self):
+        return list(self)
+
+    def count(self, card):
+        """Count of set cards the (possibly abstract) card stands for."""
+        return bin(self.mask & card.mask).count('1')
+
+    @classmethod
+    def from_cards(cls, cards):
+        return cls(cards=cards)
+
+    @classmethod
+    def from_bytes(cls, data):
+        return cls(mask=int.from_bytes(data, 'little'))
+
+    def to_bytes(self):
+        return self.mask.to_bytes(7, 'little')
+
+    def to_cards(self, max_count=52):
+        cards = Cards(max_count=max_count)
+        cards.items = self.cards[:max_count]
+        return cards
@@ -0,0 +1,243 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+# -*- coding: utf-8 -*-
+
+
+"""
+Poker hands equity calculator.
+
+Rest of the board is dealt from the deck without known (hands, board and dead) cards.
+If count of possible boards is not greater than exact_limit all of them are enumerated,
+otherwise boards are sampled (Monte Carlo) by batches in a process pool,
+every batch has its own independent random stream.
+Sampling stops since trials count is reached
+or since confidence interval half width of every player equity is not greater than target_error.
+```python
+>>> from agstuff.cards.core import Cards
+>>> from agstuff.cards.equity import equity
+>>>
+>>> result = equity([Cards('As/Ah'), Cards('Kd/Kc')], board=Cards('Ks/7h/2c'))
+>>> result.exact
+True
+>>> result.equities
+[0.08585858585858586, 0.9141414141414141]
+```
+"""
+
+import math
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+from agstuff.cards.combinations import binomial
+from agstuff.cards.evaluator import evaluate_indices, _card_indices
+from agstuff.exceptions.cards import (
+    EquityPlayersCountError, EquityHandCardsCountError,
+    EquityBoardCardsCountError, EquityDuplicateCardsError,
+)
+from agstuff.rng.core import RandomStream
+
+
+class EquityResult:
+    """
+    Players hands wins, ties and losses counts.
+
+    Equity is a share of pot player gets in average (pot is split equally between tied hands).
+    """
+
+    def __init__(self, players):
+        self.trials = 0
+        self.exact = False
+        self.wins = [0] * players
+        self.ties = [0] * players
+        self.shares = [0.0] * players
+        self.shares_squares = [0.0] * players
+
+    def __str__(self):
+        return f'{self.equities} by {self.trials} trials'
+
+    def __repr__(self):
+        return f'{self.equities} by {self.trials} trials'
+
+    @property
+    def losses(self):
+        return [self.trials - w - t for w, t in zip(self.wins, self.ties)]
+
+    @property
+    def win_rates(self):
+        return [w / self.trials for w in self.wins]
+
+    @property
+    def tie_rates(self):
+        return [t / self.trials for t in self.ties]
+
+    @property
+    def loss_rates(self):
+        return [l / self.trials for l in self.losses]
+
+    @property
+    def equities(self):
+        return [s / self.trials for s in self.shares]
+
+    def errors(self, confidence=0.95):
+        """Confidence interval half widths of players equities."""
+        if self.exact:
+            return [0.0] * len(self.shares)
+        z = _z_score(confidence)
+        errors = []
+        for shares, squares in zip(self.shares, self.shares_squares):
+            mean = shares / self.trials
+            variance = max(squares / self.trials - mean * mean, 0.0)
+            errors.append(z * math.sqrt(variance / self.trials))
+        return errors
+
+    def update(self, trials, wins, ties, shares, shares_squares):
+        self.trials += trials
+        for i in range(len(self.wins)):
+            self.wins[i] += wins[i]
+            self.ties[i] += ties[i]
+            self.shares[i] += shares[i]
+            self.shares_squares[i] += shares_squares[i]
+
+
+def equity(
+    hands, board=None, dead=None, trials=100000, target_error=None, confidence=0.95,
+    exact_limit=50000, processes=None, batch_size=5000, seed=None, rng=None, executor=None
+):
+    """
+    Equity of every player hand.
+
+    hands -- list of players hole cards (Cards, CardSet or iterable of Card instanses)
+    board -- known board cards (up to 5)
+    dead -- cards which can not be dealt
+    trials -- max count of sampled boards
+    target_error -- equity confidence interval half width to stop sampling since
+    exact_limit -- max count of possible boards to enumerate all of them
+    processes -- process pool size (os.cpu_count() by default, 1 to sample in current process)
+    batch_size -- count of sampled boards per pool task
+    seed, rng -- root RandomStream seed or RandomStream itself
+    executor -- concurrent.futures executor to use instead of a new process pool
+    """
+    holes = [_card_indices(hand) for hand in hands]
+    if len(holes) < 2:
+        raise EquityPlayersCountError(len(holes))
+    for hole in holes:
+        if not 1 <= len(hole) <= 2:
+            raise EquityHandCardsCountError(len(hole))
+    board = _card_indices(board) if board else []
+    if len(board) > 5:
+        raise EquityBoardCardsCountError(len(board))
+    dead = _card_indices(dead) if dead else []
+    known = [index for hole in holes for index in hole] + board + dead
+    if len(set(known)) != len(known):
+        raise EquityDuplicateCardsError()
+
+    known = set(known)
+    remaining = [index for index in range(52) if index not in known]
+    need = 5 - len(board)
+    result = EquityResult(len(holes))
+
+    if binomial(len(remaining), need) <= exact_limit:
+        result.update(*_enumerate(holes, board, remaining, need))
+        result.exact = True
+        return result
+
+    stream = rng if isinstance(rng, RandomStream) else RandomStream(seed)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if executor is None and processes > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            _sample(result, pool, processes, holes, board, remaining, need,
+                    trials, target_error, confidence, batch_size, stream)
+    else:
+        _sample(result, executor, processes, holes, board, remaining, need,
+                trials, target_error, confidence, batch_size, stream)
+    return result
+
+
+def _sample(result, executor, processes, holes, board, remaining, need,
+            trials, target_error, confidence, batch_size, stream):
+    while result.trials < trials:
+        left = trials - result.trials
+        batches = []
+        for batch_stream in stream.spawn(processes):
+            batch = min(batch_size, left)
+            if batch <= 0:
+                break
+            batches.append((holes, board, remaining, need, batch, batch_stream))
+            left -= batch
+        if executor is None:
+            totals = [_simulate(*batch) for batch in batches]
+        else:
+            totals = [f.result() for f in [executor.submit(_simulate, *batch) for batch in batches]]
+        for total in totals:
+            result.update(*total)
+        if target_error is not None and max(result.errors(confidence)) <= target_error:
+            break
+
+
+def _simulate(holes, board, remaining, need, trials, stream):
+    sample = stream.generator().sample
+    totals = _totals(len(holes))
+    for i in range(trials):
+        full_board = board + sample(remaining, need)
+        _account(totals, [evaluate_indices(hole + full_board) for hole in holes])
+    return (trials, *totals)
+
+
+def _enumerate(holes, board, remaining, need):
+    totals = _totals(len(holes))
+    trials = 0
+    for cards in combinations(remaining, need):
+        full_board = board + list(cards)
+        _account(totals, [evaluate_indices(hole + full_board) for hole in holes])
+        trials += 1
+    return (trials, *totals)
+
+
+def _totals(players):
+    # wins, ties, shares, shares squares
+    return [0] * players, [0] * players, [0.0] * players, [0.0] * players
+
+
+def _account(totals, scores):
+    wins, ties, shares, shares_squares = totals
+    best = max(scores)
+    winners = [i for i, score in enumerate(scores) if score == best]
+    if len(winners) == 1:
+        winner = winners[0]
+        wins[winner] += 1
+        shares[winner] += 1.0
+        shares_squares[winner] += 1.0
+    else:
+        share = 1.0 / len(winners)
+        for winner in winners:
+            ties[winner] += 1
+            shares[winner] += share
+            shares_squares[winner] += share * share
+
+
+def _z_score(confidence):
+    # inverse of standard normal distribution function by bisection
+    low, high = 0.0, 10.0
+    for i in range(60):
+        middle = (low + high) / 2
+        if math.erf(middle / math.sqrt(2)) < confidence:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2
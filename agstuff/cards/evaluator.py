@@ -0,0 +1,244 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+# -*- coding: utf-8 -*-
+
+
+"""
+Poker hands (5, 6 or 7 cards) evaluator.
+
+Hand score is an integer, better hand has greater score.
+Score consists of hand category (bits since 20th)
+and up to 5 ranks to compare hands of the same category (4 bits each).
+Rank is a number from 0 (Two) to 12 (Ace), card index is 4 * rank + suit number.
+
+Non flush hands are looked up by product of primes of their ranks,
+flush hands are looked up by ranks mask of flush suit.
+Both tables are built at first use.
+```python
+>>> from agstuff.cards.core import Cards
+>>> from agstuff.cards.evaluator import evaluate, hand_category
+>>>
+>>> score = evaluate(Cards('As/Ks/Qs/Js/Ts/2d/2c'))
+>>> hand_category(score)
+'Straight flush'
+>>> evaluate(Cards('Ah/Ad/7c/7s/2h')) > evaluate(Cards('Kh/Kd/Qc/Qs/Jh'))
+True
+```
+"""
+
+from itertools import combinations, combinations_with_replacement
+
+from agstuff.cards.core import Card, Cards, CardSet
+from agstuff.exceptions.cards import (
+    EvaluatorCardsCountError, EvaluatorAbstractCardError, EvaluatorDuplicateCardsError
+)
+
+
+HIGH_CARD = 0
+PAIR = 1
+TWO_PAIR = 2
+THREE_OF_A_KIND = 3
+STRAIGHT = 4
+FLUSH = 5
+FULL_HOUSE = 6
+FOUR_OF_A_KIND = 7
+STRAIGHT_FLUSH = 8
+
+HAND_CATEGORIES = (
+    'High card', 'Pair', 'Two pair', 'Three of a kind', 'Straight',
+    'Flush', 'Full house', 'Four of a kind', 'Straight flush',
+)
+
+RANK_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+# per card index
+_PRIMES = tuple(RANK_PRIMES[i >> 2] for i in range(52))
+# every suit count takes 4 bits
+_SUIT_COUNTERS = tuple(1 << ((i & 3) << 2) for i in range(52))
+
+# product of rank primes -> score
+_UNSUITED = None
+# flush suit ranks mask -> score
+_FLUSHES = None
+
+
+def hand_category(score):
+    return HAND_CATEGORIES[score >> 20]
+
+
+def evaluate(cards):
+    """
+    Score of 5, 6 or 7 cards hand.
+
+    Cards could be Cards, CardSet or iterable of Card instanses or card indices.
+    """
+    indices = _card_indices(cards)
+    if len(set(indices)) != len(indices):
+        raise EvaluatorDuplicateCardsError()
+    return evaluate_indices(indices)
+
+
+def evaluate_indices(indices):
+    """
+    Score of 5, 6 or 7 cards hand set by card indices (0 ... 51).
+
+    Indices are not validated except their count.
+    """
+    if not 5 <= len(indices) <= 7:
+        raise EvaluatorCardsCountError(len(indices))
+    if _UNSUITED is None:
+        _build_tables()
+    product = 1
+    suits = 0
+    for index in indices:
+        product *= _PRIMES[index]
+        suits += _SUIT_COUNTERS[index]
+    # one of suit counts is 5 or more
+    flush = (suits + 0x3333) & 0x8888
+    if flush:
+        return _flush_score(indices, flush)
+    return _UNSUITED[product]
+
+
+def evaluate_many(hands):
+    """
+    Scores of several hands set by card indices (iterables of 5, 6 or 7 card indices).
+    """
+    if _UNSUITED is None:
+        _build_tables()
+    primes = _PRIMES
+    suit_counters = _SUIT_COUNTERS
+    unsuited = _UNSUITED
+    scores = []
+    append = scores.append
+    for indices in hands:
+        if not 5 <= len(indices) <= 7:
+            raise EvaluatorCardsCountError(len(indices))
+        product = 1
+        suits = 0
+        for index in indices:
+            product *= primes[index]
+            suits += suit_counters[index]
+        flush = (suits + 0x3333) & 0x8888
+        if flush:
+            append(_flush_score(indices, flush))
+        else:
+            append(unsuited[product])
+    return scores
+
+
+def _card_indices(cards):
+    if isinstance(cards, Cards):
+        cards = cards.items
+    elif isinstance(cards, CardSet):
+        cards = cards.cards
+    indices = []
+    for card in cards:
+        if isinstance(card, Card):
+            if card.index is None:
+                raise EvaluatorAbstractCardError(card)
+            card = card.index
+        indices.append(card)
+    return indices
+
+
+def _flush_score(indices, flush):
+    suit = (flush.bit_length() >> 2) - 1
+    mask = 0
+    for index in indices:
+        if index & 3 == suit:
+            mask |= 1 << (index >> 2)
+    return _FLUSHES[mask]
+
+
+def _score(category, ranks):
+    score = category
+    for i in range(5):
+        score = (score << 4) | (ranks[i] if i < len(ranks) else 0)
+    return score
+
+
+def _straight_rank(mask):
+    # Ace also stands for rank lower than Two
+    mask = (mask << 1) | (mask >> 12)
+    for high in range(13, 3, -1):
+        window = 0b11111 << (high - 4)
+        if mask & window == window:
+            return high - 1
+    return None
+
+
+def _mask_ranks(mask):
+    return [rank for rank in range(12, -1, -1) if mask >> rank & 1]
+
+
+def _flush_mask_score(mask):
+    straight = _straight_rank(mask)
+    if straight is not None:
+        return _score(STRAIGHT_FLUSH, [straight])
+    return _score(FLUSH, _mask_ranks(mask)[:5])
+
+
+def _unsuited_score(counts):
+    mask = 0
+    groups = []
+    for rank in range(12, -1, -1):
+        if counts[rank]:
+            mask |= 1 << rank
+            groups.append((counts[rank], rank))
+    # ranks sorted by count then by rank
+    groups.sort(reverse=True)
+    top_count, top_rank = groups[0]
+    second_count, second_rank = groups[1]
+    if top_count == 4:
+        return _score(FOUR_OF_A_KIND, [top_rank, max(r for c, r in groups[1:])])
+    if top_count == 3 and second_count >= 2:
+        return _score(FULL_HOUSE, [top_rank, second_rank])
+    straight = _straight_rank(mask)
+    if straight is not None:
+        return _score(STRAIGHT, [straight])
+    if top_count == 3:
+        return _score(THREE_OF_A_KIND, [r for c, r in groups[:3]])
+    if top_count == 2 and second_count == 2:
+        kicker = max(r for c, r in groups[2:])
+        return _score(TWO_PAIR, [top_rank, second_rank, kicker])
+    if top_count == 2:
+        return _score(PAIR, [r for c, r in groups[:4]])
+    return _score(HIGH_CARD, [r for c, r in groups[:5]])
+
+
+def _build_tables():
+    global _UNSUITED, _FLUSHES
+    unsuited = {}
+    for size in (5, 6, 7):
+        for ranks in combinations_with_replacement(range(13), size):
+            counts = [0] * 13
+            product = 1
+            for rank in ranks:
+                counts[rank] += 1
+                product *= RANK_PRIMES[rank]
+            # 4 cards of every rank at most
+            if max(counts) <= 4:
+                unsuited[product] = _unsuited_score(counts)
+    flushes = [0] * (1 << 13)
+    for size in (5, 6, 7):
+        for ranks in combinations(range(13), size):
+            mask = 0
+            for rank in ranks:
+                mask |= 1 << rank
+            flushes[mask] = _flush_mask_score(mask)
+    _FLUSHES = flushes
+    _UNSUITED = unsuited
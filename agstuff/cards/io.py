@@ -0,0 +1,105 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+# -*- coding: utf-8 -*-
+
+
+"""
+Cards strings files streaming parser.
+
+Every line of a file is a cards string like 'As/Ks/Qs'.
+```python
+>>> from agstuff.cards.io import iter_cards
+>>>
+>>> for card_set in iter_cards('hands.txt'):
+...     print(card_set)
+[Q♠, K♠, A♠]
+[2♣, 7♦]
+```
+"""
+
+import mmap
+import os
+import warnings
+
+from agstuff.cards.core import Card, CardSet
+from agstuff.exceptions.cards import CardsLineError
+
+
+# card sign -> card index (only real cards)
+SIGN_INDICES = {
+    sign: card.index for sign, card in Card._INSTANCES.items() if card.index is not None
+}
+_BYTES_SIGN_INDICES = {sign.encode(): index for sign, index in SIGN_INDICES.items()}
+
+
+def iter_cards(source, separator='/', indices=False, on_error=None, use_mmap=False, buffer_size=1 << 20):
+    """
+    Lazily parse cards strings (one per line) of a file.
+
+    source -- file path or file object (opened in binary or text mode)
+    separator -- cards signs separator
+    indices -- yield tuples of card indices instead of CardSet instances
+    on_error -- callable to handle CardsLineError of malformed line
+        (warning is issued by default), malformed lines are skipped
+    use_mmap -- memory map file set by path instead of buffered reading
+    buffer_size -- buffered reading chunk size
+
+    Empty lines are skipped.
+    """
+    if on_error is None:
+        on_error = _warn
+    if isinstance(source, (str, bytes, os.PathLike)):
+        with open(source, 'rb', buffering=buffer_size) as file:
+            if use_mmap and os.fstat(file.fileno()).st_size:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    yield from _parse_lines(iter(mapped.readline, b''), separator, indices, on_error)
+            else:
+                yield from _parse_lines(file, separator, indices, on_error)
+    else:
+        yield from _parse_lines(source, separator, indices, on_error)
+
+
+def _parse_lines(lines, separator, indices, on_error):
+    table = None
+    for line_number, line in enumerate(lines, 1):
+        if table is None:
+            binary = isinstance(line, bytes)
+            table = _BYTES_SIGN_INDICES if binary else SIGN_INDICES
+            if binary:
+                separator = separator.encode()
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            hand = [table[sign] for sign in line.split(separator)]
+        except KeyError as error:
+            sign = error.args[0]
+            if isinstance(sign, bytes):
+                sign = sign.decode(errors='replace')
+                line = line.decode(errors='replace')
+            on_error(CardsLineError(line_number, line, sign))
+            continue
+        if indices:
+            yield tuple(hand)
+        else:
+            mask = 0
+            for index in hand:
+                mask |= 1 << index
+            yield CardSet(mask=mask)
+
+
+def _warn(error):
+    warnings.warn(str(error), RuntimeWarning)
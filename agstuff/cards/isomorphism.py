@@ -0,0 +1,134 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+# -*- coding: utf-8 -*-
+
+
+"""
+Suit isomorphism of cards masks (see CardSet).
+
+Hands (optionally together with board) are strategically identical
+up to suits permutation. Canonical representative is got by sorting suits
+by their (hand ranks, board ranks) signatures, so isomorphic hands
+have the same canonical masks and key to share cache entries.
+Masks are converted suit by suit by precomputed tables in constant time.
+```python
+>>> from agstuff.cards.core import CardSet
+>>> from agstuff.cards.isomorphism import canonical_key, preflop_index
+>>>
+>>> canonical_key(CardSet('As/Ks').mask) == canonical_key(CardSet('Ad/Kd').mask)
+True
+>>> canonical_key(CardSet('As/Ks').mask, CardSet('2s/7h/9c').mask) == \
+...     canonical_key(CardSet('Ad/Kd').mask, CardSet('2h/7d/9c').mask)
+False
+>>> preflop_index(CardSet('As/Ks').mask), preflop_index(CardSet('Ad/Kh').mask)
+(155, 167)
+```
+"""
+
+
+RANKS_MASK = (1 << 13) - 1
+PREFLOP_CLASSES_COUNT = 169
+
+# byte of cards mask (2 ranks of 4 suits) -> ranks of every suit (13 bits per suit)
+_SUITS_RANKS = [
+    sum(1 << ((bit & 3) * 13 + (bit >> 2)) for bit in range(8) if byte >> bit & 1)
+    for byte in range(256)
+]
+# ranks of suit -> cards mask of the first suit
+_SPREAD = [
+    sum(1 << (rank * 4) for rank in range(13) if ranks >> rank & 1)
+    for ranks in range(1 << 13)
+]
+
+
+def suits_ranks(mask):
+    """Ranks (13 bits) of every suit (0 - clubs, ..., 3 - spades) packed since bit 13 * suit."""
+    packed = 0
+    shift = 0
+    while mask:
+        packed |= _SUITS_RANKS[mask & 255] << shift
+        mask >>= 8
+        shift += 2
+    return packed
+
+
+def canonical_masks(hand_mask, board_mask=0):
+    """Canonical (hand mask, board mask) of suit isomorphic ones."""
+    hand = suits_ranks(hand_mask)
+    board = suits_ranks(board_mask)
+    signatures = sorted((
+        (hand >> shift & RANKS_MASK) << 13 | board >> shift & RANKS_MASK
+        for shift in (0, 13, 26, 39)
+    ), reverse=True)
+    hand_mask = board_mask = 0
+    for suit, signature in enumerate(signatures):
+        hand_mask |= _SPREAD[signature >> 13] << suit
+        board_mask |= _SPREAD[signature & RANKS_MASK] << suit
+    return hand_mask, board_mask
+
+
+def canonical_key(hand_mask, board_mask=0):
+    """Integer key, the same for suit isomorphic hands (with boards)."""
+    hand_mask, board_mask = canonical_masks(hand_mask, board_mask)
+    return board_mask << 52 | hand_mask
+
+
+def preflop_index(hand_mask):
+    """
+    Dense index (from 0 to 168) of two cards hand isomorphism class.
+
+    Index is 13 * row + column of 13x13 ranks grid, where
+    suited hands are above diagonal, pairs are on it and offsuit hands are below it.
+    """
+    return _PREFLOP_INDICES[hand_mask]
+
+
+def _preflop_index(first, second):
+    high, low = max(first >> 2, second >> 2), min(first >> 2, second >> 2)
+    if first & 3 == second & 3:
+        return 13 * low + high
+    return 13 * high + low
+
+
+_PREFLOP_INDICES = {
+    1 << first | 1 << second: _preflop_index(first, second)
+    for first in range(52) for second in range(first)
+}
+
+
+class IsomorphismIndex:
+    """
+    Dense indices of isomorphism classes of hands (with boards) in order of their appearance.
+
+    Indices are consecutive integers from 0, so they could be used
+    as indices of flat arrays of cached results.
+    """
+
+    def __init__(self):
+        self.keys = {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, masks):
+        return canonical_key(*masks) in self.keys
+
+    def index(self, hand_mask, board_mask=0):
+        key = canonical_key(hand_mask, board_mask)
+        index = self.keys.get(key)
+        if index is None:
+            index = self.keys[key] = len(self.keys)
+        return index
@@ -0,0 +1,241 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+# -*- coding: utf-8 -*-
+
+
+import asyncio
+import threading
+import time
+
+from collections import deque
+from contextlib import contextmanager, asynccontextmanager
+
+from agstuff.cards.core import Deck, LazyDeck, Cards
+from agstuff.exceptions.cards import PoolSizeError, PoolOwnershipError, PoolTimeoutError
+from agstuff.rng.core import RandomStream
+
+
+class Pool:
+    """
+    Thread-safe pool of reusable objects.
+
+    Objects are created by factory (without arguments) when there is no free one,
+    reset by reset callable on release and owned by one owner (table for example) at a time.
+    If max size is set, acquire waits for release when all created objects are in use.
+
+    Async acquire (acquire_async, lease_async) waits without blocking event loop,
+    objects could be released from any thread.
+    ```python
+    >>> pool = DeckPool(max_size=1000)
+    >>> with pool.lease(owner='table 1') as deck:
+    ...     cards = deck.deal(2)
+    >>> async with pool.lease_async(owner='table 2') as deck:
+    ...     cards = deck.deal(2)
+    >>> pool.stats()
+    {'size': 1, 'free': 1, 'in_use': 0, 'hits': 1, 'misses': 1, 'hit_rate': 0.5}
+    ```
+    """
+
+    def __init__(self, factory, reset=None, max_size=None):
+        if max_size is not None and (not type(max_size) is int or max_size < 1):
+            raise PoolSizeError(max_size)
+        self.factory = factory
+        self.reset = reset
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._free = deque()
+        self._in_use = {}
+        # count of released objects being reset (they are still counted in size)
+        self._resetting = 0
+        self._waiters = deque()
+
+    def __str__(self):
+        return f'Pool of {self.size} items ({len(self._free)} free)'
+
+    def __repr__(self):
+        return f'Pool of {self.size} items ({len(self._free)} free)'
+
+    @property
+    def size(self):
+        return len(self._free) + len(self._in_use) + self._resetting
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else None
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': self.size,
+                'free': len(self._free),
+                'in_use': len(self._in_use),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hit_rate,
+            }
+
+    def acquire(self, owner=None, timeout=None):
+        """Take free (or new) object, wait for release (up to timeout seconds) if pool is full."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            while True:
+                item = self._take(owner)
+                if item is not None:
+                    return item
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise PoolTimeoutError(timeout)
+                self._released.wait(remaining)
+
+    async def acquire_async(self, owner=None):
+        """Take free (or new) object, wait for release without blocking event loop if pool is full."""
+        with self._lock:
+            item = self._take(owner)
+            if item is None:
+                future = asyncio.get_running_loop().create_future()
+                self._waiters.append((future, owner))
+        if item is not None:
+            return item
+        return await future
+
+    def release(self, item, owner=None):
+        """Reset object and return it to pool (owner need to be the same as on acquire)."""
+        with self._lock:
+            entry = self._in_use.get(id(item))
+            if entry is None or entry[0] is not item or entry[1] != owner:
+                raise PoolOwnershipError(item, owner)
+            del self._in_use[id(item)]
+            self._resetting += 1
+        try:
+            if self.reset is not None:
+                self.reset(item)
+        except BaseException:
+            with self._lock:
+                # object is dropped, so new one is created for async waiter or could be created by acquire
+                self._resetting -= 1
+                if not self._serve_waiter():
+                    self._released.notify()
+            raise
+        with self._lock:
+            self._resetting -= 1
+            # async waiters are served first
+            while self._waiters:
+                future, waiter_owner = self._waiters.popleft()
+                if future.done():
+                    continue
+                self._in_use[id(item)] = (item, waiter_owner)
+                self.hits += 1
+                future.get_loop().call_soon_threadsafe(self._resolve, future, item, waiter_owner)
+                return
+            self._free.append(item)
+            self._released.notify()
+
+    @contextmanager
+    def lease(self, owner=None, timeout=None):
+        item = self.acquire(owner, timeout)
+        try:
+            yield item
+        finally:
+            self.release(item, owner)
+
+    @asynccontextmanager
+    async def lease_async(self, owner=None):
+        item = await self.acquire_async(owner)
+        try:
+            yield item
+        finally:
+            self.release(item, owner)
+
+    def _take(self, owner):
+        # called under lock
+        if self._free:
+            item = self._free.pop()
+            self.hits += 1
+        elif self.max_size is None or self.size < self.max_size:
+            item = self.factory()
+            self.misses += 1
+        else:
+            return None
+        self._in_use[id(item)] = (item, owner)
+        return item
+
+    def _serve_waiter(self):
+        # called under lock, gives new (or free) object to the first async waiter
+        while self._waiters:
+            future, waiter_owner = self._waiters.popleft()
+            if future.done():
+                continue
+            try:
+                item = self._take(waiter_owner)
+            except Exception as error:
+                future.get_loop().call_soon_threadsafe(self._reject, future, error)
+                return True
+            future.get_loop().call_soon_threadsafe(self._resolve, future, item, waiter_owner)
+            return True
+        return False
+
+    def _reject(self, future, error):
+        if not future.done():
+            future.set_exception(error)
+
+    def _resolve(self, future, item, owner):
+        # waiter could be cancelled after item was handed to it
+        if future.done():
+            self.release(item, owner)
+        else:
+            future.set_result(item)
+
+
+class DeckPool(Pool):
+    """
+    Pool of decks refreshed in place on release.
+
+    Decks are LazyDeck instances if lazy is True.
+    If rng is RandomStream every deck gets its own spawned stream,
+    otherwise all decks share rng (random.Random like object) or the one created by seed.
+    """
+
+    def __init__(self, max_size=None, lazy=False, rng=None, seed=None):
+        self.deck_class = LazyDeck if lazy else Deck
+        if rng is None and seed is not None:
+            rng = RandomStream(seed)
+        self.rng = rng
+        super().__init__(self._create_deck, self.deck_class.reset, max_size)
+
+    def _create_deck(self):
+        rng = self.rng
+        if isinstance(rng, RandomStream):
+            rng = rng.spawn(1)[0]
+        return self.deck_class(rng=rng)
+
+
+class CardsPool(Pool):
+    """Pool of empty Cards (of max count) cleared in place on release."""
+
+    def __init__(self, max_size=None, max_count=52):
+        self.max_count = max_count
+        super().__init__(self._create_cards, _clear_cards, max_size)
+
+    def _create_cards(self):
+        return Cards(max_count=self.max_count)
+
+
+def _clear_cards(cards):
+    cards.items.clear()
@@ -0,0 +1,115 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+# -*- coding: utf-8 -*-
+
+
+"""
+Exact (hypergeometric) probabilities of drawing cards from deck.
+
+Unseen cards are deck left cards (Deck, LazyDeck, Cards, CardSet or mask)
+without dead ones (known cards which can not be drawn).
+Cards to hit are set by pattern: (possibly abstract) card, Cards, CardSet
+or iterable of Card instanses, Card('s') stands for any spade, Card('A') for any Ace.
+```python
+>>> from agstuff.cards.core import Card, Cards, Deck
+>>> from agstuff.cards import probability
+>>>
+>>> deck = Deck()
+>>> hand = Cards()
+>>> hand.pull(deck, 5) # [A♠, 9♠, 4♠, K♦, 2♥] for example
+>>> probability.outs(deck, Card('s'))
+10
+>>> probability.at_least(deck, Card('s'), draws=2, hits=2) # runner-runner flush
+0.041628122109158186
+>>> probability.at_least(deck, Card('s'), draws=2, hits=1, dead=Cards('Qs/Jd'))
+0.36363636363636365
+>>> probability.distribution(deck, Card('s'), draws=2, fractions=True)
+[Fraction(666, 1081), Fraction(370, 1081), Fraction(45, 1081)]
+```
+"""
+
+from fractions import Fraction
+
+from agstuff.cards.core import Card
+from agstuff.cards.combinations import binomial, cards_mask
+from agstuff.exceptions.cards import ProbabilityDrawsCountError, ProbabilityHitsCountError
+
+
+def unseen(deck, dead=None):
+    """Mask of cards which could be drawn."""
+    return cards_mask(deck) & ~_pattern_mask(dead or 0)
+
+
+def outs(deck, pattern, dead=None):
+    """Count of unseen cards matching pattern."""
+    return bin(unseen(deck, dead) & _pattern_mask(pattern)).count('1')
+
+
+def distribution(deck, pattern, draws, dead=None, fractions=False):
+    """Probabilities of drawing exactly 0, 1, ..., draws cards matching pattern in draws cards."""
+    size, hits = _counts(deck, pattern, dead)
+    _check_draws(draws, size)
+    total = binomial(size, draws)
+    counts = [binomial(hits, x) * binomial(size - hits, draws - x) for x in range(draws + 1)]
+    return [_ratio(count, total, fractions) for count in counts]
+
+
+def exactly(deck, pattern, draws, hits=1, dead=None, fractions=False):
+    """Probability of drawing exactly hits cards matching pattern in draws cards."""
+    _check_hits(hits)
+    size, outs_count = _counts(deck, pattern, dead)
+    _check_draws(draws, size)
+    count = binomial(outs_count, hits) * binomial(size - outs_count, draws - hits)
+    return _ratio(count, binomial(size, draws), fractions)
+
+
+def at_least(deck, pattern, draws, hits=1, dead=None, fractions=False):
+    """Probability of drawing at least hits cards matching pattern in draws cards."""
+    _check_hits(hits)
+    size, outs_count = _counts(deck, pattern, dead)
+    _check_draws(draws, size)
+    count = sum(
+        binomial(outs_count, x) * binomial(size - outs_count, draws - x)
+        for x in range(hits, min(draws, outs_count) + 1)
+    )
+    return _ratio(count, binomial(size, draws), fractions)
+
+
+def _pattern_mask(pattern):
+    if isinstance(pattern, Card):
+        return pattern.mask
+    return cards_mask(pattern)
+
+
+def _counts(deck, pattern, dead):
+    mask = unseen(deck, dead)
+    return bin(mask).count('1'), bin(mask & _pattern_mask(pattern)).count('1')
+
+
+def _check_draws(draws, size):
+    if not type(draws) is int or not 0 <= draws <= size:
+        raise ProbabilityDrawsCountError(draws, size)
+
+
+def _check_hits(hits):
+    if not type(hits) is int or hits < 0:
+        raise ProbabilityHitsCountError(hits)
+
+
+def _ratio(count, total, fractions):
+    if fractions:
+        return Fraction(count, total)
+    return count / total
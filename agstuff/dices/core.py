@@ -18,14 +18,31 @@
 
 import random
 
+from array import array
+from collections import Counter
 from collections.abc import Iterable
+from numbers import Number
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 from agstuff.exceptions.dices.core import (
     DiceEmptyInialItemsError,
     DiceWrongFacesCountTypeError, DiceWrongFacesCountError,
     DiceWrongFacesItemsTypeError, DiceWrongFacesItemsCountError,
+    DiceWrongWeightsCountError, DiceWrongWeightsError,
+    DiceRollsCountError,
     DiceBoxWrongItemAdditionError,
+    DiceBoxEmptyError, DiceBoxNonNumericFacesError, DiceBoxQuantileError,
 )
+from agstuff.dices.distribution import dice_key, dices_key, sum_distribution, outcome_distribution
+from agstuff.instrumentation import core as instrumentation
+from agstuff.rng.core import get_random, SecureRandom
+
+# maximum count of sums to sample dices box rolls by exact sums distribution
+SAMPLED_SUMS_LIMIT = 1 << 16
 
 
 class Dice:
@@ -48,11 +65,32 @@ class Dice:
     >>> print(dice.items)
     ['Q', 'W', 'E', 'R', 'T', 'Y']
     ```
+
+    Faces could have weights (non-negative numbers, one per face)
+    to make some faces more probable than others.
+    Weighted dice is rolled in O(1) by Walker/Vose alias tables.
+    ```python
+    >>> dice = Dice(faces_count=6, weights=[1, 1, 1, 1, 1, 5])
+    ```
+
+    Random numbers generator could be injected by rng argument
+    (random.Random like object or RandomStream) or created by seed argument,
+    otherwise global random module is used.
+
+    Many rolls outcomes could be got at once by roll_many
+    as numpy array (if numpy is installed) or array.array
+    or written to out (writable sequence of count items, SharedArray for example).
+    Outcomes of dice with not numeric faces are faces indices.
+    Dice value is not changed by roll_many.
+
+    Pickled dice keeps its faces (just faces count if dice is created by it),
+    weights, value and random numbers generator (except global random module).
     """
 
     MIN_FACES_COUNT = 2
 
-    def __init__(self, faces_count=None, faces_items=None):
+    def __init__(self, faces_count=None, faces_items=None, rng=None, seed=None, weights=None):
+        self.rng = get_random(rng, seed)
         if faces_count:
             if not isinstance(faces_count, int):
                 raise DiceWrongFacesCountTypeError()
@@ -69,6 +107,22 @@ class Dice:
         else:
             raise DiceEmptyInialItemsError()
 
+        self.weights = None
+        self._alias = None
+        if weights is not None:
+            if not isinstance(weights, Iterable):
+                raise DiceWrongWeightsError()
+            weights = list(weights)
+            if len(weights) != len(self.items):
+                raise DiceWrongWeightsCountError()
+            if (
+                not all(isinstance(w, Number) and w >= 0 for w in weights) or
+                not sum(weights) > 0
+            ):
+                raise DiceWrongWeightsError()
+            self.weights = weights
+            self._alias = _alias_tables(weights)
+
         self._value = None
         self.rolling()
 
@@ -90,28 +144,145 @@ class Dice:
     def __ne__(self, other):
         return self.value != other.value
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_alias']
+        if state['rng'] is random:
+            state['rng'] = None
+        if self.weights is None and self.items == list(range(1, len(self.items) + 1)):
+            state['items'] = len(self.items)
+        return state
+
+    def __setstate__(self, state):
+        if type(state['items']) is int:
+            state['items'] = list(range(1, state['items'] + 1))
+        state['rng'] = get_random(state['rng'])
+        state['_alias'] = None if state['weights'] is None else _alias_tables(state['weights'])
+        self.__dict__.update(state)
+
     def __add__(self, other):
         if not other:
             return self.value
         elif isinstance(other, Dice):
             return self.value + other.value
-        return self.value + other
+        elif isinstance(other, (Number, type(self.value))):
+            return self.value + other
+        # other operands (dices expressions for example) handle addition by themselves
+        return NotImplemented
 
     @property
     def value(self):
         return self._value
 
     def rolling(self):
-        self._value = random.choice(self.items)
+        if not instrumentation.enabled:
+            return self._roll(self.rng)
+        started = instrumentation.clock()
+        value = self._roll(self.rng)
+        instrumentation.observe('dice.rolling', instrumentation.clock() - started)
+        return value
+
+    def faces_weights(self):
+        """Pairs of distinct face and its weight (count of face items or sum of their weights)."""
+        if self.weights is None:
+            return list(Counter(self.items).items())
+        weights = {}
+        for item, weight in zip(self.items, self.weights):
+            weights[item] = weights.get(item, 0) + weight
+        return [(item, weight) for item, weight in weights.items() if weight]
+
+    def roll_many(self, count, out=None):
+        return _write(self._roll_many(self.rng, count), out)
+
+    def _roll(self, rng):
+        if instrumentation.enabled:
+            instrumentation.count('dice.rolls')
+        if self._alias is None:
+            self._value = rng.choice(self.items)
+        else:
+            probabilities, aliases = self._alias
+            u = rng.random() * len(probabilities)
+            i = int(u)
+            self._value = self.items[i if u - i < probabilities[i] else aliases[i]]
         return self._value
 
+    def _roll_many(self, rng, count):
+        if not type(count) is int or count < 1:
+            raise DiceRollsCountError(count)
+        if instrumentation.enabled:
+            instrumentation.count('dice.rolls', count)
+        typecode = _typecode(self.items)
+        # numpy generator is not secure, so secure rng rolls every dice by itself
+        if numpy is not None and not isinstance(rng, SecureRandom):
+            generator = numpy.random.default_rng(rng.getrandbits(64))
+            if self._alias is None:
+                indices = generator.integers(0, len(self.items), size=count)
+            else:
+                probabilities, aliases = (numpy.asarray(t) for t in self._alias)
+                u = generator.random(count) * len(probabilities)
+                indices = u.astype(numpy.int64)
+                indices = numpy.where(u - indices < probabilities[indices], indices, aliases[indices])
+            if typecode is None:
+                return indices
+            return numpy.asarray(self.items)[indices]
+        if self._alias is None:
+            indices = range(len(self.items))
+            if typecode is None:
+                return array('q', rng.choices(indices, k=count))
+            return array(typecode, rng.choices(self.items, k=count))
+        probabilities, aliases = self._alias
+        size = len(probabilities)
+        random = rng.random
+        indices = []
+        append = indices.append
+        for j in range(count):
+            u = random() * size
+            i = int(u)
+            append(i if u - i < probabilities[i] else aliases[i])
+        if typecode is None:
+            return array('q', indices)
+        items = self.items
+        return array(typecode, [items[i] for i in indices])
+
 
 class DiceBox:
     """
     Multiple dices handler.
+
+    If random numbers generator is injected by rng argument
+    (random.Random like object or RandomStream) or created by seed argument
+    all dices are rolled by it, otherwise every dice is rolled by its own one.
+
+    Exact distribution of dices values sum (dices faces need to be numbers)
+    is calculated by convolution of dices faces distributions
+    and memoised by multiset of dices.
+    ```python
+    >>> dice_box = DiceBox()
+    >>> dice_box.add(Dice(6))
+    >>> dice_box.add(Dice(6))
+    >>> dice_box.probability(7)
+    0.16666666666666666
+    >>> dice_box.cdf(4, fractions=True)
+    Fraction(1, 6)
+    >>> dice_box.mean(), dice_box.variance(), dice_box.quantile(0.5)
+    (7.0, 5.833333333333333, 7)
+    ```
+
+    Exact distribution of dices faces multiset (dices faces could be any hashable objects)
+    is calculated by faces counts of identical dices and memoised by multiset of dices as well.
+    ```python
+    >>> dice_box = DiceBox()
+    >>> for i in range(3):
+    ...     dice_box.add(Dice(faces_items='QWERTY'))
+    >>> dice_box.at_least('QQR', fractions=True)
+    Fraction(1, 72)
+    >>> dice_box.outcome_distribution().count_distribution('Q')
+    {0: 0.5787037037037037, 1: 0.3472222222222222, 2: 0.06944444444444445, 3: 0.004629629629629629}
+    ```
     """
 
-    def __init__(self):
+    def __init__(self, rng=None, seed=None):
+        self.rng = None if rng is None and seed is None else get_random(rng, seed)
         self.items = []
 
     def add(self, dice):
@@ -120,8 +291,136 @@ class DiceBox:
         self.items.append(dice)
 
     def rolling(self):
+        enabled = instrumentation.enabled
+        if enabled:
+            started = instrumentation.clock()
         result = None
         for dice in self.items:
-            dice.rolling()
+            if self.rng is None:
+                dice.rolling()
+            else:
+                dice._roll(self.rng)
             result = dice + result
+        if enabled:
+            instrumentation.count('dice_box.rolls')
+            instrumentation.observe('dice_box.rolling', instrumentation.clock() - started)
         return result
+
+    def roll_many(self, count, out=None):
+        """Sums of count rolls of all dices (dices faces need to be numbers) written to out if it is set."""
+        return _write(self._roll_sums(count), out)
+
+    def _roll_sums(self, count):
+        if not self.items:
+            raise DiceBoxEmptyError()
+        if not type(count) is int or count < 1:
+            raise DiceRollsCountError(count)
+        if any(_typecode(dice.items) is None for dice in self.items):
+            raise DiceBoxNonNumericFacesError()
+        rng = self.rng
+        if numpy is not None and not isinstance(rng, SecureRandom):
+            rolls = [dice._roll_many(dice.rng if rng is None else rng, count) for dice in self.items]
+            return sum(rolls[1:], rolls[0])
+        if len(self.items) == 1:
+            return self.items[0]._roll_many(rng or self.items[0].rng, count)
+        if _sums_bound(self.items) > SAMPLED_SUMS_LIMIT:
+            rolls = [dice._roll_many(dice.rng if rng is None else rng, count) for dice in self.items]
+            typecode = 'q' if all(r.typecode == 'q' for r in rolls) else 'd'
+            return array(typecode, map(sum, zip(*rolls)))
+        # sums are sampled at once by their exact distribution
+        distribution = self._sum_distribution()
+        typecode = 'q' if all(type(t) is int for t in distribution.totals) else 'd'
+        cumulative = [c / distribution.denominator for c in distribution.cumulative]
+        sums = (rng or self.items[0].rng).choices(distribution.totals, cum_weights=cumulative, k=count)
+        return array(typecode, sums)
+
+    def distribution(self, fractions=False):
+        """Sums probabilities by sums (Fraction instances if fractions is True)."""
+        return self._sum_distribution().as_dict(fractions)
+
+    def probability(self, total, fractions=False):
+        return self._sum_distribution().probability(total, fractions)
+
+    def cdf(self, total, fractions=False):
+        return self._sum_distribution().cdf(total, fractions)
+
+    def mean(self):
+        return self._sum_distribution().mean()
+
+    def variance(self):
+        return self._sum_distribution().variance()
+
+    def quantile(self, q):
+        if not isinstance(q, Number) or not 0 <= q <= 1:
+            raise DiceBoxQuantileError(q)
+        return self._sum_distribution().quantile(q)
+
+    def outcome_distribution(self):
+        """Faces multiset distribution (see OutcomeDistribution)."""
+        if not self.items:
+            raise DiceBoxEmptyError()
+        return outcome_distribution(dices_key(self.items))
+
+    def at_least(self, faces, fractions=False):
+        """Probability of getting at least faces multiset (faces iterable or faces counts mapping)."""
+        return self.outcome_distribution().at_least(faces, fractions)
+
+    def _sum_distribution(self):
+        if not self.items:
+            raise DiceBoxEmptyError()
+        keys = []
+        for dice in self.items:
+            key = dice_key(dice)
+            if not all(isinstance(face, Number) for face, weight in key):
+                raise DiceBoxNonNumericFacesError()
+            keys.append(key)
+        return sum_distribution(tuple(sorted(keys)))
+
+
+def _sums_bound(dices):
+    # upper bound of count of dices values sums
+    bound = 1
+    for dice in dices:
+        bound *= len(set(dice.items))
+    if all(type(item) is int for dice in dices for item in dice.items):
+        bound = min(bound, sum(max(dice.items) - min(dice.items) for dice in dices) + 1)
+    return bound
+
+
+def _alias_tables(weights):
+    # Vose alias method
+    size = len(weights)
+    total = sum(weights)
+    scaled = [w * size / total for w in weights]
+    probabilities = [1.0] * size
+    aliases = list(range(size))
+    small = [i for i, p in enumerate(scaled) if p < 1]
+    large = [i for i, p in enumerate(scaled) if p >= 1]
+    while small and large:
+        less = small.pop()
+        more = large.pop()
+        probabilities[less] = scaled[less]
+        aliases[less] = more
+        scaled[more] = scaled[more] + scaled[less] - 1
+        if scaled[more] < 1:
+            small.append(more)
+        else:
+            large.append(more)
+    # rest probabilities are 1 (up to rounding)
+    return probabilities, aliases
+
+
+def _write(result, out):
+    if out is None:
+        return result
+    out[:] = result
+    return out
+
+
+def _typecode(items):
+    # array type code of numeric faces
+    if all(type(item) is int for item in items):
+        return 'q'
+    if all(isinstance(item, Number) for item in items):
+        return 'd'
+    return None
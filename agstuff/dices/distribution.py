@@ -0,0 +1,326 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+# -*- coding: utf-8 -*-
+
+
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from collections.abc import Mapping
+from fractions import Fraction
+from functools import lru_cache
+from math import comb
+
+# count of products of coefficients to use big integers multiplication since
+KRONECKER_THRESHOLD = 4096
+# maximum ratio of coefficients span to sums count to use big integers multiplication
+KRONECKER_DENSITY = 4
+
+
+class SumDistribution:
+    """
+    Probability mass function of dices values sum.
+
+    Attributes:
+        totals -- sorted possible sums
+        weights -- sums weights (integers if all faces weights are integers)
+        denominator -- sum of weights
+        cumulative -- cumulative weights
+    """
+
+    def __init__(self, totals, weights):
+        self.totals = tuple(totals)
+        self.weights = tuple(weights)
+        self.denominator = sum(self.weights)
+        cumulative = []
+        accumulated = 0
+        for weight in self.weights:
+            accumulated += weight
+            cumulative.append(accumulated)
+        self.cumulative = tuple(cumulative)
+
+    def __str__(self):
+        return str(self.as_dict())
+
+    def __repr__(self):
+        return repr(self.as_dict())
+
+    def as_dict(self, fractions=False):
+        return {t: self._ratio(w, fractions) for t, w in zip(self.totals, self.weights)}
+
+    def probability(self, total, fractions=False):
+        i = bisect_left(self.totals, total)
+        if i == len(self.totals) or self.totals[i] != total:
+            return self._ratio(0, fractions)
+        return self._ratio(self.weights[i], fractions)
+
+    def cdf(self, total, fractions=False):
+        """Probability of sum to be less or equal total."""
+        i = bisect_right(self.totals, total)
+        return self._ratio(self.cumulative[i - 1] if i else 0, fractions)
+
+    def mean(self):
+        return sum(t * w for t, w in zip(self.totals, self.weights)) / self.denominator
+
+    def variance(self):
+        # weights may be too large integers to convert them to floats before division
+        first = sum(t * w for t, w in zip(self.totals, self.weights))
+        second = sum(t * t * w for t, w in zip(self.totals, self.weights))
+        return (second * self.denominator - first * first) / (self.denominator * self.denominator)
+
+    def quantile(self, q):
+        """The smallest sum which cdf is greater or equal q."""
+        if isinstance(self.denominator, int):
+            target = Fraction(q) * self.denominator
+        else:
+            target = q * self.denominator
+        i = bisect_left(self.cumulative, target)
+        return self.totals[min(i, len(self.totals) - 1)]
+
+    def _ratio(self, weight, fractions):
+        if fractions and isinstance(self.denominator, int):
+            return Fraction(weight, self.denominator)
+        return weight / self.denominator
+
+
+class OutcomeDistribution:
+    """
+    Probability mass function of dices faces multiset (faces counts regardless of dices order).
+
+    Faces multiset could be set by faces iterable ('QQR' or ['Q', 'Q', 'R'])
+    or by faces counts mapping ({'Q': 2, 'R': 1}).
+
+    Attributes:
+        faces -- possible faces
+        outcomes -- faces counts tuples (in faces order)
+        weights -- outcomes weights (integers if all faces weights are integers)
+        denominator -- sum of weights
+    """
+
+    def __init__(self, faces, outcomes, weights):
+        self.faces = tuple(faces)
+        self.outcomes = tuple(outcomes)
+        self.weights = tuple(weights)
+        self.denominator = sum(self.weights)
+        self._indices = {face: i for i, face in enumerate(self.faces)}
+
+    def __str__(self):
+        return str(self.as_dict())
+
+    def __repr__(self):
+        return repr(self.as_dict())
+
+    def as_dict(self, fractions=False):
+        """Probabilities by faces multisets (tuples of faces in faces order)."""
+        return {
+            sum(((face,) * count for face, count in zip(self.faces, outcome)), ()): self._ratio(weight, fractions)
+            for outcome, weight in zip(self.outcomes, self.weights)
+        }
+
+    def probability(self, faces, fractions=False):
+        """Probability of exactly faces multiset."""
+        counts = self._counts(faces)
+        if counts is None:
+            return self._ratio(0, fractions)
+        return self._matching(lambda outcome: outcome == counts, fractions)
+
+    def at_least(self, faces, fractions=False):
+        """Probability of getting at least faces multiset (and possibly other faces)."""
+        counts = self._counts(faces)
+        if counts is None:
+            return self._ratio(0, fractions)
+        required = [(i, count) for i, count in enumerate(counts) if count]
+        return self._matching(lambda outcome: all(outcome[i] >= count for i, count in required), fractions)
+
+    def where(self, predicate, fractions=False):
+        """Probability of outcomes (faces counts mappings) matching predicate."""
+        faces = self.faces
+        return self._matching(lambda outcome: predicate(dict(zip(faces, outcome))), fractions)
+
+    def count_distribution(self, face, fractions=False):
+        """Probabilities of face counts."""
+        i = self._indices.get(face)
+        weights = {}
+        for outcome, weight in zip(self.outcomes, self.weights):
+            count = 0 if i is None else outcome[i]
+            weights[count] = weights.get(count, 0) + weight
+        return {count: self._ratio(weights[count], fractions) for count in sorted(weights)}
+
+    def _counts(self, faces):
+        # faces counts tuple or None if there are impossible faces
+        if not isinstance(faces, Mapping):
+            faces = Counter(faces)
+        counts = [0] * len(self.faces)
+        for face, count in faces.items():
+            if count <= 0:
+                continue
+            i = self._indices.get(face)
+            if i is None:
+                return None
+            counts[i] = count
+        return tuple(counts)
+
+    def _matching(self, matches, fractions):
+        weight = sum(w for outcome, w in zip(self.outcomes, self.weights) if matches(outcome))
+        return self._ratio(weight, fractions)
+
+    def _ratio(self, weight, fractions):
+        if fractions and isinstance(self.denominator, int):
+            return Fraction(weight, self.denominator)
+        return weight / self.denominator
+
+
+def dice_key(dice):
+    """Sorted (face, weight) pairs of dice."""
+    return tuple(_sorted(dice.faces_weights()))
+
+
+def dices_key(dices):
+    """Sorted tuple of dices keys (multiset of dices)."""
+    return tuple(_sorted(dice_key(dice) for dice in dices))
+
+
+@lru_cache(maxsize=1024)
+def sum_distribution(dices_keys):
+    """
+    Sum distribution of dices set by sorted tuple of their keys (multiset of dices).
+    """
+    result = None
+    for key, count in Counter(dices_keys).items():
+        weights = _power(dict(key), count)
+        result = weights if result is None else _convolve(result, weights)
+    totals = sorted(result)
+    return SumDistribution(totals, [result[t] for t in totals])
+
+
+@lru_cache(maxsize=1024)
+def outcome_distribution(dices_keys):
+    """
+    Faces multiset distribution of dices set by sorted tuple of their keys (multiset of dices).
+
+    Identical dices outcomes are enumerated as faces counts
+    (n dices of k faces have C(n + k - 1, k - 1) outcomes instead of k ** n).
+    """
+    faces = _sorted({face for key in dices_keys for face, weight in key})
+    indices = {face: i for i, face in enumerate(faces)}
+    result = None
+    for key, count in Counter(dices_keys).items():
+        weights = _multisets(key, count, indices, len(faces))
+        result = weights if result is None else _combine(result, weights)
+    outcomes = sorted(result, reverse=True)
+    return OutcomeDistribution(faces, outcomes, [result[o] for o in outcomes])
+
+
+def _multisets(key, count, indices, size):
+    # faces counts of count identical dices with multinomial weights
+    faces = [indices[face] for face, weight in key]
+    powers = [[weight ** c for c in range(count + 1)] for face, weight in key]
+    result = {}
+    counts = [0] * size
+
+    def fill(position, left, weight):
+        if position == len(faces) - 1:
+            counts[faces[position]] = left
+            result[tuple(counts)] = weight * powers[position][left]
+            return
+        for c in range(left + 1):
+            counts[faces[position]] = c
+            fill(position + 1, left - c, weight * comb(left, c) * powers[position][c])
+        counts[faces[position]] = 0
+
+    fill(0, count, 1)
+    return result
+
+
+def _combine(a, b):
+    result = {}
+    for x, wx in a.items():
+        for y, wy in b.items():
+            outcome = tuple(i + j for i, j in zip(x, y))
+            result[outcome] = result.get(outcome, 0) + wx * wy
+    return result
+
+
+def _sorted(items):
+    # faces of different types are sorted by their representation
+    items = list(items)
+    try:
+        return sorted(items)
+    except TypeError:
+        return sorted(items, key=repr)
+
+
+def _power(weights, count):
+    # repeated squaring
+    result = None
+    while count:
+        if count & 1:
+            result = weights if result is None else _convolve(result, weights)
+        count >>= 1
+        if count:
+            weights = _convolve(weights, weights)
+    return result
+
+
+def _convolve(a, b):
+    if (
+        len(a) * len(b) >= KRONECKER_THRESHOLD and
+        _is_integral(a) and _is_integral(b) and
+        _is_dense(a) and _is_dense(b)
+    ):
+        return _kronecker_convolve(a, b)
+    result = {}
+    for x, wx in a.items():
+        for y, wy in b.items():
+            result[x + y] = result.get(x + y, 0) + wx * wy
+    return result
+
+
+def _is_integral(weights):
+    return all(type(x) is int and type(w) is int for x, w in weights.items())
+
+
+def _is_dense(weights):
+    # sparse sums would take too many zero coefficients
+    return max(weights) - min(weights) < KRONECKER_DENSITY * len(weights)
+
+
+def _kronecker_convolve(a, b):
+    # polynomials product by big integers product (packed coefficients)
+    a_min, b_min = min(a), min(b)
+    a_coefficients = _coefficients(a, a_min)
+    b_coefficients = _coefficients(b, b_min)
+    bound = sum(a_coefficients) * sum(b_coefficients)
+    size = bound.bit_length() // 8 + 1
+    product = _pack(a_coefficients, size) * _pack(b_coefficients, size)
+    length = len(a_coefficients) + len(b_coefficients) - 1
+    data = product.to_bytes(length * size, 'little')
+    result = {}
+    for i in range(length):
+        weight = int.from_bytes(data[i * size:(i + 1) * size], 'little')
+        if weight:
+            result[a_min + b_min + i] = weight
+    return result
+
+
+def _coefficients(weights, start):
+    coefficients = [0] * (max(weights) - start + 1)
+    for x, w in weights.items():
+        coefficients[x - start] = w
+    return coefficients
+
+
+def _pack(coefficients, size):
+    return int.from_bytes(b''.join(c.to_bytes(size, 'little') for c in coefficients), 'little')
@@ -0,0 +1,543 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# -*- coding: utf-8 -*-
+
+
+import copy
+
+from array import array
+from fractions import Fraction
+from functools import lru_cache
+from itertools import accumulate
+from math import comb, gcd
+from numbers import Number
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from agstuff.exceptions.dices.core import DiceRollsCountError
+from agstuff.exceptions.dices.expressions import (
+    DiceExpressionWrongDiceError, DiceExpressionNonNumericFacesError,
+    DiceExpressionDicesCountError, DiceExpressionKeepCountError,
+    DiceExpressionRerollError, DiceExpressionDepthError,
+    DiceExpressionRulesError, DiceExpressionSuccessesError,
+    DiceExpressionAdditionError, DiceExpressionIntractableError,
+    DiceExpressionQuantileError,
+)
+from agstuff.dices.core import Dice, _typecode, _write
+from agstuff.dices.distribution import SumDistribution, dice_key, _convolve, _power
+from agstuff.instrumentation import core as instrumentation
+from agstuff.rng.core import get_random, SecureRandom
+
+# maximum count of dynamic programming steps of exact distribution calculation
+EXACT_STEPS_LIMIT = 1 << 20
+
+
+class DiceExpression:
+    """
+    Base of dices expressions.
+
+    Expressions are added to each other, to dices and to numbers.
+    Value of expression is got by rolling, many values at once by roll_many
+    as numpy array (if numpy is installed) or array.array
+    or written to out (writable sequence of count items, SharedArray for example).
+
+    Exact distribution is calculated by dynamic programming
+    if it needs at most EXACT_STEPS_LIMIT steps,
+    otherwise DiceExpressionIntractableError is raised.
+    Many values of expression with tractable exact distribution
+    are sampled by it at once, others are simulated.
+    """
+
+    def __add__(self, other):
+        if isinstance(other, Dice):
+            other = DiceRoll(other)
+        if isinstance(other, DiceExpression):
+            return DiceSum(self._terms() + other._terms(), self._constant() + other._constant())
+        if isinstance(other, Number) and not isinstance(other, bool):
+            return DiceSum(self._terms(), self._constant() + other)
+        raise DiceExpressionAdditionError()
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def roll_many(self, count, out=None):
+        if not type(count) is int or count < 1:
+            raise DiceRollsCountError(count)
+        if instrumentation.enabled:
+            instrumentation.count('dice_expression.rolls', count)
+        return _write(self._roll_many(count), out)
+
+    def distribution(self, fractions=False):
+        """Values probabilities by values (Fraction instances if fractions is True)."""
+        return self._sum_distribution().as_dict(fractions)
+
+    def probability(self, total, fractions=False):
+        return self._sum_distribution().probability(total, fractions)
+
+    def cdf(self, total, fractions=False):
+        return self._sum_distribution().cdf(total, fractions)
+
+    def mean(self):
+        return self._sum_distribution().mean()
+
+    def variance(self):
+        return self._sum_distribution().variance()
+
+    def quantile(self, q):
+        if not isinstance(q, Number) or not 0 <= q <= 1:
+            raise DiceExpressionQuantileError(q)
+        return self._sum_distribution().quantile(q)
+
+    def _tractable_distribution(self):
+        try:
+            return self._sum_distribution()
+        except DiceExpressionIntractableError:
+            return None
+
+
+class DiceRoll(DiceExpression):
+    """
+    Roll of count identical dices with numeric faces.
+
+    Rules are set by chained calls (every call returns new expression)
+    and applied in the following order regardless of calls order:
+    rerolls of every roll, explosions of every dice, keeping or dropping dices,
+    counting successes (otherwise value is sum of dices).
+    ```python
+    >>> DiceRoll(Dice(6), 4).drop_lowest().mean()
+    12.244598765432098
+    >>> DiceRoll(Dice(6), 2).reroll([1]).probability(2, fractions=True)
+    Fraction(1, 1296)
+    >>> DiceRoll(Dice(10), 5).explode(compound=False).count_successes(8).distribution()[0]
+    0.16807
+    ```
+
+    If random numbers generator is injected by rng argument
+    (random.Random like object or RandomStream) or created by seed argument
+    dices are rolled by it, otherwise by dice own one.
+    """
+
+    def __init__(self, dice, count=1, rng=None, seed=None):
+        if not isinstance(dice, Dice):
+            raise DiceExpressionWrongDiceError()
+        if _typecode(dice.items) is None:
+            raise DiceExpressionNonNumericFacesError()
+        if not type(count) is int or count < 1:
+            raise DiceExpressionDicesCountError(count)
+        self.dice = dice
+        self.count = count
+        self.rng = None if rng is None and seed is None else get_random(rng, seed)
+        self.rerolls = frozenset()
+        self.reroll_times = 0
+        self.explosions = frozenset()
+        self.explosion_depth = 0
+        self.compound = True
+        self.keep = None
+        self.successes = None
+        self._key = dice_key(dice)
+
+    def __str__(self):
+        return f'{self.count} of {self.dice.items}'
+
+    def __repr__(self):
+        return f'DiceRoll({self})'
+
+    def reroll(self, values, times=1):
+        """
+        Rerolls rolls which are in values at most times (until they are not in values if times is None).
+        """
+        values = frozenset(values)
+        if times is None:
+            if all(face in values for face, weight in self._key):
+                raise DiceExpressionRerollError()
+        elif not type(times) is int or times < 0:
+            raise DiceRollsCountError(times)
+        return self._copy(rerolls=values, reroll_times=times)
+
+    def explode(self, values=None, depth=10, compound=True):
+        """
+        Rolls one more time every roll which is in values (the highest face by default)
+        at most depth times in a row.
+
+        Explosions are added to dice value if compound is True
+        otherwise they are separate dices (which could not be kept or dropped).
+        """
+        if values is None:
+            values = [max(face for face, weight in self._key)]
+        if not type(depth) is int or depth < 0:
+            raise DiceExpressionDepthError(depth)
+        if not compound and self.keep is not None:
+            raise DiceExpressionRulesError()
+        return self._copy(explosions=frozenset(values), explosion_depth=depth, compound=compound)
+
+    def keep_highest(self, count=1):
+        return self._keep(True, count)
+
+    def keep_lowest(self, count=1):
+        return self._keep(False, count)
+
+    def drop_highest(self, count=1):
+        return self._keep(False, self.count - count)
+
+    def drop_lowest(self, count=1):
+        return self._keep(True, self.count - count)
+
+    def count_successes(self, threshold=None, values=None):
+        """
+        Value is count of dices greater or equal threshold or in values
+        (count of rolls for explosions which are separate dices).
+        """
+        if (threshold is None) == (values is None):
+            raise DiceExpressionSuccessesError()
+        return self._copy(successes=(threshold, None if values is None else frozenset(values)))
+
+    def rolling(self):
+        if instrumentation.enabled:
+            instrumentation.count('dice_expression.rolls')
+        return self._evaluate(self._random())
+
+    def _keep(self, highest, count):
+        if not type(count) is int or not 1 <= count <= self.count:
+            raise DiceExpressionKeepCountError(count, self.count)
+        if not self.compound:
+            raise DiceExpressionRulesError()
+        return self._copy(keep=(highest, count))
+
+    def _copy(self, **rules):
+        expression = copy.copy(self)
+        expression.__dict__.update(rules)
+        return expression
+
+    def _terms(self):
+        return (self,)
+
+    def _constant(self):
+        return 0
+
+    def _random(self):
+        return self.dice.rng if self.rng is None else self.rng
+
+    def _rules(self):
+        return (
+            self.rerolls, self.reroll_times,
+            self.explosions, self.explosion_depth, self.compound,
+            self.keep, self.successes,
+        )
+
+    def _sum_distribution(self):
+        distribution = roll_distribution(self._key, self.count, self._rules())
+        if distribution is None:
+            raise DiceExpressionIntractableError(EXACT_STEPS_LIMIT)
+        return distribution
+
+    def _typecode(self):
+        if self.successes is not None:
+            return 'q'
+        return _typecode([face for face, weight in self._key])
+
+    def _roll_many(self, count):
+        rng = self._random()
+        distribution = self._tractable_distribution()
+        if distribution is not None:
+            return _sample(distribution, count, rng, self._typecode())
+        if numpy is not None and not isinstance(rng, SecureRandom):
+            return self._simulate(numpy.random.default_rng(rng.getrandbits(64)), count)
+        return array(self._typecode(), [self._evaluate(rng) for i in range(count)])
+
+    def _evaluate(self, rng):
+        faces = [face for face, weight in self._key]
+        cumulative = list(accumulate(weight for face, weight in self._key))
+        rerolls, times = self.rerolls, self.reroll_times
+        explosions, depth = self.explosions, self.explosion_depth
+        success = None if self.successes is None else _success(self.successes)
+        score = success if success is not None and not self.compound else None
+
+        def roll():
+            value = rng.choices(faces, cum_weights=cumulative)[0]
+            attempt = 0
+            while value in rerolls and (times is None or attempt < times):
+                value = rng.choices(faces, cum_weights=cumulative)[0]
+                attempt += 1
+            return value
+
+        values = []
+        for i in range(self.count):
+            last = roll()
+            value = last if score is None else score(last)
+            for j in range(depth):
+                if last not in explosions:
+                    break
+                last = roll()
+                value += last if score is None else score(last)
+            values.append(value)
+        if self.keep is not None:
+            highest, kept = self.keep
+            values.sort(reverse=highest)
+            values = values[:kept]
+        if success is not None and self.compound:
+            values = [success(value) for value in values]
+        return sum(values)
+
+    def _simulate(self, generator, count):
+        # every step is done for all evaluations at once
+        faces = numpy.asarray([face for face, weight in self._key])
+        weights = numpy.asarray([weight for face, weight in self._key], dtype=numpy.float64)
+        probabilities = weights / weights.sum()
+        rerolls = numpy.asarray(sorted(self.rerolls))
+        explosions = numpy.asarray(sorted(self.explosions))
+        times = self.reroll_times
+
+        def roll(size):
+            values = generator.choice(faces, size=size, p=probabilities)
+            rerolled = numpy.isin(values, rerolls)
+            attempt = 0
+            while rerolled.any() and (times is None or attempt < times):
+                values[rerolled] = generator.choice(faces, size=int(rerolled.sum()), p=probabilities)
+                rerolled &= numpy.isin(values, rerolls)
+                attempt += 1
+            return values
+
+        def success(values):
+            threshold, items = self.successes
+            if items is None:
+                return (values >= threshold).astype(numpy.int64)
+            return numpy.isin(values, sorted(items)).astype(numpy.int64)
+
+        separate = self.successes is not None and not self.compound
+        values = roll((count, self.count))
+        scores = success(values) if separate else values.copy()
+        active = numpy.isin(values, explosions)
+        for i in range(self.explosion_depth):
+            if not active.any():
+                break
+            extra = roll(int(active.sum()))
+            scores[active] += success(extra) if separate else extra
+            exploded = numpy.zeros_like(active)
+            exploded[active] = numpy.isin(extra, explosions)
+            active = exploded
+        if self.keep is not None:
+            highest, kept = self.keep
+            scores.sort(axis=1)
+            scores = scores[:, -kept:] if highest else scores[:, :kept]
+        if self.successes is not None and self.compound:
+            scores = success(scores)
+        return scores.sum(axis=1)
+
+
+class DiceSum(DiceExpression):
+    """
+    Sum of dices expressions values and constant.
+    ```python
+    >>> expression = DiceRoll(Dice(20)).keep_highest() + DiceRoll(Dice(20)) + 5
+    ```
+    """
+
+    def __init__(self, terms, constant=0):
+        self.terms = tuple(terms)
+        self.constant = constant
+        self._distribution = None
+
+    def __str__(self):
+        return ' + '.join([f'({term})' for term in self.terms] + [str(self.constant)])
+
+    def __repr__(self):
+        return f'DiceSum({self})'
+
+    def rolling(self):
+        return sum(term.rolling() for term in self.terms) + self.constant
+
+    def _terms(self):
+        return self.terms
+
+    def _constant(self):
+        return self.constant
+
+    def _typecode(self):
+        typecodes = [term._typecode() for term in self.terms]
+        return 'q' if type(self.constant) is int and all(t == 'q' for t in typecodes) else 'd'
+
+    def _sum_distribution(self):
+        if self._distribution is None:
+            weights = {self.constant: 1}
+            for term in self.terms:
+                distribution = term._sum_distribution()
+                weights = _convolve(weights, dict(zip(distribution.totals, distribution.weights)))
+            totals = sorted(weights)
+            self._distribution = SumDistribution(totals, [weights[t] for t in totals])
+        return self._distribution
+
+    def _roll_many(self, count):
+        distribution = self._tractable_distribution()
+        if distribution is not None:
+            return _sample(distribution, count, self.terms[0]._random(), self._typecode())
+        values = [term._roll_many(count) for term in self.terms]
+        if numpy is not None and all(isinstance(v, numpy.ndarray) for v in values):
+            return sum(values[1:], values[0]) + self.constant
+        return array(self._typecode(), [sum(items) + self.constant for items in zip(*values)])
+
+
+@lru_cache(maxsize=1024)
+def roll_distribution(key, count, rules):
+    """
+    Exact value distribution of count identical dices (set by dice key) with rules applied
+    or None if it needs more than EXACT_STEPS_LIMIT steps.
+    """
+    rerolls, times, explosions, depth, compound, keep, successes = rules
+    success = None if successes is None else _success(successes)
+    probabilities = _rerolled(_probabilities(key), rerolls, times)
+    # dice value is sum of chain of exploded rolls scores
+    separate = success is not None and not compound
+    chains = _exploded(probabilities, explosions, depth, success if separate else None)
+    if chains is None:
+        return None
+    dice = _weights(chains)
+    score = success if success is not None and compound else None
+    if keep is None:
+        if score is not None:
+            dice = _scored(dice, score)
+        if len(dice) * count > EXACT_STEPS_LIMIT:
+            return None
+        weights = _power(dice, count)
+    else:
+        weights = _kept(dice, count, keep, score)
+        if weights is None:
+            return None
+    totals = sorted(weights)
+    return SumDistribution(totals, [weights[t] for t in totals])
+
+
+def _probabilities(key):
+    total = sum(weight for face, weight in key)
+    if all(type(weight) is int for face, weight in key):
+        return {face: Fraction(weight, total) for face, weight in key}
+    return {face: weight / total for face, weight in key}
+
+
+def _rerolled(probabilities, rerolls, times):
+    kept = {face: p for face, p in probabilities.items() if face not in rerolls}
+    if times is None:
+        rest = sum(kept.values())
+        return {face: p / rest for face, p in kept.items()}
+    result = dict.fromkeys(probabilities, 0)
+    # probability to reach current attempt
+    reach = 1
+    for attempt in range(times):
+        for face, p in kept.items():
+            result[face] += reach * p
+        reach *= 1 - sum(kept.values())
+    for face, p in probabilities.items():
+        result[face] += reach * p
+    return {face: p for face, p in result.items() if p}
+
+
+def _exploded(probabilities, explosions, depth, score):
+    scores = {face: face if score is None else score(face) for face in probabilities}
+    result = {}
+    for face, p in probabilities.items():
+        result[scores[face]] = result.get(scores[face], 0) + p
+    if not explosions.intersection(probabilities):
+        return result
+    steps = 0
+    # result is distribution of chain with at most i explosions
+    for i in range(depth):
+        steps += len(probabilities) * len(result)
+        if steps > EXACT_STEPS_LIMIT:
+            return None
+        chained = {}
+        for face, p in probabilities.items():
+            s = scores[face]
+            if face in explosions:
+                for value, pv in result.items():
+                    chained[s + value] = chained.get(s + value, 0) + p * pv
+            else:
+                chained[s] = chained.get(s, 0) + p
+        result = chained
+    return result
+
+
+def _weights(probabilities):
+    # integer weights proportional to probabilities if they are fractions
+    if not all(type(p) is Fraction for p in probabilities.values()):
+        return probabilities
+    denominator = 1
+    for p in probabilities.values():
+        denominator = denominator * p.denominator // gcd(denominator, p.denominator)
+    return {value: int(p * denominator) for value, p in probabilities.items()}
+
+
+def _scored(weights, score):
+    result = {}
+    for value, weight in weights.items():
+        result[score(value)] = result.get(score(value), 0) + weight
+    return result
+
+
+def _kept(weights, count, keep, score):
+    # values are assigned to dices from the best to the worst,
+    # all assigned dices are kept until kept dices count is reached,
+    # so states are (kept dices count, kept dices score)
+    highest, kept = keep
+    rest = sum(weights.values())
+    states = {(0, 0): 1}
+    result = {}
+    steps = 0
+    for value in sorted(weights, reverse=highest):
+        weight = weights[value]
+        rest -= weight
+        s = value if score is None else score(value)
+        powers = [1]
+        for i in range(count):
+            powers.append(powers[-1] * weight)
+        factors = {}
+        updated = {}
+        for (taken, total), state_weight in states.items():
+            left = count - taken
+            need = kept - taken
+            steps += need + 1
+            if steps > EXACT_STEPS_LIMIT:
+                return None
+            if taken not in factors:
+                # weights of c dices of value and the rest of them with worse values
+                ways = [comb(left, c) * powers[c] for c in range(left + 1)]
+                finishing = sum(ways[c] * rest ** (left - c) for c in range(need, left + 1))
+                factors[taken] = ways, finishing
+            ways, finishing = factors[taken]
+            t = total + need * s
+            result[t] = result.get(t, 0) + state_weight * finishing
+            for c in range(need):
+                key = (taken + c, total + c * s)
+                updated[key] = updated.get(key, 0) + state_weight * ways[c]
+        states = updated
+    return {t: w for t, w in result.items() if w}
+
+
+def _success(successes):
+    threshold, values = successes
+    if values is None:
+        return lambda value: int(value >= threshold)
+    return lambda value: int(value in values)
+
+
+def _sample(distribution, count, rng, typecode):
+    # values are sampled at once by their exact distribution
+    cumulative = [c / distribution.denominator for c in distribution.cumulative]
+    if numpy is not None and not isinstance(rng, SecureRandom):
+        generator = numpy.random.default_rng(rng.getrandbits(64))
+        indices = numpy.searchsorted(cumulative, generator.random(count), side='right')
+        return numpy.asarray(distribution.totals)[numpy.minimum(indices, len(cumulative) - 1)]
+    return array(typecode, rng.choices(distribution.totals, cum_weights=cumulative, k=count))
@@ -13,13 +13,41 @@
 # limitations under the License.
 
 
-from agstuff.exceptions.cards.card import CardWeightSymbolError, CardSuitSymbolError
-from agstuff.exceptions.cards.deck import DeckCountTypeError, DeckCountNumberError
-from agstuff.exceptions.cards.cards import CardsStringTypeError, CardsCardTypeError
+from agstuff.exceptions.cards.card import CardWeightSymbolError, CardSuitSymbolError, CardCodeError
+from agstuff.exceptions.cards.deck import DeckCountTypeError, DeckCountNumberError, DeckCheckpointError
+from agstuff.exceptions.cards.cards import (
+    CardsStringTypeError, CardsCardTypeError, CardsLineError, CardsCheckpointError,
+)
+from agstuff.exceptions.cards.card_set import CardSetAbstractCardError, CardSetMaskError
+from agstuff.exceptions.cards.shoe import ShoeDecksCountError, ShoePenetrationError
+from agstuff.exceptions.cards.pool import PoolSizeError, PoolOwnershipError, PoolTimeoutError
+from agstuff.exceptions.cards.batch import (
+    HandBatchWidthError, HandBatchHandSizeError, HandBatchCardError, HandBatchSelectionError
+)
+from agstuff.exceptions.cards.combinations import (
+    CombinationsCountError, CombinationsRankError, CombinationsCardsError
+)
+from agstuff.exceptions.cards.probability import ProbabilityDrawsCountError, ProbabilityHitsCountError
+from agstuff.exceptions.cards.evaluator import (
+    EvaluatorCardsCountError, EvaluatorAbstractCardError, EvaluatorDuplicateCardsError
+)
+from agstuff.exceptions.cards.equity import (
+    EquityPlayersCountError, EquityHandCardsCountError,
+    EquityBoardCardsCountError, EquityDuplicateCardsError,
+)
 
 
 __all__ = [
-    'CardWeightSymbolError', 'CardSuitSymbolError',
-    'DeckCountTypeError', 'DeckCountNumberError',
-    'CardsStringTypeError', 'CardsCardTypeError',
+    'CardWeightSymbolError', 'CardSuitSymbolError', 'CardCodeError',
+    'DeckCountTypeError', 'DeckCountNumberError', 'DeckCheckpointError',
+    'CardsStringTypeError', 'CardsCardTypeError', 'CardsLineError', 'CardsCheckpointError',
+    'CardSetAbstractCardError', 'CardSetMaskError',
+    'ShoeDecksCountError', 'ShoePenetrationError',
+    'PoolSizeError', 'PoolOwnershipError', 'PoolTimeoutError',
+    'HandBatchWidthError', 'HandBatchHandSizeError', 'HandBatchCardError', 'HandBatchSelectionError',
+    'CombinationsCountError', 'CombinationsRankError', 'CombinationsCardsError',
+    'ProbabilityDrawsCountError', 'ProbabilityHitsCountError',
+    'EvaluatorCardsCountError', 'EvaluatorAbstractCardError', 'EvaluatorDuplicateCardsError',
+    'EquityPlayersCountError', 'EquityHandCardsCountError',
+    'EquityBoardCardsCountError', 'EquityDuplicateCardsError',
 ]
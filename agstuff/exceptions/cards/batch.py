@@ -0,0 +1,33 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+class HandBatchWidthError(Exception):
+    def __init__(self, width):
+        super().__init__(f"Hand batch width need to be from 1 to 52 not {width!r}.")
+
+
+class HandBatchHandSizeError(Exception):
+    def __init__(self, size, width):
+        super().__init__(f"Hand of {size} cards can not be added to hand batch of width {width}.")
+
+
+class HandBatchCardError(Exception):
+    def __init__(self, card):
+        super().__init__(f"{card!r} is not a real card to add to hand batch.")
+
+
+class HandBatchSelectionError(Exception):
+    def __init__(self, size, count):
+        super().__init__(f"Selection of {size} items does not match hand batch of {count} hands.")
@@ -21,3 +21,8 @@ class CardWeightSymbolError(Exception):
 class CardSuitSymbolError(Exception):
     def __init__(self, symbol):
         super().__init__(f"'{symbol}' is not a correct card suit symbol.")
+
+
+class CardCodeError(Exception):
+    def __init__(self, data):
+        super().__init__(f"{data!r} is not a correct card code.")
@@ -0,0 +1,23 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+class CardSetAbstractCardError(Exception):
+    def __init__(self, card):
+        super().__init__(f"Abstract card '{card.sign}' can not be added to card set.")
+
+
+class CardSetMaskError(Exception):
+    def __init__(self, mask):
+        super().__init__(f"{mask!r} is not a correct card set mask (52 bits 'int' expected).")
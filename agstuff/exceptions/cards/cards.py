@@ -23,3 +23,16 @@ class CardsStringTypeError(Exception):
 class CardsCardTypeError(Exception):
     def __init__(self, card_type):
         super().__init__(f"Type of card in 'cards' argument can not be '{card_type}'.")
+
+
+class CardsLineError(Exception):
+    def __init__(self, line_number, line, sign):
+        self.line_number = line_number
+        self.line = line
+        self.sign = sign
+        super().__init__(f"Line {line_number}: '{sign}' is not a correct card sign.")
+
+
+class CardsCheckpointError(Exception):
+    def __init__(self, token):
+        super().__init__(f"{token!r} is not an active cards checkpoint.")
@@ -0,0 +1,28 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+class CombinationsCountError(Exception):
+    def __init__(self, count, size):
+        super().__init__(f"Combination cards count need to be from 0 to {size} not {count!r}.")
+
+
+class CombinationsRankError(Exception):
+    def __init__(self, rank, size):
+        super().__init__(f"Combination rank need to be from 0 to {size - 1} not {rank!r}.")
+
+
+class CombinationsCardsError(Exception):
+    def __init__(self):
+        super().__init__("Combination need to consist of available cards of the right count.")
@@ -21,3 +21,8 @@ class DeckCountTypeError(Exception):
 class DeckCountNumberError(Exception):
     def __init__(self, count_number):
         super().__init__(f"{count_number} is out of current deck cards count.")
+
+
+class DeckCheckpointError(Exception):
+    def __init__(self, token):
+        super().__init__(f"{token!r} is not an active deck checkpoint.")
@@ -0,0 +1,33 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+class EquityPlayersCountError(Exception):
+    def __init__(self, count):
+        super().__init__(f"At least 2 players hands are needed to calculate equity not {count}.")
+
+
+class EquityHandCardsCountError(Exception):
+    def __init__(self, count):
+        super().__init__(f"Player hand need to contain 1 or 2 cards not {count}.")
+
+
+class EquityBoardCardsCountError(Exception):
+    def __init__(self, count):
+        super().__init__(f"Board can contain 5 cards at most not {count}.")
+
+
+class EquityDuplicateCardsError(Exception):
+    def __init__(self):
+        super().__init__("Hands, board and dead cards can not contain the same card twice.")
@@ -0,0 +1,28 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+class EvaluatorCardsCountError(Exception):
+    def __init__(self, count):
+        super().__init__(f"Hand to evaluate need to contain 5, 6 or 7 cards not {count}.")
+
+
+class EvaluatorAbstractCardError(Exception):
+    def __init__(self, card):
+        super().__init__(f"Abstract card '{card.sign}' can not be evaluated.")
+
+
+class EvaluatorDuplicateCardsError(Exception):
+    def __init__(self):
+        super().__init__("Hand to evaluate can not contain duplicate cards.")
@@ -0,0 +1,28 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+class PoolSizeError(Exception):
+    def __init__(self, max_size):
+        super().__init__(f"Pool max size need to be positive 'int' or None not {max_size!r}.")
+
+
+class PoolOwnershipError(Exception):
+    def __init__(self, item, owner):
+        super().__init__(f"{item!r} is not acquired from pool by owner {owner!r}.")
+
+
+class PoolTimeoutError(Exception):
+    def __init__(self, timeout):
+        super().__init__(f"No pool item is released in {timeout} seconds.")
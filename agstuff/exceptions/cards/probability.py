@@ -0,0 +1,23 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+class ProbabilityDrawsCountError(Exception):
+    def __init__(self, draws, size):
+        super().__init__(f"Draws count need to be from 0 to {size} (unseen cards count) not {draws!r}.")
+
+
+class ProbabilityHitsCountError(Exception):
+    def __init__(self, hits):
+        super().__init__(f"Hits count need to be non-negative 'int' not {hits!r}.")
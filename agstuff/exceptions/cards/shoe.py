@@ -0,0 +1,23 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+class ShoeDecksCountError(Exception):
+    def __init__(self, decks):
+        super().__init__(f"Shoe decks count need to be positive 'int' not {decks!r}.")
+
+
+class ShoePenetrationError(Exception):
+    def __init__(self, penetration):
+        super().__init__(f"Shoe penetration need to be a number from 0 to 1 not {penetration!r}.")
@@ -42,6 +42,39 @@ class DiceWrongFacesItemsCountError(Exception):
         super().__init__(f"Dice \"faces_items\" count need to be greater or equal to {min_count}.")
 
 
+class DiceWrongWeightsCountError(Exception):
+    def __init__(self):
+        super().__init__("Dice \"weights\" count need to be equal to faces count.")
+
+
+class DiceWrongWeightsError(Exception):
+    def __init__(self):
+        super().__init__(
+            "Dice \"weights\" need to be non-negative numbers "
+            "with positive sum."
+        )
+
+
+class DiceRollsCountError(Exception):
+    def __init__(self, count):
+        super().__init__(f"Rolls count need to be positive \"int\" not {count!r}.")
+
+
 class DiceBoxWrongItemAdditionError(Exception):
     def __init__(self):
         super().__init__("Dice instance expected.")
+
+
+class DiceBoxEmptyError(Exception):
+    def __init__(self):
+        super().__init__("Dice box need to contain at least one dice.")
+
+
+class DiceBoxNonNumericFacesError(Exception):
+    def __init__(self):
+        super().__init__("All dices faces need to be numbers.")
+
+
+class DiceBoxQuantileError(Exception):
+    def __init__(self, q):
+        super().__init__(f"Quantile level need to be from 0 to 1 not {q!r}.")
@@ -0,0 +1,73 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+class DiceExpressionWrongDiceError(Exception):
+    def __init__(self):
+        super().__init__("Dice instance expected.")
+
+
+class DiceExpressionNonNumericFacesError(Exception):
+    def __init__(self):
+        super().__init__("Dice faces need to be numbers.")
+
+
+class DiceExpressionDicesCountError(Exception):
+    def __init__(self, count):
+        super().__init__(f"Dices count need to be positive \"int\" not {count!r}.")
+
+
+class DiceExpressionKeepCountError(Exception):
+    def __init__(self, count, dices_count):
+        super().__init__(
+            f"Kept dices count need to be from 1 to {dices_count} not {count!r}."
+        )
+
+
+class DiceExpressionRerollError(Exception):
+    def __init__(self):
+        super().__init__("Not all dice faces could be rerolled without rerolls limit.")
+
+
+class DiceExpressionDepthError(Exception):
+    def __init__(self, depth):
+        super().__init__(f"Explosion depth need to be non-negative \"int\" not {depth!r}.")
+
+
+class DiceExpressionRulesError(Exception):
+    def __init__(self):
+        super().__init__("Dices could not be kept or dropped if explosions add separate dices.")
+
+
+class DiceExpressionSuccessesError(Exception):
+    def __init__(self):
+        super().__init__(
+            "To successes counting "
+            "whether \"threshold\" or \"values\" "
+            "argument need to be passed."
+        )
+
+
+class DiceExpressionAdditionError(Exception):
+    def __init__(self):
+        super().__init__("Dice expression, dice or number expected.")
+
+
+class DiceExpressionIntractableError(Exception):
+    def __init__(self, limit):
+        super().__init__(f"Exact distribution needs more than {limit} steps to be calculated.")
+
+
+class DiceExpressionQuantileError(Exception):
+    def __init__(self, q):
+        super().__init__(f"Quantile level need to be from 0 to 1 not {q!r}.")
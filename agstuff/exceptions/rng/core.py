@@ -0,0 +1,28 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+class RandomStreamSpawnCountError(Exception):
+    def __init__(self, count):
+        super().__init__(f"Count of random streams to spawn need to be positive 'int' not {count!r}.")
+
+
+class SecureRandomBlockSizeError(Exception):
+    def __init__(self, block_size):
+        super().__init__(f"Secure random block size need to be 'int' not less than 2500 not {block_size!r}.")
+
+
+class SecureRandomHealthError(Exception):
+    def __init__(self, reason):
+        super().__init__(f"Secure random entropy health check failed: {reason}.")
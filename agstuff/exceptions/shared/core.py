@@ -0,0 +1,28 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+class SharedArrayLengthError(Exception):
+    def __init__(self, length):
+        super().__init__(f"Shared array length need to be non-negative 'int' not {length!r}.")
+
+
+class SharedArrayPartsCountError(Exception):
+    def __init__(self, parts):
+        super().__init__(f"Shared array parts count need to be positive 'int' not {parts!r}.")
+
+
+class SharedDeckArrayError(Exception):
+    def __init__(self, shared):
+        super().__init__(f"Shared deck state need to be shared array of 53 'B' items not {shared!r}.")
@@ -0,0 +1,186 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+# -*- coding: utf-8 -*-
+
+
+"""
+Opt-in instrumentation: counters and timing histograms of hot paths.
+
+Instrumentation is disabled by default, then hot paths just check `enabled` flag.
+Collected metrics are exported by flush to sinks (callbacks getting metrics snapshot).
+```python
+>>> from agstuff.cards.core import Cards, Deck
+>>> from agstuff.instrumentation import core as instrumentation
+>>>
+>>> exported = []
+>>> instrumentation.enable(sink=exported.append)
+>>> Cards().pull(Deck(), 5)
+>>> metrics = instrumentation.flush()
+>>> metrics['counters']
+{'deck.refreshes': 1, 'deck.dealt_cards': 5, 'cards.pulled_cards': 5}
+>>> metrics['histograms']['cards.pull']['count']
+1
+>>> instrumentation.disable()
+```
+
+Metrics names:
+    counters - card.constructions, card.creations, validators.card_symbol_errors,
+        deck.refreshes, deck.dealt_cards, cards.pulled_cards, dice.rolls, dice_box.rolls;
+    histograms (seconds) - deck.refresh, cards.pull, dice.rolling, dice_box.rolling.
+"""
+
+import bisect
+import threading
+import time
+
+from contextlib import contextmanager
+
+
+enabled = False
+clock = time.perf_counter
+
+# histograms buckets upper bounds (seconds), the last bucket is unbounded
+BUCKETS = tuple(10 ** (e / 2) for e in range(-14, 1))
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+_sinks = []
+
+
+class Histogram:
+    """Values count, sum, min, max and counts by buckets (see BUCKETS)."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def __str__(self):
+        return f'{self.count} values, mean {self.mean}'
+
+    def __repr__(self):
+        return f'{self.count} values, mean {self.mean}'
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def observe(self, value):
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        self.buckets[bisect.bisect_left(BUCKETS, value)] += 1
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'total': self.total,
+            'min': self.min,
+            'max': self.max,
+            'buckets': list(self.buckets),
+        }
+
+
+def enable(sink=None):
+    """Enable instrumentation (and add sink if it is set)."""
+    global enabled
+    if sink is not None:
+        add_sink(sink)
+    enabled = True
+
+
+def disable():
+    """Disable instrumentation (collected metrics are kept until flush or reset)."""
+    global enabled
+    enabled = False
+
+
+def add_sink(sink):
+    """Add callback getting metrics snapshot on every flush."""
+    with _lock:
+        if sink not in _sinks:
+            _sinks.append(sink)
+
+
+def remove_sink(sink):
+    with _lock:
+        if sink in _sinks:
+            _sinks.remove(sink)
+
+
+def count(name, value=1):
+    """Increase counter."""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def observe(name, value):
+    """Add value (seconds for timings) to histogram."""
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+        histogram.observe(value)
+
+
+@contextmanager
+def timed(name):
+    """Observe block execution time (if instrumentation is enabled)."""
+    if not enabled:
+        yield
+        return
+    start = clock()
+    try:
+        yield
+    finally:
+        observe(name, clock() - start)
+
+
+def snapshot():
+    """Collected metrics as dict of counters and histograms dicts."""
+    with _lock:
+        return {
+            'counters': dict(_counters),
+            'histograms': {name: h.as_dict() for name, h in _histograms.items()},
+        }
+
+
+def reset():
+    """Drop collected metrics."""
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def flush():
+    """Export collected metrics to sinks and drop them. Returns exported snapshot."""
+    with _lock:
+        metrics = {
+            'counters': dict(_counters),
+            'histograms': {name: h.as_dict() for name, h in _histograms.items()},
+        }
+        _counters.clear()
+        _histograms.clear()
+        sinks = list(_sinks)
+    for sink in sinks:
+        sink(metrics)
+    return metrics
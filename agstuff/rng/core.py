@@ -0,0 +1,302 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+# -*- coding: utf-8 -*-
+
+
+import hashlib
+import os
+import random
+import re
+import threading
+import weakref
+
+from itertools import islice
+
+from agstuff.exceptions.rng.core import (
+    RandomStreamSpawnCountError, SecureRandomBlockSizeError, SecureRandomHealthError
+)
+
+
+def get_random(rng=None, seed=None):
+    """
+    Random numbers generator to use.
+
+    Injected rng (random.Random like object or RandomStream) has priority,
+    otherwise new random.Random is created by seed,
+    otherwise global random module is used.
+    """
+    if rng is not None:
+        if isinstance(rng, RandomStream):
+            return rng.generator()
+        return rng
+    if seed is not None:
+        return random.Random(seed)
+    return random
+
+
+class RandomStream:
+    """
+    Statistically independent random streams factory.
+
+    Stream is set by root seed and spawn key (path in spawn tree) like numpy SeedSequence.
+    Child streams spawned from the same stream never repeat their keys,
+    their generators are seeded by hash of (seed, spawn key),
+    so they could be handed out to different threads or processes.
+    If seed is not passed it is taken from os.urandom.
+    ```python
+    >>> stream = RandomStream(seed=42)
+    >>> workers = stream.spawn(4)
+    >>> rng = workers[0].generator()
+    >>> rng.random()
+    0.8554242734779821
+    ```
+    """
+
+    def __init__(self, seed=None, spawn_key=()):
+        if seed is None:
+            seed = int.from_bytes(os.urandom(16), 'big')
+        self.seed = seed
+        self.spawn_key = tuple(spawn_key)
+        self._spawned = 0
+
+    def __str__(self):
+        return f'RandomStream({self.seed!r}, {self.spawn_key!r})'
+
+    def __repr__(self):
+        return f'RandomStream({self.seed!r}, {self.spawn_key!r})'
+
+    def spawn(self, count):
+        if not type(count) is int or count < 1:
+            raise RandomStreamSpawnCountError(count)
+        start = self._spawned
+        self._spawned += count
+        return [
+            RandomStream(self.seed, self.spawn_key + (i,))
+            for i in range(start, start + count)
+        ]
+
+    def generate_seed(self):
+        data = repr((self.seed, self.spawn_key)).encode()
+        return int.from_bytes(hashlib.sha512(data).digest(), 'big')
+
+    def generator(self):
+        return random.Random(self.generate_seed())
+
+
+class SecureRandom(random.Random):
+    """
+    Cryptographically secure random numbers generator (random.Random like object).
+
+    Entropy is read from os.urandom by large blocks, next block is read
+    by background thread while current one is used, so there is no syscall per card.
+    Integers in range (randrange, choice, shuffle and so on)
+    are got by rejection sampling, so they are unbiased.
+    Seed is ignored and state could not be saved or restored.
+    Forked process drops read entropy blocks, so it never shares them with parent process.
+
+    Every new block is checked by health_check callable (block bytes -> error message or None),
+    by default just against repetition of the previous block beginning,
+    statistical_test could be used to check blocks by FIPS 140-2 tests,
+    self_test checks fresh entropy by them.
+    Failed check raises SecureRandomHealthError (by the next drawing after background reading).
+    ```python
+    >>> rng = SecureRandom()
+    >>> deck = Deck(rng=rng)
+    >>> dice = Dice(6, rng=rng)
+    >>> rng.self_test()
+    ```
+    """
+
+    MIN_BLOCK_SIZE = 2500
+
+    def __init__(self, block_size=1 << 16, health_check=None, background=True):
+        if not type(block_size) is int or block_size < self.MIN_BLOCK_SIZE:
+            raise SecureRandomBlockSizeError(block_size)
+        self.block_size = block_size
+        self.health_check = health_check
+        self.background = background
+        self._lock = threading.Lock()
+        self._previous = None
+        # bytes are taken by next (atomic), so every byte is used once by any threads
+        self._bytes = iter(self._read_block())
+        self._next = None
+        # health error of block read by background thread
+        self._error = None
+        self._refill = None
+        super().__init__()
+        self._start_refill()
+        _secure_randoms.add(self)
+
+    def __reduce__(self):
+        return (self.__class__, (self.block_size, self.health_check, self.background))
+
+    def seed(self, *args, **kwargs):
+        """Ignored, secure generator can not be seeded."""
+
+    def getstate(self):
+        raise NotImplementedError('Secure random state can not be saved.')
+
+    def setstate(self, state):
+        raise NotImplementedError('Secure random state can not be restored.')
+
+    def random(self):
+        return self.getrandbits(53) * (2 ** -53)
+
+    def getrandbits(self, k):
+        if k < 0:
+            raise ValueError('number of bits must be non-negative')
+        size = (k + 7) // 8
+        return int.from_bytes(self._take(size), 'little') >> (size * 8 - k)
+
+    def _randbelow(self, n):
+        # rejection sampling of k bits numbers
+        k = n.bit_length()
+        if k > 8:
+            r = self.getrandbits(k)
+            while r >= n:
+                r = self.getrandbits(k)
+            return r
+        shift = 8 - k
+        while True:
+            byte = next(self._bytes, None)
+            if byte is None:
+                self._swap_blocks()
+            elif byte >> shift < n:
+                return byte >> shift
+
+    def self_test(self):
+        """Check fresh entropy by statistical tests."""
+        error = statistical_test(os.urandom(self.MIN_BLOCK_SIZE))
+        if error is not None:
+            raise SecureRandomHealthError(error)
+
+    def _take(self, size):
+        if size > self.block_size:
+            return os.urandom(size)
+        data = bytes(islice(self._bytes, size))
+        while len(data) < size:
+            self._swap_blocks()
+            data += bytes(islice(self._bytes, size - len(data)))
+        return data
+
+    def _swap_blocks(self):
+        exhausted = self._bytes
+        with self._lock:
+            # blocks could be already swapped by other thread
+            if self._bytes is not exhausted:
+                return
+            if self._refill is not None:
+                self._refill.join()
+            if self._error is not None:
+                error, self._error = self._error, None
+                raise error
+            block = self._next
+            if block is None:
+                block = self._read_block()
+            self._next = None
+            self._bytes = iter(block)
+            self._start_refill()
+
+    def _drop_blocks(self):
+        # forked process must not use the same entropy as parent one,
+        # so blocks are read again by the next drawing
+        self._lock = threading.Lock()
+        self._bytes = iter(())
+        self._next = None
+        self._error = None
+        self._refill = None
+
+    def _start_refill(self):
+        if not self.background:
+            return
+        self._refill = threading.Thread(target=self._fill_next, daemon=True)
+        self._refill.start()
+
+    def _fill_next(self):
+        try:
+            self._next = self._read_block()
+        except SecureRandomHealthError as error:
+            # error is raised by the calling thread
+            self._next = None
+            self._error = error
+
+    def _read_block(self):
+        block = os.urandom(self.block_size)
+        # continuous test of repeated output
+        beginning = block[:16]
+        if beginning == self._previous:
+            raise SecureRandomHealthError('repeated entropy block')
+        self._previous = beginning
+        if self.health_check is not None:
+            error = self.health_check(block)
+            if error is not None:
+                raise SecureRandomHealthError(error)
+        return block
+
+
+_secure_randoms = weakref.WeakSet()
+
+
+def _after_fork():
+    for rng in list(_secure_randoms):
+        rng._drop_blocks()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+_LONG_RUN = re.compile('0{26,}|1{26,}')
+_RUNS = re.compile('0+|1+')
+# FIPS 140-2 runs test intervals by run length (6 means 6 and longer)
+_RUNS_INTERVALS = {
+    1: (2315, 2685), 2: (1114, 1386), 3: (527, 723),
+    4: (240, 384), 5: (103, 209), 6: (103, 209),
+}
+
+
+def statistical_test(data):
+    """
+    FIPS 140-2 statistical tests (monobit, poker, runs and long run) of first 20000 bits of data.
+
+    Returns failed test description or None.
+    """
+    data = data[:2500]
+    if len(data) < 2500:
+        return 'not enough data (20000 bits needed)'
+    bits = bin(int.from_bytes(data, 'big'))[2:].zfill(20000)
+    ones = bits.count('1')
+    if not 9725 < ones < 10275:
+        return f'monobit test ({ones} ones)'
+    nibbles = [0] * 16
+    for byte in data:
+        nibbles[byte >> 4] += 1
+        nibbles[byte & 15] += 1
+    poker = 16 / 5000 * sum(n * n for n in nibbles) - 5000
+    if not 2.16 < poker < 46.17:
+        return f'poker test ({poker:.2f})'
+    if _LONG_RUN.search(bits):
+        return 'long run test'
+    runs = {}
+    for run in _RUNS.findall(bits):
+        key = (run[0], min(len(run), 6))
+        runs[key] = runs.get(key, 0) + 1
+    for length, (low, high) in _RUNS_INTERVALS.items():
+        for bit in '01':
+            count = runs.get((bit, length), 0)
+            if not low <= count <= high:
+                return f'runs test ({count} runs of {bit} of length {length})'
+    return None
@@ -0,0 +1,303 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+# -*- coding: utf-8 -*-
+
+
+"""
+Cards and dices state in shared memory for multiprocess simulations.
+
+Shared objects are pickled as shared memory name and position,
+so workers attach to the same memory (without copying) instead of getting copies.
+Coordinator could split arrays, hands batches and decks sets into disjoint parts for workers.
+```python
+>>> from concurrent.futures import ProcessPoolExecutor
+>>> from agstuff.dices.core import Dice
+>>> from agstuff.shared.core import SharedArray
+>>>
+>>> def roll(part):
+...     Dice(6).roll_many(len(part), out=part)
+...
+>>> with SharedArray('q', 1000000) as rolls:
+...     with ProcessPoolExecutor(4) as executor:
+...         list(executor.map(roll, rolls.split(4)))
+...     rolls.tolist()[:5]
+[3, 6, 1, 1, 4]
+```
+"""
+
+import random
+
+from array import array
+from multiprocessing import shared_memory
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from agstuff.cards.batch import HandBatch
+from agstuff.cards.core import LazyDeck
+from agstuff.exceptions.shared.core import (
+    SharedArrayLengthError, SharedArrayPartsCountError, SharedDeckArrayError
+)
+from agstuff.rng.core import get_random, RandomStream
+
+
+class SharedArray:
+    """
+    Array of length items of typecode (see array.array) in shared memory.
+
+    Created array owns its shared memory (unlinked by unlink or on exit of with block),
+    attached arrays (unpickled ones or got by view and split) just use it.
+    Items are accessed by memoryview or numpy array (see numpy method).
+    Not unlinked shared memory is freed by multiprocessing resource tracker at exit (with warning).
+    """
+
+    def __init__(self, typecode, length):
+        if not type(length) is int or length < 0:
+            raise SharedArrayLengthError(length)
+        itemsize = array(typecode).itemsize
+        memory = _SharedMemory(create=True, size=max(length * itemsize, 1))
+        self._setup(memory, typecode, 0, length, owner=True, opened=True)
+
+    def __reduce__(self):
+        return (_attach_array, (self.name, self.typecode, self.start, self.length))
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        return iter(self._view)
+
+    def __getitem__(self, key):
+        return self._view[key]
+
+    def __setitem__(self, key, value):
+        try:
+            self._view[key] = value
+        except (TypeError, ValueError):
+            if numpy is not None:
+                self.numpy()[key] = value
+            else:
+                self._view[key] = array(self.typecode, value)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+        if self.owner:
+            self.unlink()
+
+    def __str__(self):
+        return f"SharedArray('{self.typecode}', {self.length}) at {self.name}[{self.start}:]"
+
+    def __repr__(self):
+        return f"SharedArray('{self.typecode}', {self.length}) at {self.name}[{self.start}:]"
+
+    @classmethod
+    def from_items(cls, typecode, items):
+        items = array(typecode, items)
+        shared = cls(typecode, len(items))
+        if items:
+            shared._view[:] = items
+        return shared
+
+    def tolist(self):
+        return self._view.tolist()
+
+    def numpy(self):
+        """Numpy array using the same memory (need to be deleted before close)."""
+        return numpy.frombuffer(
+            self._memory.buf, dtype=self.typecode, count=self.length,
+            offset=self.start * self._view.itemsize,
+        )
+
+    def view(self, start, stop):
+        """Array of items from start to stop using the same memory."""
+        start, stop, step = slice(start, stop).indices(self.length)
+        shared = object.__new__(self.__class__)
+        shared._setup(self._memory, self.typecode, self.start + start, max(stop - start, 0), False, False)
+        return shared
+
+    def split(self, parts):
+        """Disjoint views of close lengths."""
+        if not type(parts) is int or parts < 1:
+            raise SharedArrayPartsCountError(parts)
+        return [
+            self.view(self.length * i // parts, self.length * (i + 1) // parts)
+            for i in range(parts)
+        ]
+
+    def close(self):
+        """Stop using shared memory in this process (it is unmapped after release of all its views)."""
+        self._view.release()
+        if self._opened:
+            try:
+                self._memory.close()
+            except BufferError:
+                pass
+
+    def unlink(self):
+        """Free shared memory (after all processes closed it)."""
+        self._memory.unlink()
+
+    def _setup(self, memory, typecode, start, length, owner, opened):
+        self._memory = memory
+        # views share memory opened by array they are got from
+        self._opened = opened
+        self.name = memory.name
+        self.typecode = typecode
+        self.start = start
+        self.length = length
+        self.owner = owner
+        itemsize = array(typecode).itemsize
+        self._view = memory.buf[start * itemsize:(start + length) * itemsize].cast(typecode)
+
+
+class SharedDeck(LazyDeck):
+    """
+    Deck with state (left cards count and cards indices permutation) in shared memory.
+
+    State is shared array of 53 'B' items (a new one is created if it is not set),
+    random numbers generator is pickled like Deck one.
+    Many decks could be created in one shared memory by create_many.
+    """
+
+    def __init__(self, card=None, rng=None, seed=None, shared=None):
+        if shared is None:
+            shared = SharedArray('B', 53)
+        self._share(shared)
+        super().__init__(card, rng, seed)
+
+    def __reduce__(self):
+        rng = None if self.rng is random else self.rng
+        return (_attach_deck, (self.shared, rng))
+
+    @property
+    def _size(self):
+        return self.shared[0]
+
+    @_size.setter
+    def _size(self, size):
+        self.shared[0] = size
+
+    @property
+    def _order(self):
+        return self._indices
+
+    @_order.setter
+    def _order(self, indices):
+        self._indices[:] = indices
+
+    @classmethod
+    def create_many(cls, count, rng=None, seed=None):
+        """
+        Decks in one shared memory (see SharedArray, closed and unlinked by its owner).
+
+        If rng is RandomStream (or seed is set) every deck gets its own spawned stream.
+        """
+        if rng is None and seed is not None:
+            rng = RandomStream(seed)
+        shared = SharedArray('B', 53 * count)
+        decks = []
+        for part in shared.split(count) if count else ():
+            deck_rng = rng.spawn(1)[0] if isinstance(rng, RandomStream) else rng
+            decks.append(cls(rng=deck_rng, shared=part))
+        return shared, decks
+
+    def _share(self, shared):
+        if not isinstance(shared, SharedArray) or shared.typecode != 'B' or len(shared) != 53:
+            raise SharedDeckArrayError(shared)
+        self.shared = shared
+        self._indices = shared[1:]
+
+
+class SharedHandBatch(HandBatch):
+    """
+    Hands batch (see HandBatch) with hands data in shared memory.
+
+    Hands are copied to shared memory once, then batch (or its disjoint parts got by split)
+    is pickled as shared memory name and position.
+    """
+
+    def __init__(self, hands=(), width=7):
+        super().__init__(hands, width)
+        data = self.data.tobytes()
+        self._share(SharedArray.from_items('B', data), width)
+
+    def __reduce__(self):
+        return (_attach_hands, (self.shared, self.width))
+
+    def split(self, parts):
+        """Disjoint parts of close hands counts (sharing the same memory)."""
+        if not type(parts) is int or parts < 1:
+            raise SharedArrayPartsCountError(parts)
+        count = len(self)
+        width = self.width
+        return [
+            _attach_hands(self.shared.view(
+                count * i // parts * width, count * (i + 1) // parts * width
+            ), width)
+            for i in range(parts)
+        ]
+
+    def _share(self, shared, width):
+        self.shared = shared
+        self.width = width
+        if numpy is not None:
+            self.data = shared.numpy().reshape(-1, width)
+        else:
+            self.data = shared[:]
+
+
+class _SharedMemory(shared_memory.SharedMemory):
+    def __del__(self):
+        # memory views (of decks, hands batches, numpy arrays) could outlive shared memory object,
+        # then memory is unmapped after release of the last one
+        try:
+            self.close()
+        except BufferError:
+            pass
+
+
+def _attach_memory(name):
+    try:
+        # shared memory is tracked by its creator only
+        return _SharedMemory(name=name, track=False)
+    except TypeError:
+        return _SharedMemory(name=name)
+
+
+def _attach_array(name, typecode, start, length):
+    shared = object.__new__(SharedArray)
+    shared._setup(_attach_memory(name), typecode, start, length, False, True)
+    return shared
+
+
+def _attach_deck(shared, rng):
+    deck = object.__new__(SharedDeck)
+    deck._share(shared)
+    deck.rng = get_random(rng)
+    deck._ready = 0
+    deck._journal = None
+    return deck
+
+
+def _attach_hands(shared, width):
+    batch = object.__new__(SharedHandBatch)
+    batch._share(shared, width)
+    return batch
@@ -15,17 +15,21 @@
 
 from functools import wraps
 
+from agstuff.instrumentation import core as instrumentation
+
 
 class CardSymbolValidator:
     def __init__(self, symbols, exception):
-        self._symbols = symbols
+        self._symbols = frozenset(symbols)
         self._exception = exception
 
     def __call__(self, init_function):
         @wraps(init_function)
         def wrap(init_self, symbol):
             symbol = str(symbol)
-            if not symbol in set(self._symbols):
+            if not symbol in self._symbols:
+                if instrumentation.enabled:
+                    instrumentation.count('validators.card_symbol_errors')
                 raise self._exception(symbol)
             init_function(init_self, symbol)
         return wrap
@@ -0,0 +1,178 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+# -*- coding: utf-8 -*-
+
+
+"""
+Cards and dices hot paths benchmarks.
+
+Every benchmark result is the best (of several repeats) time of one call in seconds.
+Results are written as JSON and compared with stored baseline,
+slowdown more than threshold is reported as regression (exit code 1).
+```
+$ python benchmarks/run.py
+$ python benchmarks/run.py --output results.json --threshold 0.25
+$ python benchmarks/run.py --save-baseline
+```
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agstuff.cards.core import Card, Cards, Deck
+from agstuff.dices.core import Dice, DiceBox
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+PULL_COUNTS = (1, 5, 52)
+BOX_SIZES = (1, 5, 20)
+
+
+def card_construction():
+    Card('As')
+
+
+def cards_parsing():
+    Cards('As/Ks/Qs/Js/Ts/2d/7c')
+
+
+def deck_refresh(deck):
+    def refresh():
+        deck.refresh()
+    return refresh
+
+
+def deck_push_cards(deck, count):
+    def push_cards():
+        deck.refresh()
+        list(deck.push_cards(count))
+    return push_cards
+
+
+def cards_pull(deck, count):
+    def pull():
+        deck.refresh()
+        cards = Cards()
+        cards.pull(deck, count)
+    return pull
+
+
+def cards_contains(cards, card):
+    def contains():
+        card in cards
+    return contains
+
+
+def dice_rolling(dice):
+    return dice.rolling
+
+
+def dice_box_rolling(size):
+    box = DiceBox(seed=0)
+    for i in range(size):
+        box.add(Dice(6, seed=i))
+    return box.rolling
+
+
+def benchmarks():
+    """Benchmarks functions by names."""
+    result = {
+        'card_construction': card_construction,
+        'cards_parsing': cards_parsing,
+        'deck_refresh': deck_refresh(Deck(seed=0)),
+    }
+    for count in PULL_COUNTS:
+        result[f'deck_push_cards_{count}'] = deck_push_cards(Deck(seed=0), count)
+        result[f'cards_pull_{count}'] = cards_pull(Deck(seed=0), count)
+    cards = Cards('As/Ks/Qs/Js/Ts/2d/7c')
+    result['cards_contains_hit'] = cards_contains(cards, Card('7c'))
+    result['cards_contains_miss'] = cards_contains(cards, Card('7h'))
+    result['dice_rolling'] = dice_rolling(Dice(6, seed=0))
+    for size in BOX_SIZES:
+        result[f'dice_box_rolling_{size}'] = dice_box_rolling(size)
+    return result
+
+
+def run(names=None, repeat=5):
+    """Best time of one call in seconds by benchmark name."""
+    results = {}
+    for name, function in benchmarks().items():
+        if names and name not in names:
+            continue
+        timer = timeit.Timer(function)
+        number, _ = timer.autorange()
+        results[name] = min(timer.repeat(repeat, number)) / number
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Ratios of results to baseline ones and names of regressions (ratio above 1 + threshold)."""
+    ratios = {
+        name: seconds / baseline[name]
+        for name, seconds in results.items() if baseline.get(name)
+    }
+    regressions = [name for name, ratio in ratios.items() if ratio > 1 + threshold]
+    return ratios, regressions
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('names', nargs='*', help='benchmarks names (all by default)')
+    parser.add_argument('--output', help='results JSON file path (stdout by default)')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='baseline JSON file path')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed relative slowdown')
+    parser.add_argument('--repeat', type=int, default=5, help='repeats count')
+    parser.add_argument('--save-baseline', action='store_true', help='save results as baseline')
+    args = parser.parse_args(args)
+
+    report = {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'results': run(args.names, args.repeat),
+    }
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write('\n')
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        ratios, regressions = compare(report['results'], baseline, args.threshold)
+        report['ratios'] = ratios
+        report['regressions'] = regressions
+        for name, ratio in ratios.items():
+            mark = ' REGRESSION' if name in regressions else ''
+            print(f'{name:<24} {report["results"][name] * 1e6:10.3f} us {ratio:6.2f}x{mark}', file=sys.stderr)
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    return 1 if report.get('regressions') else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
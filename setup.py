@@ -36,13 +36,11 @@ setup(
         "License :: OSI Approved :: Apache Software License",
         "Programming Language :: Python",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.6",
-        "Programming Language :: Python :: 3.7",
         "Programming Language :: Python :: 3.8",
         "Programming Language :: Python :: 3.9",
         "Programming Language :: Python :: 3 :: Only",
     ],
     keywords='cards dices',
-    packages=find_packages(exclude=['tests*', 'examples*']),
-    python_requires='>=3.6',
+    packages=find_packages(exclude=['tests*', 'examples*', 'benchmarks*']),
+    python_requires='>=3.8',
 )
@@ -0,0 +1,33 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from agstuff.cards import batch
+from agstuff.dices import core as dices_core, expressions
+from agstuff.shared import core as shared_core
+
+# modules using numpy if it is installed
+NUMPY_MODULES = (batch, dices_core, expressions, shared_core)
+
+
+@pytest.fixture(params=['numpy', 'array'])
+def backend(request, monkeypatch):
+    """Test runs with numpy (if it is installed) and with array.array fallback."""
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        for module in NUMPY_MODULES:
+            monkeypatch.setattr(module, 'numpy', None)
+    return request.param
@@ -0,0 +1,91 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+
+import pytest
+
+from agstuff.cards.core import Card, Cards, CardSet
+from agstuff.cards.batch import HandBatch
+from agstuff.exceptions.cards import (
+    HandBatchWidthError, HandBatchHandSizeError, HandBatchCardError, HandBatchSelectionError
+)
+
+
+@pytest.fixture
+def batch(backend):
+    return HandBatch(['As/Ks', 'Qh/Qd/2c', Cards('7c/2d'), CardSet('5h'), ''], width=3)
+
+
+class TestHandBatch:
+    def test_init(self, batch):
+        assert len(batch) == 5
+        assert batch.nbytes == 15
+        assert list(batch.sizes()) == [2, 3, 2, 1, 0]
+
+    def test_card_instances(self, backend):
+        batch = HandBatch([[Card('As'), Card('Kd')]], width=2)
+        assert batch.indices(0) == (51, 45)
+
+    def test_rows(self, batch):
+        assert batch.indices(1) == (42, 41, 0)
+        assert batch[0].items == [Card('As'), Card('Ks')]
+        assert [card.index for card in batch[-3].items] == [20, 1]
+        assert batch[4].items == []
+        assert batch[1].max_count == 3
+        assert [len(cards.items) for cards in batch] == [2, 3, 2, 1, 0]
+        with pytest.raises(IndexError):
+            batch.indices(5)
+
+    def test_slice(self, batch):
+        part = batch[1:3]
+        assert len(part) == 2
+        assert part.indices(0) == (42, 41, 0)
+
+    def test_contains(self, batch):
+        assert list(batch.contains(Card('As'))) == [1, 0, 0, 0, 0]
+        assert list(batch.contains(Card('2'))) == [0, 1, 1, 0, 0]
+        assert list(batch.contains(Card('h'))) == [0, 1, 0, 1, 0]
+
+    def test_count(self, batch):
+        assert list(batch.count_suit('s')) == [2, 0, 0, 0, 0]
+        assert list(batch.count_weight('Q')) == [0, 2, 0, 0, 0]
+        assert list(batch.count(Card('d'))) == [0, 1, 1, 0, 0]
+
+    def test_max_weight(self, batch):
+        assert list(batch.max_weight()) == [13, 11, 6, 4, 0]
+
+    def test_filter(self, batch):
+        filtered = batch.filter(batch.contains(Card('2')))
+        assert len(filtered) == 2
+        assert filtered.indices(1) == (20, 1)
+        assert len(batch.filter([0] * 5)) == 0
+
+    def test_width_error(self):
+        with pytest.raises(HandBatchWidthError):
+            HandBatch(width=0)
+
+    def test_hand_size_error(self, backend):
+        with pytest.raises(HandBatchHandSizeError):
+            HandBatch(['As/Ks/Qs'], width=2)
+
+    def test_card_error(self):
+        with pytest.raises(HandBatchCardError):
+            HandBatch(['As/K'])
+        with pytest.raises(HandBatchCardError):
+            HandBatch([[Card('As'), 'Ks']])
+
+    def test_selection_error(self, batch):
+        with pytest.raises(HandBatchSelectionError):
+            batch.filter([1, 0])
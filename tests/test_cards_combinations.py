@@ -0,0 +1,101 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+
+import itertools
+
+import pytest
+
+from agstuff.cards.core import Card, Deck, Cards, CardSet
+from agstuff.cards.combinations import Combinations, binomial, cards_mask
+from agstuff.exceptions.cards import (
+    CombinationsCountError, CombinationsRankError, CombinationsCardsError
+)
+
+
+def colex(indices, count):
+    return sorted(itertools.combinations(indices, count), key=lambda c: c[::-1])
+
+
+class TestCombinations:
+    def test_binomial(self):
+        assert binomial(52, 5) == 2598960
+        assert binomial(52, 0) == 1
+        assert binomial(5, 6) == 0
+
+    def test_cards_mask(self):
+        assert cards_mask(Cards('2c/2d')) == 0b11
+        assert cards_mask(CardSet('2c/2d')) == 0b11
+        assert cards_mask([Card('2c'), 1]) == 0b11
+        assert cards_mask([Card('2')]) == 0b1111
+        assert cards_mask(Deck()) == CardSet.FULL_MASK
+
+    def test_available_cards(self):
+        combinations = Combinations(Deck(), 2, exclude=Cards('As/Kd'))
+        assert len(combinations.indices) == 50
+        assert len(combinations) == 1225
+        combinations = Combinations(CardSet('2c/3c/4c/5c'), 3, exclude=[Card('3c')])
+        assert combinations.indices == (0, 8, 12)
+        assert len(combinations) == 1
+
+    @pytest.mark.parametrize('count', [0, 1, 2, 3, 9])
+    def test_iteration(self, count):
+        combinations = Combinations(CardSet('2c/3c/4c/5c/6c/7c/8c/9c/Tc/Jc'), count, exclude=Cards('4c'))
+        expected = colex(combinations.indices, count)
+        assert list(combinations.iter_indices()) == expected
+        assert list(combinations) == [sum(1 << i for i in c) for c in expected]
+
+    def test_full_deck_iteration(self):
+        combinations = Combinations(Deck(), 2)
+        assert list(combinations) == [sum(1 << i for i in c) for c in colex(range(52), 2)]
+
+    def test_rank_unrank(self):
+        combinations = Combinations(Deck(), 3, exclude=Cards('2c/Ah'))
+        for rank, mask in enumerate(combinations):
+            assert combinations.rank(mask) == rank
+            assert combinations.unrank(rank) == mask
+        assert combinations.rank(Cards('2d/3d/4d')) == combinations.rank((1, 5, 9))
+        assert combinations.unrank(0, indices=True) == (1, 2, 3)
+
+    def test_chunks(self):
+        combinations = Combinations(Deck(), 2, exclude=Cards('As/Kd'))
+        chunks = combinations.chunks(7)
+        assert len(chunks) == 7
+        assert chunks[0][0] == 0 and chunks[-1][1] == len(combinations)
+        masks = []
+        indices = []
+        for start, stop in chunks:
+            masks.extend(combinations.iter_masks(start, stop))
+            indices.extend(combinations.iter_indices(start, stop))
+        assert masks == list(combinations)
+        assert indices == list(combinations.iter_indices())
+
+    def test_count_error(self):
+        with pytest.raises(CombinationsCountError):
+            Combinations(Cards('2c/2d'), 3)
+        with pytest.raises(CombinationsCountError):
+            Combinations(Deck(), -1)
+
+    def test_rank_error(self):
+        combinations = Combinations(Cards('2c/2d/2h'), 2)
+        with pytest.raises(CombinationsRankError):
+            combinations.unrank(3)
+
+    def test_cards_error(self):
+        combinations = Combinations(Cards('2c/2d/2h'), 2)
+        with pytest.raises(CombinationsCardsError):
+            combinations.rank(Cards('2c/2s'))
+        with pytest.raises(CombinationsCardsError):
+            combinations.rank(Cards('2c'))
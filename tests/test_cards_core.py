@@ -13,13 +13,20 @@
 # limitations under the License.
 
 
+import copy
+import pickle
+import random
+
 import pytest
 
-from agstuff.cards.core import Card, Deck, Cards
+from agstuff.cards.core import Card, Deck, LazyDeck, Shoe, Cards, CardSet
+from agstuff.rng.core import RandomStream
 from agstuff.exceptions.cards import (
-    CardWeightSymbolError, CardSuitSymbolError,
-    DeckCountTypeError, DeckCountNumberError,
-    CardsStringTypeError, CardsCardTypeError
+    CardWeightSymbolError, CardSuitSymbolError, CardCodeError,
+    DeckCountTypeError, DeckCountNumberError, DeckCheckpointError,
+    CardsStringTypeError, CardsCardTypeError, CardsCheckpointError,
+    CardSetAbstractCardError, CardSetMaskError,
+    ShoeDecksCountError, ShoePenetrationError,
 )
 
 
@@ -59,6 +66,35 @@ class TestCard:
         assert hash(Card("T")) == 100
         assert hash(Card("s")) == 4
 
+    def test_interning(self):
+        assert Card("As") is Card("As")
+        assert Card("Asx") is Card("As")
+        assert Card("T") is Card("T")
+        assert copy.deepcopy(Card("7h")) is Card("7h")
+        assert pickle.loads(pickle.dumps(Card("d"))) is Card("d")
+        with pytest.raises(AttributeError):
+            Card("2c").in_hand = True
+
+    def test_index(self):
+        assert Card("2c").index == 0
+        assert Card("As").index == 51
+        assert Card("1s").index == 51
+        assert Card("A").index is None
+        assert Card.from_index(13) is Card("5d")
+        assert [Card.from_index(i).index for i in range(52)] == list(range(52))
+
+    def test_bytes(self):
+        assert Card("As").to_bytes() == bytes([51])
+        assert Card("1s").to_bytes() == bytes([55])
+        codes = {Card.from_bytes(bytes([code])).code for code in range(74)}
+        assert codes == set(range(74))
+        for sign in ("2c", "1h", "T", "1", "d"):
+            assert Card.from_bytes(Card(sign).to_bytes()) is Card(sign)
+        with pytest.raises(CardCodeError):
+            Card.from_bytes(bytes([74]))
+        with pytest.raises(CardCodeError):
+            Card.from_bytes(b"")
+
 
 class TestDeck:
     def test_validation(self):
@@ -73,6 +109,221 @@ class TestDeck:
         assert len(list(deck.push_cards(2))) == 2
         assert deck.size == 50
 
+    def test_deal(self):
+        deck = Deck()
+        with pytest.raises(DeckCountTypeError):
+            deck.deal("3")
+        with pytest.raises(DeckCountNumberError):
+            deck.deal(0)
+        cards = deck.deal(5)
+        assert len(cards) == 5
+        assert deck.size == 47
+        assert not set(cards) & set(deck.cards)
+        assert len(deck.deal(47)) == 47
+        assert deck.size == 0
+
+    def test_peek(self):
+        deck = Deck()
+        with pytest.raises(DeckCountNumberError):
+            deck.peek(53)
+        peeked = [card.index for card in deck.peek(3)]
+        assert deck.size == 52
+        assert [card.index for card in deck.peek(2)] == peeked[:2]
+        assert [card.index for card in deck.peek(5)][:3] == peeked
+        assert next(deck.push_cards(1)).index == peeked[0]
+        assert [card.index for card in deck.deal(2)] == peeked[1:]
+        assert deck.size == 49
+
+    def test_shuffle(self):
+        deck = Deck()
+        deck.shuffle()
+        assert deck.size == 52
+        assert sorted(card.index for card in deck.cards) == list(range(52))
+        assert [card.index for card in deck.peek(52)] == [card.index for card in deck.cards[::-1]]
+
+    def test_checkpoint(self):
+        deck = Deck(seed=3)
+        with pytest.raises(DeckCheckpointError):
+            deck.restore((0, 0))
+        deck.deal(3)
+        state = deck.to_bytes()
+        token = deck.checkpoint()
+        deck.deal(5)
+        deck.restore(token)
+        assert deck.to_bytes() == state
+        deck.deal(7)
+        deck.restore(token)
+        assert deck.to_bytes() == state
+        list(deck.push_cards(2))
+        inner = deck.checkpoint()
+        deck.shuffle()
+        deck.deal(4)
+        deck.restore(inner)
+        deck.refresh()
+        deck.deal(10)
+        deck.restore(token)
+        assert deck.to_bytes() == state
+        deck.release(token)
+        with pytest.raises(DeckCheckpointError):
+            deck.restore(token)
+
+    def test_checkpoint_peek(self):
+        deck = Deck(seed=4)
+        peeked = [card.index for card in deck.peek(3)]
+        token = deck.checkpoint()
+        deck.deal(10)
+        deck.restore(token)
+        assert [card.index for card in deck.deal(3)] == peeked
+
+    def test_bytes(self):
+        deck = Deck()
+        assert deck.to_bytes() == bytes(range(52))
+        deck = Deck(seed=1)
+        deck.deal(10)
+        restored = Deck.from_bytes(deck.to_bytes())
+        assert [card.index for card in restored.cards] == [card.index for card in deck.cards]
+        with pytest.raises(CardCodeError):
+            Deck.from_bytes(bytes([3, 52]))
+        with pytest.raises(CardCodeError):
+            Deck.from_bytes(bytes([3, 7, 3]))
+
+    def test_pickle(self):
+        deck = Deck(seed=1)
+        deck.peek(5)
+        deck.deal(2)
+        restored = pickle.loads(pickle.dumps(deck))
+        assert restored.to_bytes() == deck.to_bytes()
+        assert [c.index for c in restored.deal(10)] == [c.index for c in deck.deal(10)]
+        restored = pickle.loads(pickle.dumps(Deck()))
+        assert restored.rng is random
+        assert restored.size == 52
+
+    def test_rng(self):
+        deck1 = Deck(seed=7)
+        deck2 = Deck(rng=random.Random(7))
+        assert [card.index for card in deck1.deal(10)] == [card.index for card in deck2.deal(10)]
+        stream1, stream2 = RandomStream(seed=7).spawn(2)
+        assert Deck(rng=stream1).deal(52) != Deck(rng=stream2).deal(52)
+
+    def test_reset(self):
+        deck = Deck(seed=1)
+        cards = deck.cards
+        token = deck.checkpoint()
+        deck.deal(5)
+        deck.reset()
+        assert deck.cards is cards
+        assert deck.to_bytes() == bytes(range(52))
+        with pytest.raises(DeckCheckpointError):
+            deck.restore(token)
+
+
+class TestLazyDeck:
+    def indices(self, cards):
+        return [card.index for card in cards]
+
+    def test_init(self):
+        deck = LazyDeck()
+        assert deck.size == 52
+        assert str(deck) == str(Deck())
+        assert deck.cards == list(Card._BY_INDEX)
+
+    def test_same_as_deck(self):
+        deck, lazy_deck = Deck(seed=5), LazyDeck(seed=5)
+        assert self.indices(deck.peek(3)) == self.indices(lazy_deck.peek(3))
+        assert self.indices(deck.deal(5)) == self.indices(lazy_deck.deal(5))
+        assert self.indices(deck.push_cards(4)) == self.indices(lazy_deck.push_cards(4))
+        deck.shuffle()
+        lazy_deck.shuffle()
+        assert deck.to_bytes() == lazy_deck.to_bytes()
+        cards, lazy_cards = Cards(), Cards()
+        cards.pull(deck, 7)
+        lazy_cards.pull(lazy_deck, 7)
+        assert self.indices(cards.items) == self.indices(lazy_cards.items)
+        assert deck.size == lazy_deck.size == 36
+        assert str(deck) == str(lazy_deck)
+
+    def test_refresh(self):
+        deck = LazyDeck(seed=1)
+        deck.deal(10)
+        deck.refresh()
+        assert deck.size == 52
+        assert deck.to_bytes() == bytes(range(52))
+
+    def test_count_errors(self):
+        deck = LazyDeck()
+        deck.deal(50)
+        with pytest.raises(DeckCountNumberError):
+            deck.deal(3)
+        with pytest.raises(DeckCountTypeError):
+            deck.deal('3')
+
+    def test_checkpoint(self):
+        deck = LazyDeck(seed=2)
+        deck.deal(3)
+        token = deck.checkpoint()
+        state = deck.to_bytes()
+        deck.deal(5)
+        deck.shuffle()
+        list(deck.push_cards(2))
+        deck.refresh()
+        deck.deal(1)
+        deck.restore(token)
+        assert deck.to_bytes() == state
+        deck.release(token)
+
+    def test_bytes_and_pickle(self):
+        deck = LazyDeck.from_bytes(b'\x1d\x0c')
+        assert self.indices(deck.cards) == [29, 12]
+        deck = LazyDeck(seed=3)
+        deck.deal(4)
+        copied = pickle.loads(pickle.dumps(deck))
+        assert copied.to_bytes() == deck.to_bytes()
+        assert self.indices(copied.deal(3)) == self.indices(deck.deal(3))
+
+
+class TestShoe:
+    def test_validation(self):
+        with pytest.raises(ShoeDecksCountError):
+            Shoe(decks=0)
+        with pytest.raises(ShoePenetrationError):
+            Shoe(penetration=1.5)
+        with pytest.raises(DeckCountTypeError):
+            Shoe().deal("3")
+        with pytest.raises(DeckCountNumberError):
+            list(Shoe(decks=1).push_cards(53))
+
+    def test_count(self):
+        shoe = Shoe(decks=2, seed=1)
+        assert shoe.size == 104
+        assert shoe.counts == [2] * 52
+        cards = shoe.deal(100)
+        assert shoe.size == 4
+        assert sum(shoe.counts) == 4
+        dealt = [card.index for card in cards + list(shoe.push_cards(4))]
+        assert sorted(dealt) == sorted(list(range(52)) * 2)
+        assert shoe.counts == [0] * 52
+
+    def test_cut_card(self):
+        reached = []
+        shoe = Shoe(decks=1, penetration=0.5, on_cut_card=reached.append, seed=2)
+        cards = Cards(max_count=5)
+        while not shoe.cut_card_reached:
+            cards.clean()
+            cards.pull(shoe, 5)
+        assert reached == [shoe]
+        assert shoe.size == 22
+        assert shoe.refresh_if_cut()
+        assert shoe.size == 52
+        assert not shoe.refresh_if_cut()
+
+    def test_small_penetration(self):
+        reached = []
+        shoe = Shoe(decks=1, penetration=0.01, on_cut_card=reached.append, seed=3)
+        assert not shoe.cut_card_reached
+        shoe.deal(1)
+        assert shoe.cut_card_reached
+        assert reached == [shoe]
+
 
 class TestCards:
     def test_validation(self):
@@ -87,6 +338,48 @@ class TestCards:
         assert Card("Ks") in Cards("As/Ks/Qs/Js/Ts")
         assert not Card("8h") in Cards("As/Ks/Qs/Js/Ts")
 
+    def test_bytes(self):
+        cards = Cards("As/Ks/7")
+        assert cards.to_bytes() == bytes([51, 47, 62])
+        restored = Cards.from_bytes(cards.to_bytes(), max_count=2)
+        assert restored.items == [Card("As"), Card("Ks")]
+        assert restored.max_count == 2
+        with pytest.raises(CardCodeError):
+            Cards.from_bytes(bytes([100]))
+        restored = pickle.loads(pickle.dumps(Cards("2c/Td", max_count=5)))
+        assert [card.sign for card in restored.items] == ["2c", "Td"]
+        assert restored.max_count == 5
+
+    def test_checkpoint(self):
+        deck = Deck()
+        cards = Cards("As/Ks")
+        deck_token = deck.checkpoint()
+        cards_token = cards.checkpoint()
+        cards.pull(deck, 3)
+        assert cards.size == 5
+        cards.pull(deck, 2)
+        cards.restore(cards_token)
+        deck.restore(deck_token)
+        assert cards.items == [Card("As"), Card("Ks")]
+        assert deck.to_bytes() == bytes(range(52))
+
+    def test_stale_checkpoint(self):
+        deck = Deck()
+        cards = Cards()
+        cards.pull(deck, 2)
+        first = cards.checkpoint()
+        cards.pull(deck, 2)
+        second = cards.checkpoint()
+        cards.restore(first)
+        with pytest.raises(CardsCheckpointError):
+            cards.restore(second)
+        cards.clean()
+        with pytest.raises(CardsCheckpointError):
+            cards.restore(first)
+        with pytest.raises(CardsCheckpointError):
+            cards.restore((cards.items, 1))
+        assert cards.size == 0
+
     def test_pull(self):
         deck = Deck()
         cards = Cards(max_count=7)
@@ -104,3 +397,56 @@ class TestCards:
         cards.pull(deck, 5) # can't add cards (item limit has been reached)
         assert cards.size == 7
         assert deck.size == 45
+
+
+class TestCardSet:
+    def test_validation(self):
+        with pytest.raises(CardsStringTypeError):
+            CardSet(123)
+        with pytest.raises(CardsCardTypeError):
+            CardSet(cards=["As"])
+        with pytest.raises(CardSetAbstractCardError):
+            CardSet("As/K")
+        with pytest.raises(CardSetMaskError):
+            CardSet(mask=1 << 52)
+
+    def test_items(self):
+        assert CardSet().cards == []
+        assert CardSet("As/2c/Td").cards == [Card("2c"), Card("Td"), Card("As")]
+        assert CardSet("As/2c").mask == (1 << 51) | 1
+        assert CardSet(cards=Cards("As/Ks")) == CardSet("Ks/As")
+        assert len(CardSet("As/Ks/As")) == 2
+
+    def test_contains(self):
+        cards = CardSet("As/Kd/7h")
+        assert Card("Kd") in cards
+        assert not Card("Kh") in cards
+        assert Card("s") in cards
+        assert not Card("c") in cards
+        assert Card("7") in cards
+        assert not Card("Q") in cards
+        assert cards.count(Card("d")) == 1
+        assert CardSet("2s/5s/Js").count(Card("s")) == 3
+
+    def test_algebra(self):
+        a = CardSet("As/Ks/Qs")
+        b = CardSet("Qs/Js")
+        assert a | b == CardSet("As/Ks/Qs/Js")
+        assert a & b == CardSet("Qs")
+        assert a - b == CardSet("As/Ks")
+        assert a ^ b == CardSet("As/Ks/Js")
+        assert len(~a) == 49
+        assert CardSet(mask=CardSet.SUIT_MASKS["h"]).size == 13
+        assert CardSet(mask=CardSet.WEIGHT_MASKS["A"]).size == 4
+
+    def test_bytes(self):
+        card_set = CardSet("As/2c/Td")
+        assert card_set.to_bytes() == ((1 << 51) | (1 << 33) | 1).to_bytes(7, "little")
+        assert CardSet.from_bytes(card_set.to_bytes()) == card_set
+        assert pickle.loads(pickle.dumps(card_set)) == card_set
+
+    def test_cards_conversion(self):
+        cards = CardSet("As/Ks/Qs").to_cards(max_count=2)
+        assert type(cards) is Cards
+        assert cards.items == [Card("Qs"), Card("Ks")]
+        assert CardSet.from_cards(cards) == CardSet("Ks/Qs")
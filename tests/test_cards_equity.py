@@ -0,0 +1,78 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pytest
+
+from agstuff.cards.core import Cards, CardSet
+from agstuff.cards.equity import equity
+from agstuff.exceptions.cards import (
+    EquityPlayersCountError, EquityHandCardsCountError,
+    EquityBoardCardsCountError, EquityDuplicateCardsError,
+)
+
+
+class TestEquity:
+    def test_validation(self):
+        with pytest.raises(EquityPlayersCountError):
+            equity([Cards("As/Ah")])
+        with pytest.raises(EquityHandCardsCountError):
+            equity([Cards("As/Ah/Ad"), Cards("Kd/Kc")])
+        with pytest.raises(EquityBoardCardsCountError):
+            equity([Cards("As/Ah"), Cards("Kd/Kc")], board=Cards("2c/3c/4c/5c/6c/7c"))
+        with pytest.raises(EquityDuplicateCardsError):
+            equity([Cards("As/Ah"), Cards("Kd/Kc")], board=Cards("As/7h/2c"))
+        with pytest.raises(EquityDuplicateCardsError):
+            equity([Cards("As/Ah"), Cards("Kd/Kc")], dead=Cards("Kc"))
+
+    def test_exact(self):
+        result = equity([Cards("As/Ah"), Cards("Kd/Kc")], board=Cards("Ks/7h/2c"))
+        assert result.exact
+        assert result.trials == 990
+        assert result.wins[0] == 85
+        assert result.losses[1] == 85
+        assert result.errors() == [0.0, 0.0]
+        result = equity([Cards("As/Kh"), Cards("Ac/Kd")], board=Cards("2c/7d/9h/Js/3s"))
+        assert result.trials == 1
+        assert result.tie_rates == [1.0, 1.0]
+        assert result.equities == [0.5, 0.5]
+
+    def test_dead(self):
+        result = equity(
+            [CardSet("As/Ah"), CardSet("Kd/Kc")], board=CardSet("Ks/7h/2c"), dead=CardSet("Ad")
+        )
+        assert result.trials == 946
+        assert result.wins[0] == 42
+
+    def test_sampling(self):
+        hands = [Cards("As/Ah"), Cards("Kd/Kc")]
+        result = equity(hands, trials=4000, processes=1, batch_size=1000, seed=1)
+        assert not result.exact
+        assert result.trials == 4000
+        assert abs(result.equities[0] - 0.82) < 0.03
+        assert sum(result.equities) == pytest.approx(1.0)
+        assert result.equities == equity(hands, trials=4000, processes=1, batch_size=1000, seed=1).equities
+
+    def test_target_error(self):
+        hands = [Cards("As/Ah"), Cards("Kd/Kc")]
+        result = equity(hands, trials=100000, target_error=0.02, processes=1, batch_size=1000, seed=2)
+        assert result.trials < 100000
+        assert max(result.errors()) <= 0.02
+
+    def test_process_pool(self):
+        hands = [Cards("As/Ah"), Cards("Kd/Kc")]
+        result1 = equity(hands, trials=2000, processes=1, batch_size=500, seed=3)
+        result2 = equity(hands, trials=2000, processes=2, batch_size=500, seed=3)
+        assert result1.trials == result2.trials == 2000
+        assert result1.wins == result2.wins
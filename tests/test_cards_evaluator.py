@@ -0,0 +1,75 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pytest
+
+from agstuff.cards.core import Card, Cards, CardSet
+from agstuff.cards.evaluator import (
+    evaluate, evaluate_indices, evaluate_many, hand_category,
+    HIGH_CARD, PAIR, TWO_PAIR, THREE_OF_A_KIND, STRAIGHT,
+    FLUSH, FULL_HOUSE, FOUR_OF_A_KIND, STRAIGHT_FLUSH,
+)
+from agstuff.exceptions.cards import (
+    EvaluatorCardsCountError, EvaluatorAbstractCardError, EvaluatorDuplicateCardsError
+)
+
+
+def category(cards_string):
+    return evaluate(Cards(cards_string)) >> 20
+
+
+class TestEvaluate:
+    def test_validation(self):
+        with pytest.raises(EvaluatorCardsCountError):
+            evaluate(Cards("As/Ks/Qs/Js"))
+        with pytest.raises(EvaluatorCardsCountError):
+            evaluate_indices(list(range(8)))
+        with pytest.raises(EvaluatorAbstractCardError):
+            evaluate([Card("As"), Card("Ks"), Card("Qs"), Card("Js"), Card("T")])
+        with pytest.raises(EvaluatorDuplicateCardsError):
+            evaluate([0, 1, 2, 3, 3])
+
+    def test_categories(self):
+        assert category("As/Ks/Qs/Js/Ts") == STRAIGHT_FLUSH
+        assert category("5d/4d/3d/2d/Ad") == STRAIGHT_FLUSH
+        assert category("9c/9d/9h/9s/2d") == FOUR_OF_A_KIND
+        assert category("9c/9d/9h/2s/2d") == FULL_HOUSE
+        assert category("Kh/9h/7h/4h/2h") == FLUSH
+        assert category("5c/4d/3h/2s/Ad") == STRAIGHT
+        assert category("9c/9d/9h/Ks/2d") == THREE_OF_A_KIND
+        assert category("9c/9d/Kh/Ks/2d") == TWO_PAIR
+        assert category("9c/9d/Kh/Qs/2d") == PAIR
+        assert category("9c/7d/Kh/Qs/2d") == HIGH_CARD
+        assert hand_category(evaluate(Cards("9c/9d/9h/2s/2d"))) == "Full house"
+
+    def test_best_five(self):
+        assert category("As/Ks/Qs/Js/Ts/Ah/Ad") == STRAIGHT_FLUSH
+        assert category("Ac/Ad/Ah/Ks/Kd/Kh/2c") == FULL_HOUSE
+        assert category("2h/3h/4h/5h/7h/6c/6d") == FLUSH
+        assert evaluate(Cards("As/Ks/Qd/Jc/9h/8h/2d")) == evaluate(Cards("As/Ks/Qd/Jc/9h"))
+        assert evaluate(Cards("Kc/Kd/Qh/Qs/Jd/Jh/2c")) == evaluate(Cards("Kc/Kd/Qh/Qs/Jd"))
+
+    def test_comparison(self):
+        assert evaluate(Cards("Ah/Ad/7c/7s/2h")) > evaluate(Cards("Kh/Kd/Qc/Qs/Jh"))
+        assert evaluate(Cards("6c/5d/4h/3s/2d")) > evaluate(Cards("5c/4d/3h/2s/Ad"))
+        assert evaluate(Cards("Ah/Ad/Kc/7s/2h")) > evaluate(Cards("Ah/Ad/Qc/Js/Th"))
+        assert evaluate(Cards("Ah/Ad/Kc/7s/2h")) == evaluate(Cards("Ac/As/Kd/7h/2s"))
+
+    def test_sources(self):
+        score = evaluate(Cards("As/Ks/Qs/Js/9d/2c"))
+        assert evaluate(CardSet("As/Ks/Qs/Js/9d/2c")) == score
+        indices = [card.index for card in Cards("As/Ks/Qs/Js/9d/2c").items]
+        assert evaluate_indices(indices) == score
+        assert evaluate_many([indices, indices[:5]]) == [score, score]
@@ -0,0 +1,61 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import io
+
+import pytest
+
+from agstuff.cards.core import CardSet
+from agstuff.cards.io import iter_cards, SIGN_INDICES
+from agstuff.exceptions.cards import CardsLineError
+
+
+HANDS = "As/Ks/Qs\n\n2c/7d\r\nAs/Xx\n1s/Td\n"
+
+
+class TestIterCards:
+    def test_signs(self):
+        assert len(SIGN_INDICES) == 56
+        assert SIGN_INDICES['As'] == SIGN_INDICES['1s'] == 51
+
+    def test_text(self):
+        errors = []
+        hands = list(iter_cards(io.StringIO(HANDS), on_error=errors.append))
+        assert hands == [CardSet("As/Ks/Qs"), CardSet("2c/7d"), CardSet("As/Td")]
+        assert len(errors) == 1
+        assert type(errors[0]) is CardsLineError
+        assert errors[0].line_number == 4
+        assert errors[0].sign == 'Xx'
+
+    def test_binary(self):
+        errors = []
+        hands = list(iter_cards(io.BytesIO(HANDS.encode()), indices=True, on_error=errors.append))
+        assert hands == [(51, 47, 43), (0, 21), (51, 33)]
+        assert errors[0].line == 'As/Xx'
+
+    def test_path(self, tmp_path):
+        path = tmp_path / 'hands.txt'
+        path.write_text(HANDS.replace('/', ' '))
+        for use_mmap in (False, True):
+            with pytest.warns(RuntimeWarning, match="Line 4"):
+                hands = list(iter_cards(path, separator=' ', use_mmap=use_mmap))
+            assert hands == [CardSet("As/Ks/Qs"), CardSet("2c/7d"), CardSet("As/Td")]
+
+    def test_laziness(self):
+        lines = iter(["As/Ks", "Xx", "2c"])
+        hands = iter_cards(lines, on_error=lambda error: None)
+        assert next(hands) == CardSet("As/Ks")
+        assert next(lines) == "Xx"
+        assert next(hands) == CardSet("2c")
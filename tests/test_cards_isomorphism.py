@@ -0,0 +1,101 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+
+import itertools
+import random
+
+import pytest
+
+from agstuff.cards.core import Cards, CardSet
+from agstuff.cards.isomorphism import (
+    canonical_masks, canonical_key, preflop_index, suits_ranks,
+    IsomorphismIndex, PREFLOP_CLASSES_COUNT,
+)
+from agstuff.exceptions.cards import CardSetAbstractCardError
+
+
+def permute_suits(mask, permutation):
+    return sum(1 << (i & ~3 | permutation[i & 3]) for i in range(52) if mask >> i & 1)
+
+
+class TestIsomorphism:
+    def test_suits_ranks(self):
+        assert suits_ranks(CardSet('2c/Ac/Kd/3s').mask) == 1 | 1 << 12 | 1 << 24 | 1 << 40
+
+    def test_suits_permutations(self):
+        rng = random.Random(3)
+        for i in range(100):
+            indices = rng.sample(range(52), 7)
+            hand_mask = sum(1 << j for j in indices[:2])
+            board_mask = sum(1 << j for j in indices[2:])
+            permutation = rng.sample(range(4), 4)
+            assert canonical_masks(hand_mask, board_mask) == canonical_masks(
+                permute_suits(hand_mask, permutation), permute_suits(board_mask, permutation)
+            )
+
+    def test_canonical_masks(self):
+        hand_mask, board_mask = canonical_masks(CardSet('As/Kd').mask, CardSet('2s/7h/9c').mask)
+        assert CardSet(mask=hand_mask) == CardSet('Ac/Kd')
+        assert CardSet(mask=board_mask) == CardSet('2c/7s/9h')
+
+    def test_hand_and_board_are_permuted_together(self):
+        assert canonical_key(CardSet('As/Ks').mask, CardSet('2s/7h/9c').mask) == \
+            canonical_key(CardSet('Ad/Kd').mask, CardSet('2d/7h/9c').mask)
+        assert canonical_key(CardSet('As/Ks').mask, CardSet('2s/7h/9c').mask) != \
+            canonical_key(CardSet('Ad/Kd').mask, CardSet('2h/7d/9c').mask)
+
+    def test_classes_count(self):
+        two = [1 << a | 1 << b for a, b in itertools.combinations(range(52), 2)]
+        assert len({canonical_key(mask) for mask in two}) == PREFLOP_CLASSES_COUNT
+        assert sorted({preflop_index(mask) for mask in two}) == list(range(PREFLOP_CLASSES_COUNT))
+        three = {
+            canonical_key(1 << a | 1 << b | 1 << c)
+            for a, b, c in itertools.combinations(range(52), 3)
+        }
+        assert len(three) == 1755
+
+    def test_preflop_index(self):
+        assert preflop_index(CardSet('As/Ks').mask) == preflop_index(CardSet('Ah/Kh').mask)
+        assert preflop_index(CardSet('As/Ks').mask) != preflop_index(CardSet('As/Kh').mask)
+        assert preflop_index(CardSet('2c/2d').mask) == 0
+        assert preflop_index(CardSet('Ac/Ad').mask) == 168
+
+    def test_isomorphism_index(self):
+        index = IsomorphismIndex()
+        assert index.index(CardSet('As/Ks').mask) == 0
+        assert index.index(CardSet('As/Kh').mask) == 1
+        assert index.index(CardSet('Ad/Kd').mask) == 0
+        assert len(index) == 2
+        assert (CardSet('Ac/Kc').mask, 0) in index
+        assert (CardSet('Ac/Qc').mask, 0) not in index
+
+
+class TestCardsIsomorphism:
+    def test_canonical(self):
+        assert CardSet(cards=Cards('As/Kd').canonical()) == CardSet('Ac/Kd')
+        cards, board = Cards('As/Kd').canonical(Cards('2s/7h/9c'))
+        assert CardSet(cards=cards) == CardSet('Ac/Kd')
+        assert CardSet(cards=board) == CardSet('2c/7s/9h')
+        cards, board = Cards('As/Kd').canonical(CardSet('2s/7h/9c'))
+        assert CardSet(cards=board) == CardSet('2c/7s/9h')
+
+    def test_isomorphism_key(self):
+        assert Cards('Ah/Kh').isomorphism_key() == Cards('Ac/Kc').isomorphism_key()
+        assert Cards('Ah/Kh').isomorphism_key(Cards('Qh')) != Cards('Ac/Kc').isomorphism_key(Cards('Qh'))
+
+    def test_abstract_card(self):
+        with pytest.raises(CardSetAbstractCardError):
+            Cards('As/K').canonical()
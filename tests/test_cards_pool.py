@@ -0,0 +1,184 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+
+import asyncio
+import threading
+
+import pytest
+
+from agstuff.cards.core import Deck, LazyDeck
+from agstuff.cards.pool import Pool, DeckPool, CardsPool
+from agstuff.exceptions.cards import PoolSizeError, PoolOwnershipError, PoolTimeoutError
+
+
+class TestPool:
+    def test_reuse(self):
+        pool = DeckPool()
+        deck = pool.acquire()
+        deck.deal(5)
+        pool.release(deck)
+        assert pool.acquire() is deck
+        assert deck.size == 52
+        assert pool.stats() == {
+            'size': 1, 'free': 0, 'in_use': 1, 'hits': 1, 'misses': 1, 'hit_rate': 0.5
+        }
+
+    def test_lease(self):
+        pool = CardsPool(max_count=5)
+        with pool.lease(owner='table') as cards:
+            cards.pull(Deck(), 3)
+        assert cards.items == []
+        assert cards.max_count == 5
+        assert pool.stats()['free'] == 1
+
+    def test_ownership(self):
+        pool = DeckPool()
+        deck = pool.acquire(owner='table 1')
+        with pytest.raises(PoolOwnershipError):
+            pool.release(deck, owner='table 2')
+        with pytest.raises(PoolOwnershipError):
+            pool.release(Deck(), owner='table 1')
+        pool.release(deck, owner='table 1')
+        with pytest.raises(PoolOwnershipError):
+            pool.release(deck, owner='table 1')
+
+    def test_timeout(self):
+        pool = DeckPool(max_size=1)
+        pool.acquire()
+        with pytest.raises(PoolTimeoutError):
+            pool.acquire(timeout=0.01)
+
+    def test_release_while_resetting(self):
+        started, proceed = threading.Event(), threading.Event()
+        created = []
+
+        def reset(item):
+            started.set()
+            proceed.wait()
+
+        def factory():
+            created.append(object())
+            return created[-1]
+
+        pool = Pool(factory, reset=reset, max_size=1)
+        item = pool.acquire()
+        releasing = threading.Thread(target=pool.release, args=(item,))
+        releasing.start()
+        started.wait()
+        # object being reset is still counted, so the new one is not created
+        assert pool.size == 1
+        with pytest.raises(PoolTimeoutError):
+            pool.acquire(timeout=0.01)
+        proceed.set()
+        releasing.join()
+        assert pool.acquire(timeout=1) is item
+        assert len(created) == 1
+
+    def test_threads(self):
+        pool = DeckPool(max_size=2, lazy=True)
+        sizes = []
+
+        def play(owner):
+            for i in range(200):
+                with pool.lease(owner=owner) as deck:
+                    sizes.append(deck.size)
+                    deck.deal(9)
+
+        threads = [threading.Thread(target=play, args=(i,)) for i in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sizes == [52] * 1200
+        assert pool.size <= 2
+        assert pool.hit_rate > 0.99
+
+    def test_async(self):
+        pool = DeckPool(max_size=2, seed=3)
+        sizes = []
+
+        async def play(owner):
+            for i in range(20):
+                async with pool.lease_async(owner=owner) as deck:
+                    sizes.append(deck.size)
+                    deck.deal(9)
+                    await asyncio.sleep(0)
+
+        async def main():
+            await asyncio.gather(*(play(i) for i in range(5)))
+
+        asyncio.run(main())
+        assert sizes == [52] * 100
+        assert pool.stats()['in_use'] == 0
+        assert pool.size == 2
+
+    def test_async_release_from_thread(self):
+        pool = CardsPool(max_size=1)
+        cards = pool.acquire(owner='thread')
+
+        async def main():
+            timer = threading.Timer(0.01, pool.release, (cards, 'thread'))
+            timer.start()
+            return await asyncio.wait_for(pool.acquire_async(owner='loop'), 1)
+
+        assert asyncio.run(main()) is cards
+
+    def test_failed_reset_serves_async_waiter(self):
+        def reset(item):
+            raise ValueError('broken')
+
+        pool = Pool(object, reset=reset, max_size=1)
+        item = pool.acquire()
+
+        async def main():
+            waiter = asyncio.ensure_future(pool.acquire_async(owner='loop'))
+            await asyncio.sleep(0)
+            with pytest.raises(ValueError):
+                pool.release(item)
+            return await asyncio.wait_for(waiter, 1)
+
+        created = asyncio.run(main())
+        assert created is not item
+        assert pool.stats()['size'] == 1
+        assert pool.stats()['in_use'] == 1
+
+    def test_cancelled_waiter(self):
+        pool = DeckPool(max_size=1)
+        deck = pool.acquire()
+
+        async def main():
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(pool.acquire_async(), 0.01)
+            pool.release(deck)
+
+        asyncio.run(main())
+        assert pool.stats()['free'] == 1
+
+    def test_deck_rng(self):
+        pool = DeckPool(seed=1)
+        first, second = pool.acquire(), pool.acquire()
+        assert first.rng is not second.rng
+        assert isinstance(DeckPool(lazy=True).acquire(), LazyDeck)
+
+    def test_generic_pool(self):
+        pool = Pool(list, list.clear, max_size=1)
+        with pool.lease() as items:
+            items.append(1)
+        assert pool.acquire() == []
+
+    def test_size_error(self):
+        with pytest.raises(PoolSizeError):
+            DeckPool(max_size=0)
@@ -0,0 +1,74 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+
+from fractions import Fraction
+
+import pytest
+
+from agstuff.cards.core import Card, Cards, CardSet, Deck
+from agstuff.cards import probability
+from agstuff.exceptions.cards import ProbabilityDrawsCountError, ProbabilityHitsCountError
+
+
+@pytest.fixture
+def deck():
+    deck = Deck()
+    deck.cards = list(~CardSet('As/9s/4s/Kd/2h'))
+    return deck
+
+
+class TestProbability:
+    def test_unseen(self, deck):
+        assert probability.unseen(deck) == (~CardSet('As/9s/4s/Kd/2h')).mask
+        assert probability.unseen(deck, Card('Qs')) == (~CardSet('As/9s/4s/Kd/2h/Qs')).mask
+
+    def test_outs(self, deck):
+        assert probability.outs(deck, Card('s')) == 10
+        assert probability.outs(deck, Card('A')) == 3
+        assert probability.outs(deck, [Card('A'), Card('K')]) == 6
+        assert probability.outs(deck, Cards('Qs/Qh'), dead=Cards('Qs')) == 1
+        assert probability.outs(CardSet('2c/2d/3c'), Card('2')) == 2
+
+    def test_exactly(self, deck):
+        assert probability.exactly(deck, Card('s'), 2, hits=2, fractions=True) == Fraction(45, 1081)
+        assert probability.exactly(deck, Card('s'), 2, hits=3) == 0
+
+    def test_at_least(self, deck):
+        assert probability.at_least(deck, Card('s'), 2, hits=2, fractions=True) == Fraction(45, 1081)
+        assert probability.at_least(deck, Card('s'), 2, fractions=True) == Fraction(415, 1081)
+        assert probability.at_least(deck, Card('s'), 2, hits=0) == 1
+        assert probability.at_least(deck, Card('s'), 1, dead=Cards('Qs/Jd')) == pytest.approx(9 / 45)
+        # set by the river with a pocket pair
+        deck = Deck()
+        deck.cards = list(~CardSet('7h/7d'))
+        assert probability.at_least(deck, Card('7'), 5, fractions=True) == \
+            1 - Fraction(48 * 47 * 46 * 45 * 44, 50 * 49 * 48 * 47 * 46)
+
+    def test_distribution(self, deck):
+        result = probability.distribution(deck, Card('s'), 3, fractions=True)
+        assert len(result) == 4
+        assert sum(result) == 1
+        assert result[3] == Fraction(10 * 9 * 8, 47 * 46 * 45)
+
+    def test_draws_error(self, deck):
+        with pytest.raises(ProbabilityDrawsCountError):
+            probability.at_least(deck, Card('s'), 48)
+        with pytest.raises(ProbabilityDrawsCountError):
+            probability.distribution(deck, Card('s'), -1)
+
+    def test_hits_error(self, deck):
+        with pytest.raises(ProbabilityHitsCountError):
+            probability.exactly(deck, Card('s'), 2, hits=-1)
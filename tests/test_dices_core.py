@@ -13,6 +13,11 @@
 # limitations under the License.
 
 
+import pickle
+import random
+
+from fractions import Fraction
+
 import pytest
 
 from agstuff.dices.core import Dice, DiceBox
@@ -20,7 +25,10 @@ from agstuff.exceptions.dices.core import (
     DiceEmptyInialItemsError,
     DiceWrongFacesCountTypeError, DiceWrongFacesCountError,
     DiceWrongFacesItemsTypeError, DiceWrongFacesItemsCountError,
+    DiceWrongWeightsCountError, DiceWrongWeightsError,
+    DiceRollsCountError,
     DiceBoxWrongItemAdditionError,
+    DiceBoxEmptyError, DiceBoxNonNumericFacesError, DiceBoxQuantileError,
 )
 
 
@@ -52,6 +60,58 @@ class TestDice:
         dice = Dice(6)
         assert dice.rolling() == dice.value
 
+    def test_roll_many(self, backend):
+        dice = Dice(6, seed=1)
+        with pytest.raises(DiceRollsCountError):
+            dice.roll_many(0)
+        value = dice.value
+        rolls = dice.roll_many(1000)
+        assert len(rolls) == 1000
+        assert set(rolls) == {1, 2, 3, 4, 5, 6}
+        assert dice.value == value
+        assert list(Dice(6, seed=1).roll_many(10)) == list(Dice(6, seed=1).roll_many(10))
+        assert set(Dice(faces_items=[0.5, 1.5], seed=1).roll_many(100)) == {0.5, 1.5}
+        assert set(Dice(faces_items='QWERTY', seed=1).roll_many(1000)) == set(range(6))
+
+    def test_weights(self, backend):
+        with pytest.raises(DiceWrongWeightsCountError):
+            Dice(6, weights=[1, 2])
+        with pytest.raises(DiceWrongWeightsError):
+            Dice(3, weights=[1, -1, 2])
+        with pytest.raises(DiceWrongWeightsError):
+            Dice(3, weights=[0, 0, 0])
+        with pytest.raises(DiceWrongWeightsError):
+            Dice(2, weights=['1', '2'])
+        dice = Dice(faces_items='QWE', weights=[0, 1, 3], seed=1)
+        assert dice.faces_weights() == [('W', 1), ('E', 3)]
+        rolls = [dice.rolling() for i in range(4000)]
+        assert not 'Q' in rolls
+        assert 0.7 < rolls.count('E') / len(rolls) < 0.8
+        rolls = dice.roll_many(4000)
+        assert not 0 in rolls
+        assert 0.7 < list(rolls).count(2) / len(rolls) < 0.8
+        assert Dice(faces_items=[1, 2, 1], weights=[1, 2, 3]).faces_weights() == [(1, 4), (2, 2)]
+
+    def test_pickle(self):
+        dice = Dice(6)
+        dice._value = 4
+        restored = pickle.loads(pickle.dumps(dice))
+        assert restored.items == [1, 2, 3, 4, 5, 6]
+        assert restored.value == 4
+        assert restored.rng is random
+        dice = Dice(faces_items='QWE', weights=[1, 2, 3], seed=2)
+        restored = pickle.loads(pickle.dumps(dice))
+        assert restored.items == ['Q', 'W', 'E']
+        assert restored.value == dice.value
+        assert restored.faces_weights() == dice.faces_weights()
+        assert [restored.rolling() for i in range(10)] == [dice.rolling() for i in range(10)]
+
+    def test_rng(self):
+        dice1 = Dice(20, seed=3)
+        dice2 = Dice(20, rng=random.Random(3))
+        assert dice1.value == dice2.value
+        assert [dice1.rolling() for i in range(10)] == [dice2.rolling() for i in range(10)]
+
 
 class TestDiceBox:
     def test_add(self):
@@ -69,3 +129,88 @@ class TestDiceBox:
         dice_box.add(Dice(6))
         dice_box.add(Dice(6))
         assert dice_box.rolling() == dice_box.items[0] + dice_box.items[1]
+        dice_box = DiceBox()
+        dice_box.add(Dice(faces_items='QW'))
+        dice_box.add(Dice(faces_items='QW'))
+        assert dice_box.rolling() in {'QQ', 'QW', 'WQ', 'WW'}
+        with pytest.raises(TypeError):
+            dice_box.items[0] + object()
+
+    def test_rolling_override(self):
+        class LoadedDice(Dice):
+            def rolling(self):
+                self._value = 6
+                return self._value
+
+        dice_box = DiceBox()
+        dice_box.add(LoadedDice(6))
+        dice_box.add(LoadedDice(6))
+        assert dice_box.rolling() == 12
+
+    def test_rng(self):
+        results = []
+        for i in range(2):
+            dice_box = DiceBox(seed=5)
+            dice_box.add(Dice(6))
+            dice_box.add(Dice(8))
+            results.append([dice_box.rolling() for j in range(10)])
+        assert results[0] == results[1]
+
+    def test_roll_many(self, backend):
+        dice_box = DiceBox(seed=4)
+        with pytest.raises(DiceBoxEmptyError):
+            dice_box.roll_many(10)
+        dice_box.add(Dice(6))
+        assert set(dice_box.roll_many(1000)) == {1, 2, 3, 4, 5, 6}
+        dice_box.add(Dice(faces_items=[10, 20]))
+        with pytest.raises(DiceRollsCountError):
+            dice_box.roll_many('10')
+        sums = dice_box.roll_many(2000)
+        assert len(sums) == 2000
+        assert set(sums) == {11, 12, 13, 14, 15, 16, 21, 22, 23, 24, 25, 26}
+        assert abs(sum(sums) / len(sums) - 18.5) < 0.5
+        dice_box.add(Dice(faces_items='QW'))
+        with pytest.raises(DiceBoxNonNumericFacesError):
+            dice_box.roll_many(10)
+
+    def test_roll_many_of_many_distinct_sums(self, backend):
+        # sums distribution is too large to be calculated, so dices are rolled one by one
+        dice_box = DiceBox(seed=6)
+        for i in range(12):
+            dice_box.add(Dice(faces_items=[1.5 ** (i * 6 + j) for j in range(6)]))
+        sums = dice_box.roll_many(10)
+        assert all(isinstance(s, float) for s in sums)
+        assert len(sums) == 10
+        lowest = sum(1.5 ** (i * 6) for i in range(12))
+        highest = sum(1.5 ** (i * 6 + 5) for i in range(12))
+        assert all(lowest <= s <= highest for s in sums)
+
+    def test_distribution(self):
+        dice_box = DiceBox()
+        with pytest.raises(DiceBoxEmptyError):
+            dice_box.distribution()
+        dice_box.add(Dice(6))
+        dice_box.add(Dice(6))
+        distribution = dice_box.distribution(fractions=True)
+        assert list(distribution) == list(range(2, 13))
+        assert distribution[7] == Fraction(1, 6)
+        assert distribution[2] == distribution[12] == Fraction(1, 36)
+        assert dice_box.probability(7) == pytest.approx(1 / 6)
+        assert dice_box.probability(13) == 0
+        assert dice_box.cdf(4, fractions=True) == Fraction(1, 6)
+        assert dice_box.cdf(1) == 0
+        assert dice_box.cdf(12) == 1
+        assert dice_box.mean() == 7
+        assert dice_box.variance() == pytest.approx(35 / 6)
+        assert dice_box.quantile(0.5) == 7
+        assert dice_box.quantile(0) == 2
+        assert dice_box.quantile(1) == 12
+        with pytest.raises(DiceBoxQuantileError):
+            dice_box.quantile(1.5)
+        dice_box.add(Dice(faces_items=[1, 1, 2]))
+        assert dice_box.probability(14, fractions=True) == Fraction(1, 108)
+        dice_box.add(Dice(faces_items=[0, 1], weights=[1, 3]))
+        assert dice_box.probability(15, fractions=True) == Fraction(1, 144)
+        dice_box.add(Dice(faces_items='QW'))
+        with pytest.raises(DiceBoxNonNumericFacesError):
+            dice_box.mean()
@@ -0,0 +1,130 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import itertools
+
+from collections import Counter
+from fractions import Fraction
+
+import pytest
+
+from agstuff.dices import distribution
+from agstuff.dices.core import Dice, DiceBox
+from agstuff.dices.distribution import (
+    SumDistribution, OutcomeDistribution,
+    dice_key, dices_key, sum_distribution, outcome_distribution,
+)
+from agstuff.exceptions.dices.core import DiceBoxEmptyError
+
+
+class TestSumDistribution:
+    def test_queries(self):
+        pmf = SumDistribution([1, 2, 4], [1, 2, 1])
+        assert pmf.as_dict() == {1: 0.25, 2: 0.5, 4: 0.25}
+        assert pmf.probability(3) == 0
+        assert pmf.cdf(3, fractions=True) == Fraction(3, 4)
+        assert pmf.mean() == 2.25
+        assert pmf.variance() == pytest.approx(1.1875)
+        assert pmf.quantile(0.25) == 1
+        assert pmf.quantile(0.3) == 2
+
+
+class TestSumDistributionCalculation:
+    def test_dice_key(self):
+        assert dice_key(Dice(faces_items=[3, 1, 3])) == ((1, 1), (3, 2))
+
+    def test_memoisation(self):
+        keys = tuple(sorted([dice_key(Dice(6)), dice_key(Dice(4))]))
+        assert sum_distribution(keys) is sum_distribution(keys)
+
+    def test_big_integers_convolution(self, monkeypatch):
+        keys = tuple(sorted([dice_key(Dice(6))] * 30 + [dice_key(Dice(faces_items=[0, 5, 5]))] * 7))
+        kronecker = sum_distribution.__wrapped__(keys)
+        monkeypatch.setattr(distribution, 'KRONECKER_THRESHOLD', float('inf'))
+        direct = sum_distribution.__wrapped__(keys)
+        assert kronecker.totals == direct.totals
+        assert kronecker.weights == direct.weights
+        assert kronecker.denominator == 6 ** 30 * 3 ** 7
+
+    def test_sparse_faces_convolution(self):
+        # sparse sums are convolved directly instead of packing zero coefficients
+        dice = Dice(faces_items=[k * 10 ** 6 for k in range(1, 101)])
+        result = sum_distribution.__wrapped__(dices_key([dice, dice]))
+        assert len(result.totals) == 199
+        assert result.totals[0] == 2 * 10 ** 6
+        assert result.probability(101 * 10 ** 6, fractions=True) == Fraction(1, 100)
+
+
+class TestOutcomeDistribution:
+    def brute_force(self, dices, matches):
+        # probability by all faces combinations
+        rolls = list(itertools.product(*(dice.items for dice in dices)))
+        return Fraction(sum(1 for roll in rolls if matches(Counter(roll))), len(rolls))
+
+    def test_at_least(self):
+        dices = [Dice(faces_items='QWERTY') for i in range(4)]
+        result = outcome_distribution(dices_key(dices))
+        assert result.at_least('QQR', fractions=True) == self.brute_force(
+            dices, lambda c: c['Q'] >= 2 and c['R'] >= 1
+        )
+        assert result.at_least({'Q': 2, 'R': 1}) == result.at_least('QQR')
+        assert result.at_least('X') == 0
+        assert result.at_least('') == 1
+
+    def test_probability(self):
+        dices = [Dice(faces_items='QWE'), Dice(faces_items='QQA'), Dice(faces_items='QWE')]
+        result = outcome_distribution(dices_key(dices))
+        assert result.probability('QQW', fractions=True) == self.brute_force(
+            dices, lambda c: c == Counter('QQW')
+        )
+        assert sum(result.as_dict(fractions=True).values()) == 1
+        assert result.faces == ('A', 'E', 'Q', 'W')
+
+    def test_states_count(self):
+        result = outcome_distribution(dices_key([Dice(faces_items='QWERTY')] * 10))
+        # compositions of 10 dices into 6 faces
+        assert len(result.outcomes) == 3003
+        assert result.denominator == 6 ** 10
+
+    def test_weights(self):
+        dice = Dice(faces_items='AB', weights=[1, 3])
+        result = outcome_distribution(dices_key([dice, dice]))
+        assert result.probability('AB', fractions=True) == Fraction(6, 16)
+        assert result.count_distribution('B', fractions=True) == {
+            0: Fraction(1, 16), 1: Fraction(6, 16), 2: Fraction(9, 16)
+        }
+
+    def test_where(self):
+        dices = [Dice(faces_items='QWERTY') for i in range(3)]
+        result = outcome_distribution(dices_key(dices))
+        assert result.where(lambda counts: len([f for f in counts if counts[f]]) == 3, fractions=True) == \
+            Fraction(6 * 5 * 4, 6 ** 3)
+
+    def test_mixed_faces(self):
+        result = outcome_distribution(dices_key([Dice(faces_items=[1, 'a']), Dice(faces_items='ab')]))
+        assert result.probability([1, 'a'], fractions=True) == Fraction(1, 4)
+
+    def test_memoised(self):
+        dices = [Dice(faces_items='QWERTY'), Dice(faces_items='QWE')]
+        assert outcome_distribution(dices_key(dices)) is outcome_distribution(dices_key(dices[::-1]))
+
+    def test_dice_box(self):
+        dice_box = DiceBox()
+        with pytest.raises(DiceBoxEmptyError):
+            dice_box.outcome_distribution()
+        for i in range(3):
+            dice_box.add(Dice(faces_items='QWERTY'))
+        assert dice_box.at_least('QQR', fractions=True) == Fraction(1, 72)
+        assert isinstance(dice_box.outcome_distribution(), OutcomeDistribution)
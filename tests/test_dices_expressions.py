@@ -0,0 +1,239 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import itertools
+
+from collections import Counter
+from fractions import Fraction
+
+import pytest
+
+from agstuff.dices import expressions
+from agstuff.dices.core import Dice
+from agstuff.dices.expressions import DiceRoll, DiceSum, roll_distribution
+from agstuff.exceptions.dices.core import DiceRollsCountError
+from agstuff.exceptions.dices.expressions import (
+    DiceExpressionWrongDiceError, DiceExpressionNonNumericFacesError,
+    DiceExpressionDicesCountError, DiceExpressionKeepCountError,
+    DiceExpressionRerollError, DiceExpressionDepthError,
+    DiceExpressionRulesError, DiceExpressionSuccessesError,
+    DiceExpressionAdditionError, DiceExpressionIntractableError,
+    DiceExpressionQuantileError,
+)
+
+
+def brute_force(faces, count, value):
+    counter = Counter(value(sorted(roll)) for roll in itertools.product(faces, repeat=count))
+    return {v: Fraction(c, len(faces) ** count) for v, c in counter.items()}
+
+
+class TestDiceRoll:
+    def test_creation(self):
+        expression = DiceRoll(Dice(6), 3)
+        assert expression.distribution() == DiceRoll(Dice(6), 3).distribution()
+        assert str(expression) == '3 of [1, 2, 3, 4, 5, 6]'
+        with pytest.raises(DiceExpressionWrongDiceError):
+            DiceRoll(6)
+        with pytest.raises(DiceExpressionNonNumericFacesError):
+            DiceRoll(Dice(faces_items='QWE'))
+        with pytest.raises(DiceExpressionDicesCountError):
+            DiceRoll(Dice(6), 0)
+
+    def test_rules_are_immutable(self):
+        expression = DiceRoll(Dice(6), 4)
+        dropped = expression.drop_lowest()
+        assert expression.keep is None
+        assert dropped.keep == (True, 3)
+        assert expression.mean() == 14
+
+    def test_keep(self):
+        faces = range(1, 7)
+        assert DiceRoll(Dice(6), 4).drop_lowest().distribution(fractions=True) == (
+            brute_force(faces, 4, lambda roll: sum(roll[1:])))
+        assert DiceRoll(Dice(6), 4).drop_highest(2).distribution(fractions=True) == (
+            brute_force(faces, 4, lambda roll: sum(roll[:2])))
+        assert DiceRoll(Dice(6), 3).keep_highest().distribution(fractions=True) == (
+            brute_force(faces, 3, lambda roll: roll[-1]))
+        assert DiceRoll(Dice(6), 3).keep_lowest(3).distribution() == DiceRoll(Dice(6), 3).distribution()
+        assert DiceRoll(Dice(20), 2).keep_highest().mean() == 13.825
+        with pytest.raises(DiceExpressionKeepCountError):
+            DiceRoll(Dice(6), 3).keep_highest(4)
+        with pytest.raises(DiceExpressionKeepCountError):
+            DiceRoll(Dice(6), 3).drop_lowest(3)
+
+    def test_weighted_keep(self):
+        weights = [1, 1, 1, 1, 1, 2.5]
+        expected = Counter()
+        for roll in itertools.product(range(6), repeat=3):
+            weight = 1
+            for i in roll:
+                weight *= weights[i]
+            expected[max(roll) + 1] += weight
+        total = sum(expected.values())
+        distribution = DiceRoll(Dice(6, weights=weights), 3).keep_highest().distribution()
+        assert distribution == pytest.approx({v: w / total for v, w in expected.items()})
+
+    def test_reroll(self):
+        distribution = DiceRoll(Dice(6)).reroll([1]).distribution(fractions=True)
+        assert distribution == {1: Fraction(1, 36), **{v: Fraction(7, 36) for v in range(2, 7)}}
+        distribution = DiceRoll(Dice(6)).reroll([1, 2], times=None).distribution(fractions=True)
+        assert distribution == {v: Fraction(1, 4) for v in range(3, 7)}
+        assert DiceRoll(Dice(6)).reroll([1], times=0).distribution() == DiceRoll(Dice(6)).distribution()
+        with pytest.raises(DiceExpressionRerollError):
+            DiceRoll(Dice(2)).reroll([1, 2], times=None)
+        with pytest.raises(DiceRollsCountError):
+            DiceRoll(Dice(6)).reroll([1], times=-1)
+
+    def test_explode(self):
+        distribution = DiceRoll(Dice(6)).explode(depth=2).distribution(fractions=True)
+        assert distribution == {
+            **{v: Fraction(1, 6) for v in range(1, 6)},
+            **{v: Fraction(1, 36) for v in range(7, 12)},
+            **{v: Fraction(1, 216) for v in range(13, 19)},
+        }
+        assert DiceRoll(Dice(6)).explode(depth=0).distribution() == DiceRoll(Dice(6)).distribution()
+        assert DiceRoll(Dice(6), 2).explode([5, 6], depth=30).mean() == pytest.approx(10.5)
+        with pytest.raises(DiceExpressionDepthError):
+            DiceRoll(Dice(6)).explode(depth=-1)
+
+    def test_count_successes(self):
+        assert DiceRoll(Dice(10), 5).count_successes(8).distribution(fractions=True) == (
+            brute_force(range(1, 11), 5, lambda roll: sum(v >= 8 for v in roll)))
+        assert DiceRoll(Dice(6), 4).count_successes(values=[1, 6]).mean() == pytest.approx(4 / 3)
+        assert DiceRoll(Dice(4), 3).keep_lowest(2).count_successes(3).distribution(fractions=True) == (
+            brute_force(range(1, 5), 3, lambda roll: sum(v >= 3 for v in roll[:2])))
+        with pytest.raises(DiceExpressionSuccessesError):
+            DiceRoll(Dice(6)).count_successes()
+        with pytest.raises(DiceExpressionSuccessesError):
+            DiceRoll(Dice(6)).count_successes(5, [6])
+
+    def test_exploded_successes(self):
+        # every exploded roll is separate dice which could be success
+        expression = DiceRoll(Dice(10), 5).explode(compound=False).count_successes(8)
+        assert expression.probability(0) == pytest.approx(0.7 ** 5)
+        assert expression.mean() == pytest.approx(5 * 0.3 * (1 - 0.1 ** 11) / 0.9)
+        # compound dice is success once
+        compound = DiceRoll(Dice(10), 5).explode().count_successes(8)
+        assert compound.mean() == pytest.approx(1.5)
+        with pytest.raises(DiceExpressionRulesError):
+            DiceRoll(Dice(6), 3).explode(compound=False).keep_highest()
+        with pytest.raises(DiceExpressionRulesError):
+            DiceRoll(Dice(6), 3).keep_highest().explode(compound=False)
+
+    def test_rules_order(self):
+        # rerolls are applied before explosions of every roll, keeping before successes counting
+        first = DiceRoll(Dice(6), 4).count_successes(5).keep_highest(2).explode().reroll([1])
+        second = DiceRoll(Dice(6), 4).reroll([1]).explode().keep_highest(2).count_successes(5)
+        assert first.distribution() == second.distribution()
+
+    def test_rolling(self, backend):
+        expression = DiceRoll(Dice(6), 4, seed=1).reroll([1], times=None).explode(depth=3).drop_lowest()
+        values = [expression.rolling() for i in range(20000)]
+        assert min(values) >= 6
+        assert sum(values) / len(values) == pytest.approx(expression.mean(), rel=0.02)
+        expression = DiceRoll(Dice(10), 5, seed=2).explode(compound=False).count_successes(8)
+        values = [expression.rolling() for i in range(20000)]
+        assert sum(values) / len(values) == pytest.approx(expression.mean(), rel=0.03)
+
+    def test_roll_many(self, backend):
+        expression = DiceRoll(Dice(6), 3, seed=3).keep_highest(2)
+        values = expression.roll_many(100000)
+        assert len(values) == 100000
+        assert set(values) == set(range(2, 13))
+        assert sum(values) / len(values) == pytest.approx(expression.mean(), rel=0.01)
+        assert list(DiceRoll(Dice(6), 3, seed=3).roll_many(10)) == list(DiceRoll(Dice(6), 3, seed=3).roll_many(10))
+        out = [0] * 5
+        assert DiceRoll(Dice(6), seed=3).roll_many(5, out=out) is out
+        with pytest.raises(DiceRollsCountError):
+            expression.roll_many(0)
+
+    def test_intractable(self, backend, monkeypatch):
+        roll_distribution.cache_clear()
+        monkeypatch.setattr(expressions, 'EXACT_STEPS_LIMIT', 10)
+        expression = DiceRoll(Dice(6), 8, seed=4).explode([6], depth=3).keep_highest(4)
+        with pytest.raises(DiceExpressionIntractableError):
+            expression.mean()
+        values = expression.roll_many(1000)
+        assert len(values) == 1000
+        assert min(values) >= 4
+        roll_distribution.cache_clear()
+
+    def test_simulation(self, backend, monkeypatch):
+        # simulated values are compared with exact distributions
+        expressions_list = [
+            DiceRoll(Dice(6), 4, seed=6).reroll([1, 2]).drop_lowest(),
+            DiceRoll(Dice(6), 3, seed=7).reroll([1], times=None).keep_lowest(2),
+            DiceRoll(Dice(10), 5, seed=8).explode(compound=False).count_successes(8),
+            DiceRoll(Dice(6), 4, seed=9).explode(depth=3).keep_highest(2).count_successes(values=[6, 8]),
+            DiceRoll(Dice(faces_items=[0.5, 1.5, 2.5], weights=[1, 2, 3]), 3, seed=10).explode([2.5]),
+        ]
+        means = [expression.mean() for expression in expressions_list]
+        roll_distribution.cache_clear()
+        monkeypatch.setattr(expressions, 'EXACT_STEPS_LIMIT', 0)
+        for expression, mean in zip(expressions_list, means):
+            values = expression.roll_many(20000)
+            assert sum(values) / len(values) == pytest.approx(mean, rel=0.03)
+        roll_distribution.cache_clear()
+
+    def test_intractable_explosions(self, backend, monkeypatch):
+        roll_distribution.cache_clear()
+        monkeypatch.setattr(expressions, 'EXACT_STEPS_LIMIT', 1000)
+        expression = DiceRoll(Dice(6), seed=5).explode(depth=200)
+        with pytest.raises(DiceExpressionIntractableError):
+            expression.mean()
+        values = expression.roll_many(1000)
+        assert sum(values) / len(values) == pytest.approx(4.2, rel=0.1)
+        # faces which could not explode cost nothing
+        assert DiceRoll(Dice(6)).explode([7], depth=200).mean() == 3.5
+        roll_distribution.cache_clear()
+
+    def test_queries(self):
+        expression = DiceRoll(Dice(6), 2)
+        assert expression.probability(7) == pytest.approx(1 / 6)
+        assert expression.cdf(4, fractions=True) == Fraction(1, 6)
+        assert expression.variance() == pytest.approx(35 / 6)
+        assert expression.quantile(0.5) == 7
+        with pytest.raises(DiceExpressionQuantileError):
+            expression.quantile(2)
+
+
+class TestDiceSum:
+    def test_addition(self):
+        expression = DiceRoll(Dice(20), 2).keep_highest() + DiceRoll(Dice(4)) + 5
+        assert isinstance(expression, DiceSum)
+        assert len(expression.terms) == 2
+        assert expression.constant == 5
+        assert expression.mean() == pytest.approx(13.825 + 2.5 + 5)
+        assert (1 + DiceRoll(Dice(6))).distribution() == {v: pytest.approx(1 / 6) for v in range(2, 8)}
+        assert (DiceRoll(Dice(6)) + Dice(6)).distribution() == DiceRoll(Dice(6), 2).distribution()
+        assert (Dice(6) + DiceRoll(Dice(6))).distribution() == DiceRoll(Dice(6), 2).distribution()
+        assert (Dice(6) + DiceRoll(Dice(6))).mean() == (DiceRoll(Dice(6)) + Dice(6)).mean() == 7
+        with pytest.raises(DiceExpressionAdditionError):
+            DiceRoll(Dice(6)) + 'Q'
+
+    def test_rolling(self, backend):
+        expression = DiceRoll(Dice(6), 2, seed=5).drop_lowest() + DiceRoll(Dice(8), seed=6) + 0.5
+        assert all(expression.rolling() in expression.distribution() for i in range(100))
+        values = expression.roll_many(50000)
+        assert sum(values) / len(values) == pytest.approx(expression.mean(), rel=0.01)
+
+    def test_intractable(self, backend, monkeypatch):
+        roll_distribution.cache_clear()
+        monkeypatch.setattr(expressions, 'EXACT_STEPS_LIMIT', 10)
+        expression = DiceRoll(Dice(6), 8, seed=7).keep_highest(4) + DiceRoll(Dice(6), seed=8) + 1
+        with pytest.raises(DiceExpressionIntractableError):
+            expression.distribution()
+        values = expression.roll_many(1000)
+        assert min(values) >= 6 and max(values) <= 31
+        roll_distribution.cache_clear()
@@ -0,0 +1,121 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+
+import pytest
+
+from agstuff.cards.core import Card, Cards, Deck, LazyDeck
+from agstuff.dices.core import Dice, DiceBox
+from agstuff.instrumentation import core as instrumentation
+
+
+@pytest.fixture
+def metrics():
+    exported = []
+    instrumentation.reset()
+    instrumentation.enable(sink=exported.append)
+    yield exported
+    instrumentation.disable()
+    instrumentation.remove_sink(exported.append)
+    instrumentation.reset()
+
+
+class TestInstrumentation:
+    def test_disabled(self):
+        instrumentation.reset()
+        Cards().pull(Deck(), 5)
+        Dice(6).rolling()
+        assert instrumentation.snapshot() == {'counters': {}, 'histograms': {}}
+
+    def test_cards(self, metrics):
+        Card('As')
+        Card('Ah7')
+        with pytest.raises(Exception):
+            Card('Xs')
+        counters = instrumentation.snapshot()['counters']
+        assert counters['card.constructions'] == 3
+        assert counters['card.creations'] == 1
+        assert counters['validators.card_symbol_errors'] == 1
+
+    def test_deck(self, metrics):
+        deck = Deck()
+        cards = Cards()
+        cards.pull(deck, 5)
+        deck.deal(3)
+        list(deck.push_cards(2))
+        snapshot = instrumentation.snapshot()
+        assert snapshot['counters'] == {
+            'deck.refreshes': 1, 'deck.dealt_cards': 10, 'cards.pulled_cards': 5
+        }
+        assert snapshot['histograms']['deck.refresh']['count'] == 1
+        assert snapshot['histograms']['cards.pull']['count'] == 1
+
+    def test_dices(self, metrics):
+        dice_box = DiceBox()
+        dice_box.add(Dice(6))
+        dice_box.add(Dice(6))
+        instrumentation.reset()
+        dice_box.rolling()
+        dice_box.items[0].rolling()
+        dice_box.items[0].roll_many(10)
+        snapshot = instrumentation.snapshot()
+        assert snapshot['counters'] == {'dice.rolls': 13, 'dice_box.rolls': 1}
+        # box dices are rolled by their rolling method
+        assert snapshot['histograms']['dice.rolling']['count'] == 3
+        assert snapshot['histograms']['dice_box.rolling']['count'] == 1
+
+    def test_zero_clock(self, metrics, monkeypatch):
+        # counters do not depend on clock values
+        monkeypatch.setattr(instrumentation, 'clock', lambda: 0.0)
+        deck = LazyDeck()
+        dice_box = DiceBox()
+        dice_box.add(Dice(6))
+        instrumentation.reset()
+        deck.refresh()
+        Cards().pull(deck, 2)
+        dice_box.rolling()
+        counters = instrumentation.snapshot()['counters']
+        assert counters['deck.refreshes'] == 1
+        assert counters['cards.pulled_cards'] == 2
+        assert counters['dice_box.rolls'] == 1
+
+    def test_flush(self, metrics):
+        Deck()
+        exported = instrumentation.flush()
+        assert metrics == [exported]
+        assert exported['counters'] == {'deck.refreshes': 1}
+        assert instrumentation.snapshot() == {'counters': {}, 'histograms': {}}
+
+    def test_histogram(self):
+        histogram = instrumentation.Histogram()
+        for value in (1e-6, 3e-6, 2.0):
+            histogram.observe(value)
+        assert histogram.count == 3
+        assert histogram.min == 1e-6
+        assert histogram.max == 2.0
+        assert histogram.buckets[-1] == 1
+        assert sum(histogram.buckets) == 3
+
+    def test_timed(self, metrics):
+        with instrumentation.timed('block'):
+            pass
+        assert instrumentation.snapshot()['histograms']['block']['count'] == 1
+
+    def test_timed_clock(self, metrics, monkeypatch):
+        ticks = iter([1.0, 3.5])
+        monkeypatch.setattr(instrumentation, 'clock', lambda: next(ticks))
+        with instrumentation.timed('block'):
+            pass
+        assert instrumentation.snapshot()['histograms']['block']['total'] == 2.5
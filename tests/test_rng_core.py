@@ -0,0 +1,172 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import pickle
+import random
+import threading
+
+import pytest
+
+from agstuff.cards.core import Deck
+from agstuff.dices.core import Dice
+from agstuff.rng.core import get_random, RandomStream, SecureRandom, statistical_test
+from agstuff.exceptions.rng.core import (
+    RandomStreamSpawnCountError, SecureRandomBlockSizeError, SecureRandomHealthError
+)
+
+
+class TestGetRandom:
+    def test_choice(self):
+        rng = random.Random(1)
+        assert get_random(rng, 5) is rng
+        assert get_random() is random
+        assert get_random(seed=5).random() == random.Random(5).random()
+        assert type(get_random(RandomStream(5))) is random.Random
+
+
+class TestRandomStream:
+    def test_validation(self):
+        with pytest.raises(RandomStreamSpawnCountError):
+            RandomStream(1).spawn(0)
+        with pytest.raises(RandomStreamSpawnCountError):
+            RandomStream(1).spawn('2')
+
+    def test_reproducibility(self):
+        assert RandomStream(42).generator().random() == RandomStream(42).generator().random()
+        children1 = RandomStream(42).spawn(3)
+        children2 = RandomStream(42).spawn(3)
+        assert [c.generate_seed() for c in children1] == [c.generate_seed() for c in children2]
+
+    def test_spawn(self):
+        stream = RandomStream(42)
+        children = stream.spawn(2) + stream.spawn(2)
+        assert [c.spawn_key for c in children] == [(0,), (1,), (2,), (3,)]
+        grandchildren = children[0].spawn(2)
+        assert grandchildren[1].spawn_key == (0, 1)
+        seeds = {s.generate_seed() for s in [stream] + children + grandchildren}
+        assert len(seeds) == 7
+
+
+class TestSecureRandom:
+    def test_numbers(self):
+        rng = SecureRandom(block_size=2500)
+        for i in range(20000):
+            assert 0 <= rng.randrange(52) < 52
+        assert 0 <= rng.random() < 1
+        assert rng.getrandbits(0) == 0
+        assert rng.getrandbits(30000).bit_length() <= 30000
+        assert 0 <= rng.randrange(10 ** 30) < 10 ** 30
+        assert sorted(rng.sample(range(10), 10)) == list(range(10))
+
+    def test_unbiased(self):
+        rng = SecureRandom()
+        counts = [0] * 3
+        for i in range(30000):
+            counts[rng.randrange(3)] += 1
+        assert all(9400 < count < 10600 for count in counts)
+
+    def test_seed_and_state(self):
+        rng = SecureRandom()
+        rng.seed(1)
+        with pytest.raises(NotImplementedError):
+            rng.getstate()
+        with pytest.raises(NotImplementedError):
+            rng.setstate(None)
+
+    def test_without_background(self):
+        rng = SecureRandom(block_size=2500, background=False)
+        assert len({rng.getrandbits(64) for i in range(1000)}) == 1000
+
+    def test_deck_and_dice(self):
+        rng = SecureRandom()
+        deck = Deck(rng=rng)
+        assert len({card.index for card in deck.deal(52)}) == 52
+        dice = Dice(6, rng=rng)
+        assert all(1 <= value <= 6 for value in dice.roll_many(100))
+
+    def test_threads(self):
+        rng = SecureRandom(block_size=2500)
+        results = []
+
+        def deal():
+            deck = Deck(rng=rng)
+            for i in range(200):
+                deck.refresh()
+                results.append(len({card.index for card in deck.deal(52)}))
+
+        threads = [threading.Thread(target=deal) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == [52] * 800
+
+    def test_pickle(self):
+        deck = pickle.loads(pickle.dumps(Deck(rng=SecureRandom(block_size=4096))))
+        assert isinstance(deck.rng, SecureRandom)
+        assert deck.rng.block_size == 4096
+
+    def test_health_check(self):
+        checked = []
+        rng = SecureRandom(block_size=2500, health_check=lambda block: checked.append(block))
+        rng.getrandbits(2500 * 8 * 3)
+        assert checked and all(len(block) == 2500 for block in checked)
+        with pytest.raises(SecureRandomHealthError):
+            SecureRandom(health_check=lambda block: 'broken')
+
+    def test_background_health_error(self):
+        # the second block is read by background thread
+        blocks = []
+
+        def health_check(block):
+            blocks.append(block)
+            return 'broken' if len(blocks) == 2 else None
+
+        rng = SecureRandom(block_size=2500, health_check=health_check)
+        with pytest.raises(SecureRandomHealthError):
+            for i in range(10000):
+                rng.randrange(52)
+        assert 0 <= rng.randrange(52) < 52
+
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason='fork is not supported')
+    def test_fork(self):
+        rng = SecureRandom(block_size=2500)
+        rng.getrandbits(64)
+        read, write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            try:
+                os.write(write, rng.getrandbits(64).to_bytes(8, 'little'))
+            finally:
+                os._exit(0)
+        os.close(write)
+        child = int.from_bytes(os.read(read, 8), 'little')
+        os.close(read)
+        os.waitpid(pid, 0)
+        assert rng.getrandbits(64) != child
+
+    def test_self_test(self):
+        SecureRandom().self_test()
+
+    def test_statistical_test(self):
+        assert statistical_test(os.urandom(2500)) is None
+        assert statistical_test(bytes(2500)).startswith('monobit')
+        assert statistical_test(b'\x0f' * 2500).startswith('poker')
+        assert statistical_test(os.urandom(100)) is not None
+
+    def test_block_size_error(self):
+        with pytest.raises(SecureRandomBlockSizeError):
+            SecureRandom(block_size=100)
@@ -0,0 +1,181 @@
+# Copyright 2021 Yegor Bitensky
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+
+import pickle
+
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from agstuff.cards.core import Card, Deck
+from agstuff.dices.core import Dice, DiceBox
+from agstuff.shared.core import SharedArray, SharedDeck, SharedHandBatch
+from agstuff.exceptions.shared.core import (
+    SharedArrayLengthError, SharedArrayPartsCountError, SharedDeckArrayError
+)
+
+
+def roll(part):
+    Dice(6, seed=part.start).roll_many(len(part), out=part)
+
+
+def deal(deck):
+    return [card.index for card in deck.deal(5)]
+
+
+def count_spades(batch):
+    return list(batch.contains(Card('s')))
+
+
+@pytest.fixture
+def shared():
+    arrays = []
+
+    def create(typecode, length):
+        array = SharedArray(typecode, length)
+        arrays.append(array)
+        return array
+
+    yield create
+    for array in arrays:
+        array.close()
+        array.unlink()
+
+
+class TestSharedArray:
+    def test_items(self, shared, backend):
+        array = shared('q', 5)
+        array[:] = [1, 2, 3, 4, 5]
+        array[0] = 10
+        assert array.tolist() == [10, 2, 3, 4, 5]
+        assert len(array) == 5
+        assert list(array) == [10, 2, 3, 4, 5]
+
+    def test_from_items(self):
+        with SharedArray.from_items('d', [1.5, 2.5]) as array:
+            assert array.tolist() == [1.5, 2.5]
+
+    def test_split(self, shared, backend):
+        array = shared('B', 10)
+        parts = array.split(3)
+        assert [(part.start, len(part)) for part in parts] == [(0, 3), (3, 3), (6, 4)]
+        parts[1][:] = bytes([7, 7, 7])
+        assert array.tolist() == [0, 0, 0, 7, 7, 7, 0, 0, 0, 0]
+        assert array.view(2, 4).tolist() == [0, 7]
+
+    def test_numpy(self, shared):
+        pytest.importorskip('numpy')
+        array = shared('q', 6)
+        part = array.view(2, 5)
+        values = part.numpy()
+        values[:] = [7, 8, 9]
+        assert array.tolist() == [0, 0, 7, 8, 9, 0]
+        assert values.sum() == 24
+        # numpy arrays need to be deleted before close
+        del values
+
+    def test_pickle(self, shared):
+        array = shared('q', 4)
+        attached = pickle.loads(pickle.dumps(array.view(1, 3)))
+        attached[:] = [5, 6]
+        assert array.tolist() == [0, 5, 6, 0]
+        assert not attached.owner
+        attached.close()
+
+    def test_processes(self, shared):
+        array = shared('q', 1000)
+        with ProcessPoolExecutor(2) as executor:
+            list(executor.map(roll, array.split(4)))
+        assert all(1 <= value <= 6 for value in array)
+
+    def test_errors(self, shared):
+        with pytest.raises(SharedArrayLengthError):
+            SharedArray('q', -1)
+        with pytest.raises(SharedArrayPartsCountError):
+            shared('q', 2).split(0)
+
+
+class TestSharedDeck:
+    def test_same_as_deck(self, shared):
+        deck = SharedDeck(seed=3, shared=shared('B', 53))
+        assert [card.index for card in deck.deal(5)] == [card.index for card in Deck(seed=3).deal(5)]
+        assert deck.size == 47
+        assert deck.shared[0] == 47
+
+    def test_checkpoint(self, shared):
+        deck = SharedDeck(seed=2, shared=shared('B', 53))
+        deck.deal(3)
+        token = deck.checkpoint()
+        state = deck.to_bytes()
+        deck.shuffle()
+        deck.deal(4)
+        deck.refresh()
+        deck.restore(token)
+        assert deck.to_bytes() == state
+
+    def test_pickle(self, shared):
+        deck = SharedDeck(seed=1, shared=shared('B', 53))
+        attached = pickle.loads(pickle.dumps(deck))
+        attached.deal(10)
+        assert deck.size == 42
+        assert deck.to_bytes() == attached.to_bytes()
+
+    def test_processes(self):
+        array, decks = SharedDeck.create_many(4, seed=1)
+        with ProcessPoolExecutor(2) as executor:
+            dealt = list(executor.map(deal, decks))
+        assert [deck.size for deck in decks] == [47] * 4
+        for cards, deck in zip(dealt, decks):
+            assert set(cards).isdisjoint(deck.to_bytes())
+        assert len({tuple(cards) for cards in dealt}) == 4
+        array.close()
+        array.unlink()
+
+    def test_array_error(self, shared):
+        with pytest.raises(SharedDeckArrayError):
+            SharedDeck(shared=shared('B', 52))
+
+
+class TestSharedHandBatch:
+    def test_batch(self, backend):
+        batch = SharedHandBatch(['As/Ks', 'Qh/Qd', '7s/2d', '3c/4c'], width=2)
+        assert list(batch.contains(Card('s'))) == [1, 0, 1, 0]
+        assert batch[1].items == [Card('Qh'), Card('Qd')]
+        parts = batch.split(2)
+        assert [len(part) for part in parts] == [2, 2]
+        assert parts[1].indices(0) == (23, 1)
+        with ProcessPoolExecutor(2) as executor:
+            assert list(executor.map(count_spades, parts)) == [[1, 0], [1, 0]]
+        batch.shared.close()
+        batch.shared.unlink()
+
+
+class TestRollManyOut:
+    def test_dice(self, shared, backend):
+        array = shared('q', 100)
+        assert Dice(6).roll_many(100, out=array) is array
+        assert all(1 <= value <= 6 for value in array)
+
+    def test_dice_box(self, shared, backend):
+        dice_box = DiceBox(seed=1)
+        dice_box.add(Dice(6))
+        dice_box.add(Dice(6))
+        array = shared('d', 50)
+        dice_box.roll_many(50, out=array)
+        assert all(2 <= value <= 12 for value in array)
+        values = [0] * 10
+        dice_box.roll_many(10, out=values)
+        assert all(2 <= value <= 12 for value in values)